@@ -1 +1,12 @@
- 
+from src.core.config_manager import (
+    ConfigManager,
+    ConfigError,
+    AppSettings,
+    InferenceSettings,
+    ProviderSettings,
+    AdmissionSettings,
+    BudgetSettings,
+    interpolate_env,
+    get_config_manager,
+    configure_config_manager
+)
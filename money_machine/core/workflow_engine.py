@@ -1 +1,5 @@
- 
+from src.core.workflow_engine import (
+    WorkflowEngine,
+    WorkflowStep,
+    StepTimeoutError
+)
@@ -1,8 +1,25 @@
+import asyncio
+import random
 from abc import ABC, abstractmethod
 from typing import Dict, Any, Optional
 from datetime import datetime
 from src.core.base_components import BaseComponent, TaskMetrics
-from src.core.engine_manager import AIEngineManager
+from src.core.engine_manager import AIEngineManager, AllEnginesFailedError
+from src.core.admission import get_retry_after
+from src.core.metrics_registry import get_metrics_registry
+from src.core.prompt_templates import get_prompt_registry
+from src.core.context_budget import ContextBudgeter
+
+_registry = get_metrics_registry()
+AGENT_TASKS = _registry.counter(
+    'agent_tasks', 'Tareas ejecutadas por agentes', ('agent', 'task', 'status')
+)
+AGENT_RETRIES = _registry.counter(
+    'agent_retries', 'Reintentos de tareas de agentes', ('agent', 'task')
+)
+AGENT_TASK_LATENCY = _registry.histogram(
+    'agent_task_latency_seconds', 'Latencia de las tareas de agentes (por intento)', ('agent', 'task')
+)
 
 class BaseAgent(BaseComponent):
     """Agente base para todos los agentes del sistema"""
@@ -12,6 +29,8 @@ class BaseAgent(BaseComponent):
         self.engine_manager = engine_manager
         self.context: Dict[str, Any] = {}
         self.last_execution: Optional[datetime] = None
+        self.retry_config = config.get('retry', {})
+        self.context_budget = ContextBudgeter(config.get('context_budget', {}), self._summarize)
     
     @abstractmethod
     async def execute(self, context: Dict[str, Any]) -> Dict[str, Any]:
@@ -25,21 +44,32 @@ class BaseAgent(BaseComponent):
         max_retries: int = 3,
         **kwargs
     ) -> Dict[str, Any]:
-        """Ejecuta una tarea con reintentos"""
+        """Ejecuta una tarea con reintentos y backoff exponencial con jitter
+
+        Devuelve la respuesta del motor (``text``, ``metrics``...), no el sobre
+        de ``execute_with_fallback``; si fallan todos los motores se reintenta.
+        """
+        labels = {'agent': self.__class__.__name__, 'task': task}
         for attempt in range(max_retries):
             try:
                 start_time = datetime.now()
-                result = await self.engine_manager.execute_with_fallback(
+                envelope = await self.engine_manager.execute_with_fallback(
                     task=task,
                     prompt=prompt,
                     **kwargs
                 )
+                if not envelope['success']:
+                    raise AllEnginesFailedError(envelope['error'])
+                result = envelope['result']
                 
                 # Registrar métricas
+                latency = (datetime.now() - start_time).total_seconds()
+                AGENT_TASK_LATENCY.observe(latency, **labels)
+                AGENT_TASKS.inc(status='success', **labels)
                 self.track_metrics(TaskMetrics(
                     tokens_used=result.get('metrics', {}).get('tokens', 0),
                     cost=result.get('metrics', {}).get('cost', 0.0),
-                    latency=(datetime.now() - start_time).total_seconds(),
+                    latency=latency,
                     success=True,
                     timestamp=datetime.now()
                 ))
@@ -47,22 +77,49 @@ class BaseAgent(BaseComponent):
                 return result
                 
             except Exception as e:
+                AGENT_TASK_LATENCY.observe((datetime.now() - start_time).total_seconds(), **labels)
                 if attempt == max_retries - 1:
+                    AGENT_TASKS.inc(status='error', **labels)
                     self.track_metrics(TaskMetrics(
                         success=False,
                         error_message=str(e),
                         timestamp=datetime.now()
                     ))
                     raise
-                continue
+                AGENT_RETRIES.inc(**labels)
+                await asyncio.sleep(self._retry_delay(attempt, e))
+    
+    def _retry_delay(self, attempt: int, error: Exception) -> float:
+        """Espera antes del siguiente reintento (respeta Retry-After si el proveedor lo indica)"""
+        retry_after = get_retry_after(error)
+        if retry_after is not None:
+            return retry_after
+        base_delay = self.retry_config.get('base_delay', 1.0)
+        max_delay = self.retry_config.get('max_delay', 30.0)
+        # Full jitter: evita que los reintentos de muchos agentes se sincronicen
+        return random.uniform(0, min(max_delay, base_delay * 2 ** attempt))
     
     def _prepare_prompt(self, template: str, **kwargs) -> str:
-        """Prepara un prompt usando un template"""
+        """Prepara un prompt usando un template (compilado y sin sangría, una vez por texto)"""
         try:
-            return template.format(**kwargs)
+            return get_prompt_registry().compile(template).render(**kwargs)
         except KeyError as e:
             raise ValueError(f"Falta el parámetro requerido: {e}")
     
+    async def _fit_context(self, text: Any, consumer: str, target: int) -> str:
+        """Salida de un paso anterior ajustada a ``target`` tokens para ``consumer``"""
+        return await self.context_budget.fit(text, consumer, target)
+    
+    async def _summarize(self, prompt: str, max_tokens: int) -> str:
+        """Genera el resumen de contexto con reintentos"""
+        result = await self._execute_with_retry(
+            task='context_digest',
+            prompt=prompt,
+            max_tokens=max_tokens,
+            temperature=0.2
+        )
+        return result['text']
+    
     def update_context(self, new_context: Dict[str, Any]):
         """Actualiza el contexto del agente"""
         self.context.update(new_context)
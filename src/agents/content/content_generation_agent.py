@@ -1,5 +1,6 @@
 from typing import Dict, Any, List
 from src.agents.base.base_agent import BaseAgent
+from src.core.fan_out import FanOutResult, fan_out, raise_if_all_failed
 
 class ContentGenerationAgent(BaseAgent):
     """Agente especializado en generación de contenido"""
@@ -35,18 +36,19 @@ class ContentGenerationAgent(BaseAgent):
     async def _create_content_plan(self, context: Dict[str, Any]) -> Dict[str, Any]:
         """Crea un plan de contenido"""
         prompt = self._prepare_prompt(
-            """Crea un plan de contenido para {topic} considerando:
+            """Crea un plan de contenido para el tema indicado considerando:
             1. Objetivos principales
             2. Público objetivo
             3. Puntos clave a cubrir
             4. Estructura sugerida
             5. Tono y estilo
             
+            Proporciona un plan detallado y estructurado.
+            
+            Tema: {topic}
             Plataformas objetivo: {platforms}
             Tono deseado: {tone}
-            Longitud aproximada: {length} palabras
-            
-            Proporciona un plan detallado y estructurado.""",
+            Longitud aproximada: {length} palabras""",
             topic=context['topic'],
             platforms=", ".join(context['platforms']),
             tone=context.get('tone', 'profesional'),
@@ -72,13 +74,7 @@ class ContentGenerationAgent(BaseAgent):
     ) -> Dict[str, Any]:
         """Genera el contenido base"""
         prompt = self._prepare_prompt(
-            """Basado en el siguiente plan:
-            {content_plan}
-            
-            Genera contenido para {topic} con estas características:
-            - Tono: {tone}
-            - Longitud: {length} palabras
-            - Plataformas: {platforms}
+            """Genera el contenido completo a partir del plan indicado.
             
             Asegúrate de:
             1. Mantener coherencia
@@ -87,7 +83,13 @@ class ContentGenerationAgent(BaseAgent):
             4. Usar un lenguaje persuasivo
             5. Incluir llamadas a la acción
             
-            Genera el contenido completo.""",
+            Tema: {topic}
+            Tono: {tone}
+            Longitud: {length} palabras
+            Plataformas: {platforms}
+            
+            Plan:
+            {content_plan}""",
             content_plan=content_plan['plan'],
             topic=context['topic'],
             tone=context.get('tone', 'profesional'),
@@ -112,78 +114,107 @@ class ContentGenerationAgent(BaseAgent):
         context: Dict[str, Any],
         content: Dict[str, Any]
     ) -> Dict[str, Any]:
-        """Optimiza el contenido para cada plataforma"""
-        optimized_versions = {}
-        
-        for platform, content_version in content['platform_versions'].items():
-            prompt = self._prepare_prompt(
-                """Optimiza el siguiente contenido para {platform}:
-                {content}
-                
-                Considerando:
-                1. Límites de caracteres
-                2. Formato específico
-                3. Hashtags relevantes
-                4. Elementos multimedia
-                5. Engagement típico
-                
-                Optimiza el contenido manteniendo el mensaje clave.""",
-                platform=platform,
-                content=content_version
-            )
+        """Optimiza el contenido para cada plataforma (en paralelo)"""
+        results = await fan_out(
+            list(content['platform_versions'].items()),
+            lambda entry: self._optimize_platform(*entry),
+            limit=self.config.get('platform_concurrency', 4),
+            name='content_optimization'
+        )
+        
+        return {
+            'versions': self._collect_versions(results),
+            'timestamp': content['timestamp']
+        }
+    
+    async def _optimize_platform(self, platform: str, content_version: str) -> Dict[str, Any]:
+        """Optimiza el contenido de una plataforma"""
+        prompt = self._prepare_prompt(
+            """Optimiza el contenido indicado para la plataforma de destino considerando:
+            1. Límites de caracteres
+            2. Formato específico
+            3. Hashtags relevantes
+            4. Elementos multimedia
+            5. Engagement típico
+            
+            Optimiza el contenido manteniendo el mensaje clave.
             
-            result = await self._execute_with_retry(
-                task='content_optimization',
-                prompt=prompt,
-                temperature=0.7
-            )
+            Plataforma: {platform}
             
-            optimized_versions[platform] = {
-                'content': result['text'],
-                'hashtags': self._extract_hashtags(result['text']),
-                'media_suggestions': self._suggest_media(result['text'])
-            }
+            Contenido:
+            {content}""",
+            platform=platform,
+            content=content_version
+        )
+        
+        result = await self._execute_with_retry(
+            task='content_optimization',
+            prompt=prompt,
+            temperature=0.7
+        )
         
         return {
-            'versions': optimized_versions,
-            'timestamp': content['timestamp']
+            'content': result['text'],
+            'hashtags': self._extract_hashtags(result['text']),
+            'media_suggestions': self._suggest_media(result['text'])
         }
     
     async def _validate_content(self, content: Dict[str, Any]) -> Dict[str, Any]:
-        """Valida la calidad del contenido"""
-        validated_versions = {}
-        
-        for platform, version in content['versions'].items():
-            prompt = self._prepare_prompt(
-                """Valida el siguiente contenido:
-                {content}
-                
-                Verifica:
-                1. Gramática y ortografía
-                2. Tono y estilo
-                3. Claridad del mensaje
-                4. Llamadas a la acción
-                5. Optimización SEO
-                
-                Proporciona una evaluación detallada y correcciones si son necesarias.""",
-                content=version['content']
-            )
+        """Valida la calidad del contenido (en paralelo por plataforma)"""
+        results = await fan_out(
+            list(content['versions'].items()),
+            lambda entry: self._validate_platform(entry[1]),
+            limit=self.config.get('platform_concurrency', 4),
+            name='content_validation'
+        )
+        
+        return self._collect_versions(results)
+    
+    async def _validate_platform(self, version: Dict[str, Any]) -> Dict[str, Any]:
+        """Valida el contenido de una plataforma"""
+        prompt = self._prepare_prompt(
+            """Valida el contenido indicado.
             
-            result = await self._execute_with_retry(
-                task='content_validation',
-                prompt=prompt,
-                temperature=0.5
-            )
+            Verifica:
+            1. Gramática y ortografía
+            2. Tono y estilo
+            3. Claridad del mensaje
+            4. Llamadas a la acción
+            5. Optimización SEO
             
-            validated_versions[platform] = {
-                'content': result['text'],
-                'quality_score': self._calculate_quality_score(result['text']),
-                'improvements': self._extract_improvements(result['text']),
-                'hashtags': version['hashtags'],
-                'media_suggestions': version['media_suggestions']
-            }
-        
-        return validated_versions
+            Proporciona una evaluación detallada y correcciones si son necesarias.
+            
+            Contenido:
+            {content}""",
+            content=version['content']
+        )
+        
+        result = await self._execute_with_retry(
+            task='content_validation',
+            prompt=prompt,
+            temperature=0.5
+        )
+        
+        return {
+            'content': result['text'],
+            'quality_score': self._calculate_quality_score(result['text']),
+            'improvements': self._extract_improvements(result['text']),
+            'hashtags': version['hashtags'],
+            'media_suggestions': version['media_suggestions']
+        }
+    
+    def _collect_versions(self, results: List[FanOutResult]) -> Dict[str, Any]:
+        """Versiones por plataforma en orden; las que fallaron se omiten
+        
+        El fallo ya queda registrado en las métricas del agente por
+        ``_execute_with_retry``.
+        """
+        raise_if_all_failed(results)
+        return {
+            result.item[0]: result.value
+            for result in results
+            if result.ok
+        }
     
     def _extract_structure(self, text: str) -> List[Dict[str, Any]]:
         """Extrae la estructura del plan de contenido"""
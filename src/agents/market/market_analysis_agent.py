@@ -42,19 +42,19 @@ class MarketAnalysisAgent(BaseAgent):
     async def _analyze_trends(self, context: Dict[str, Any]) -> Dict[str, Any]:
         """Analiza tendencias del mercado"""
         prompt = self._prepare_prompt(
-            """Analiza las tendencias actuales del mercado para {market_sector} considerando:
+            """Analiza las tendencias actuales del mercado indicado considerando:
             1. Tendencias principales
             2. Patrones de comportamiento
             3. Indicadores clave
             4. Factores estacionales
             5. Influencias macroeconómicas
             
-            Contexto adicional:
-            - Región: {region}
-            - Periodo: {timeframe}
-            - Segmento: {segment}
+            Proporciona un análisis detallado y estructurado.
             
-            Proporciona un análisis detallado y estructurado.""",
+            Mercado: {market_sector}
+            Región: {region}
+            Periodo: {timeframe}
+            Segmento: {segment}""",
             market_sector=context['market_sector'],
             region=context.get('region', 'Global'),
             timeframe=context.get('timeframe', '12 meses'),
@@ -80,20 +80,20 @@ class MarketAnalysisAgent(BaseAgent):
     ) -> Dict[str, Any]:
         """Analiza la competencia en el mercado"""
         prompt = self._prepare_prompt(
-            """Basado en las siguientes tendencias de mercado:
-            {trends_analysis}
-            
-            Analiza la competencia en {market_sector} considerando:
+            """Analiza la competencia del mercado indicado a partir de sus tendencias considerando:
             1. Competidores principales
             2. Cuotas de mercado
             3. Estrategias competitivas
             4. Fortalezas y debilidades
             5. Barreras de entrada
             
+            Proporciona un análisis detallado de la competencia.
+            
             Mercado: {market_sector}
             Región: {region}
             
-            Proporciona un análisis detallado de la competencia.""",
+            Tendencias:
+            {trends_analysis}""",
             trends_analysis=trends['analysis'],
             market_sector=context['market_sector'],
             region=context.get('region', 'Global')
@@ -119,19 +119,23 @@ class MarketAnalysisAgent(BaseAgent):
     ) -> Dict[str, Any]:
         """Identifica oportunidades de mercado"""
         prompt = self._prepare_prompt(
-            """Basado en:
-            Tendencias: {trends_analysis}
-            Competencia: {competition_analysis}
-            
-            Identifica oportunidades de mercado para {market_sector} considerando:
+            """Identifica oportunidades en el mercado indicado a partir de sus tendencias y competencia considerando:
             1. Nichos sin explotar
             2. Necesidades no cubiertas
             3. Ventajas competitivas potenciales
             4. Timing de mercado
             5. Barreras de entrada
             
-            Proporciona un análisis detallado de oportunidades.""",
-            trends_analysis=trends['analysis'],
+            Proporciona un análisis detallado de oportunidades.
+            
+            Mercado: {market_sector}
+            
+            Tendencias:
+            {trends_analysis}
+            
+            Competencia:
+            {competition_analysis}""",
+            trends_analysis=await self._fit_context(trends['analysis'], 'market.opportunities', 500),
             competition_analysis=competition['analysis'],
             market_sector=context['market_sector']
         )
@@ -157,21 +161,27 @@ class MarketAnalysisAgent(BaseAgent):
     ) -> Dict[str, Any]:
         """Genera recomendaciones estratégicas"""
         prompt = self._prepare_prompt(
-            """Basado en el siguiente análisis:
-            Tendencias: {trends_analysis}
-            Competencia: {competition_analysis}
-            Oportunidades: {opportunities_analysis}
-            
-            Genera recomendaciones estratégicas para {market_sector} considerando:
+            """Genera recomendaciones estratégicas para el mercado indicado a partir del análisis considerando:
             1. Acciones inmediatas
             2. Estrategias a medio plazo
             3. Visión a largo plazo
             4. Recursos necesarios
             5. KPIs de seguimiento
             
-            Proporciona recomendaciones específicas y accionables.""",
-            trends_analysis=trends['analysis'],
-            competition_analysis=competition['analysis'],
+            Proporciona recomendaciones específicas y accionables.
+            
+            Mercado: {market_sector}
+            
+            Tendencias:
+            {trends_analysis}
+            
+            Competencia:
+            {competition_analysis}
+            
+            Oportunidades:
+            {opportunities_analysis}""",
+            trends_analysis=await self._fit_context(trends['analysis'], 'market.recommendations', 400),
+            competition_analysis=await self._fit_context(competition['analysis'], 'market.recommendations', 400),
             opportunities_analysis=opportunities['analysis'],
             market_sector=context['market_sector']
         )
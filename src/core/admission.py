@@ -0,0 +1,334 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Dict, Any, Optional, Callable, Awaitable
+from src.core.logging_system import logger
+
+class AdmissionRejectedError(Exception):
+    """La petición no fue admitida (cola llena o espera máxima superada)"""
+
+def get_status_code(error: BaseException) -> Optional[int]:
+    """Extrae el código HTTP de una excepción de los SDK o de httpx"""
+    status = getattr(error, 'status_code', None)
+    if status is None:
+        status = getattr(getattr(error, 'response', None), 'status_code', None)
+    return status if isinstance(status, int) else None
+
+def get_retry_after(error: BaseException) -> Optional[float]:
+    """Extrae la cabecera Retry-After (en segundos) de una excepción, si existe"""
+    headers = getattr(getattr(error, 'response', None), 'headers', None)
+    if not headers:
+        return None
+    try:
+        return float(headers.get('retry-after'))
+    except (TypeError, ValueError):
+        return None
+
+def is_overload_error(error: BaseException) -> bool:
+    """Indica si el error es de sobrecarga del proveedor (429 o 5xx)"""
+    status = get_status_code(error)
+    return status is not None and (status == 429 or status >= 500)
+
+class TokenBucket:
+    """Token bucket con reservas: quien llega descuenta y espera a que se repongan
+
+    El saldo puede quedar negativo; el tiempo de espera de cada petición es el
+    necesario para reponer su deuda, así que el orden de llegada se respeta sin
+    despertar a nadie explícitamente (funciona entre hilos y event loops).
+    """
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        if now > self._paused_until:
+            start = max(self._updated_at, self._paused_until)
+            self._tokens = min(self.capacity, self._tokens + (now - start) * self.rate)
+        self._updated_at = now
+
+    def reserve(self, amount: float, max_wait: Optional[float] = None) -> Optional[float]:
+        """Reserva ``amount`` tokens y devuelve la espera necesaria (None si excede ``max_wait``)"""
+        amount = min(amount, self.capacity)
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            wait = max(0.0, self._paused_until - now)
+            if self._tokens < amount:
+                wait += (amount - self._tokens) / self.rate
+            if max_wait is not None and wait > max_wait:
+                return None
+            self._tokens -= amount
+            return wait
+
+    def set_rate(self, per_minute: float):
+        """Cambia la cuota por minuto conservando el saldo (acotado a la nueva capacidad)"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.capacity = float(per_minute)
+            self.rate = self.capacity / 60.0
+            self._tokens = min(self._tokens, self.capacity)
+
+    def adjust(self, amount: float):
+        """Devuelve (positivo) o descuenta (negativo) tokens tras conocer el uso real"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self.capacity, self._tokens + amount)
+
+    def pause(self, seconds: float):
+        """Detiene la reposición durante ``seconds`` (p. ej. por un Retry-After)"""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._paused_until = max(self._paused_until, now + seconds)
+
+    @property
+    def available(self) -> float:
+        with self._lock:
+            self._refill(time.monotonic())
+            return self._tokens
+
+class AIMDLimiter:
+    """Límite de concurrencia adaptativo (aumento aditivo, disminución multiplicativa)
+
+    Cada éxito suma ``increase / limit`` (≈ ``increase`` por ventana completa) y
+    cada 429/5xx multiplica el límite por ``decrease_factor``, como mucho una vez
+    por ``decrease_cooldown`` para que una ráfaga de errores simultáneos no lo
+    desplome. Los que esperan se despiertan en orden FIFO, también desde otros
+    event loops.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        config = config or {}
+        self.limit = float(config.get('initial', 4))
+        self.in_flight = 0
+        self._waiters: deque = deque()
+        self._last_decrease = 0.0
+        self._lock = threading.Lock()
+        self.configure(config)
+
+    def configure(self, config: Optional[Dict[str, Any]]):
+        """Aplica nuevos parámetros sin tocar las plazas concedidas ni la cola"""
+        config = config or {}
+        with self._lock:
+            self.min_limit = config.get('min', 1)
+            self.max_limit = config.get('max', 32)
+            self.increase = config.get('increase', 1.0)
+            self.decrease_factor = config.get('decrease_factor', 0.5)
+            self.decrease_cooldown = config.get('decrease_cooldown', 1.0)
+            self.limit = min(self.max_limit, max(self.min_limit, self.limit))
+            self._wake()
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            if not self._waiters and self.in_flight < int(self.limit):
+                self.in_flight += 1
+                return True
+            return False
+
+    def enqueue(self) -> asyncio.Future:
+        """Añade un turno a la cola y devuelve el future que se resuelve al obtener plaza"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        with self._lock:
+            if not self._waiters and self.in_flight < int(self.limit):
+                self.in_flight += 1
+                future.set_result(None)
+            else:
+                self._waiters.append((loop, future))
+        return future
+
+    def cancel(self, future: asyncio.Future):
+        """Retira un turno de la cola; si ya había obtenido plaza, la libera"""
+        with self._lock:
+            for index, (_, waiter) in enumerate(self._waiters):
+                if waiter is future:
+                    del self._waiters[index]
+                    return
+        self.release()
+
+    def release(self, success: Optional[bool] = None):
+        """Libera una plaza; ``success`` ajusta el límite (None: sin señal)"""
+        with self._lock:
+            self.in_flight -= 1
+            if success is True:
+                self.limit = min(self.max_limit, self.limit + self.increase / max(self.limit, 1.0))
+            elif success is False:
+                now = time.monotonic()
+                if now - self._last_decrease >= self.decrease_cooldown:
+                    self.limit = max(self.min_limit, self.limit * self.decrease_factor)
+                    self._last_decrease = now
+            self._wake()
+
+    def _wake(self):
+        while self._waiters and self.in_flight < int(self.limit):
+            loop, future = self._waiters.popleft()
+            if loop.is_closed():
+                continue
+            self.in_flight += 1
+            loop.call_soon_threadsafe(self._grant, future)
+
+    def _grant(self, future: asyncio.Future):
+        if future.done():
+            # El solicitante se fue mientras tanto: devolver la plaza
+            self.release()
+        else:
+            future.set_result(None)
+
+class AdmissionController:
+    """Control de admisión por proveedor: límite AIMD, buckets RPM/TPM y cola acotada
+
+    Configuración (sección ``admission`` global y por proveedor):
+    ``rpm``, ``tpm``, ``concurrency`` (``initial``, ``min``, ``max``, ``increase``,
+    ``decrease_factor``, ``decrease_cooldown``), ``max_queue`` y ``max_wait``.
+    """
+
+    def __init__(self, name: str, config: Optional[Dict[str, Any]] = None):
+        config = config or {}
+        self.name = name
+        self.limiter = AIMDLimiter(config.get('concurrency', {}))
+        self.rpm: Optional[TokenBucket] = None
+        self.tpm: Optional[TokenBucket] = None
+        self.stats = {
+            'admitted': 0,
+            'rejected': 0,
+            'overloaded': 0,
+            'total_wait': 0.0
+        }
+        self.configure(config)
+
+    def configure(self, config: Optional[Dict[str, Any]]):
+        """Aplica nuevos límites en caliente
+
+        Las peticiones en curso conservan su plaza y los buckets existentes
+        conservan su saldo; solo cambian las cuotas y la concurrencia máxima.
+        """
+        config = config or {}
+        self.enabled = config.get('enabled', True)
+        self.max_queue = config.get('max_queue', 100)
+        self.max_wait = config.get('max_wait', 60.0)
+        self.limiter.configure(config.get('concurrency', {}))
+        self.rpm = self._configure_bucket(self.rpm, config.get('rpm'))
+        self.tpm = self._configure_bucket(self.tpm, config.get('tpm'))
+
+    @staticmethod
+    def _configure_bucket(bucket: Optional[TokenBucket], per_minute: Optional[float]) -> Optional[TokenBucket]:
+        if not per_minute:
+            return None
+        if bucket is None:
+            return TokenBucket(per_minute)
+        bucket.set_rate(per_minute)
+        return bucket
+
+    async def run(
+        self,
+        factory: Callable[[], Awaitable[Any]],
+        tokens: int = 0,
+        usage: Optional[Callable[[Any], Optional[int]]] = None
+    ) -> Any:
+        """Ejecuta ``factory`` cuando hay plaza y cuota
+
+        ``tokens`` es la estimación que se reserva en el bucket TPM; ``usage``
+        extrae del resultado los tokens reales para corregir la reserva.
+        """
+        if not self.enabled:
+            return await factory()
+
+        start_time = time.monotonic()
+        await self.acquire(tokens)
+        self.stats['total_wait'] += time.monotonic() - start_time
+
+        try:
+            result = await factory()
+        except asyncio.CancelledError:
+            self.limiter.release()
+            raise
+        except Exception as e:
+            self.release(error=e)
+            raise
+
+        actual = usage(result) if usage else None
+        self.release(tokens_delta=tokens - actual if actual is not None else 0)
+        return result
+
+    async def acquire(self, tokens: int = 0):
+        """Espera plaza de concurrencia y cuota RPM/TPM dentro de ``max_wait``"""
+        deadline = time.monotonic() + self.max_wait
+
+        if not self.limiter.try_acquire():
+            if self.limiter.queued >= self.max_queue:
+                self._reject("cola llena")
+            future = self.limiter.enqueue()
+            try:
+                await asyncio.wait_for(asyncio.shield(future), timeout=self.max_wait)
+            except asyncio.TimeoutError:
+                self.limiter.cancel(future)
+                self._reject("tiempo de espera agotado")
+            except asyncio.CancelledError:
+                self.limiter.cancel(future)
+                raise
+
+        charged = []
+        try:
+            for bucket, amount in ((self.rpm, 1), (self.tpm, tokens)):
+                if bucket is None or amount <= 0:
+                    continue
+                wait = bucket.reserve(amount, max_wait=deadline - time.monotonic())
+                if wait is None:
+                    self._reject("cuota por minuto agotada")
+                charged.append((bucket, min(amount, bucket.capacity)))
+                if wait > 0:
+                    await asyncio.sleep(wait)
+        except BaseException:
+            # La petición no llega a enviarse: se devuelve la cuota ya reservada
+            for bucket, amount in charged:
+                bucket.adjust(amount)
+            self.limiter.release()
+            raise
+
+        self.stats['admitted'] += 1
+
+    def release(self, error: Optional[BaseException] = None, tokens_delta: float = 0):
+        """Libera la plaza y ajusta el límite según el resultado"""
+        if error is None:
+            if self.tpm is not None and tokens_delta:
+                self.tpm.adjust(tokens_delta)
+            self.limiter.release(success=True)
+            return
+
+        if not is_overload_error(error):
+            self.limiter.release()
+            return
+
+        self.stats['overloaded'] += 1
+        self.limiter.release(success=False)
+        retry_after = get_retry_after(error)
+        if retry_after:
+            logger.warning(f"{self.name} pidió esperar {retry_after:.1f}s (Retry-After)")
+            for bucket in (self.rpm, self.tpm):
+                if bucket is not None:
+                    bucket.pause(retry_after)
+
+    def _reject(self, reason: str):
+        self.stats['rejected'] += 1
+        raise AdmissionRejectedError(f"Petición a {self.name} no admitida: {reason}")
+
+    def get_status(self) -> Dict[str, Any]:
+        """Obtiene el estado del control de admisión"""
+        return {
+            'concurrency_limit': int(self.limiter.limit),
+            'in_flight': self.limiter.in_flight,
+            'queued': self.limiter.queued,
+            'rpm_available': self.rpm.available if self.rpm else None,
+            'tpm_available': self.tpm.available if self.tpm else None,
+            **self.stats
+        }
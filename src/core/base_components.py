@@ -1,34 +1,60 @@
 from abc import ABC, abstractmethod
 from typing import Dict, Any, List, Optional
-from dataclasses import dataclass
 from datetime import datetime
+from src.core.provider_stats import RollingStats
+from src.core.metrics_buffer import MetricsRingBuffer
 
-@dataclass
 class TaskMetrics:
-    tokens_used: int = 0
-    cost: float = 0.0
-    latency: float = 0.0
-    success: bool = True
-    error_message: Optional[str] = None
-    timestamp: datetime = datetime.now()
+    """Métricas de una tarea (registro compacto con ``__slots__``)"""
+    
+    __slots__ = ('tokens_used', 'cost', 'latency', 'success', 'error_message', 'timestamp')
+    
+    def __init__(
+        self,
+        tokens_used: int = 0,
+        cost: float = 0.0,
+        latency: float = 0.0,
+        success: bool = True,
+        error_message: Optional[str] = None,
+        timestamp: Optional[datetime] = None
+    ):
+        self.tokens_used = tokens_used
+        self.cost = cost
+        self.latency = latency
+        self.success = success
+        self.error_message = error_message
+        self.timestamp = timestamp or datetime.now()
+    
+    def __repr__(self) -> str:
+        fields = ', '.join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"TaskMetrics({fields})"
 
 class BaseComponent(ABC):
     """Componente base para todos los elementos del sistema"""
     
     def __init__(self, config: Dict[str, Any]):
         self.config = config
-        self.metrics: List[TaskMetrics] = []
+        self.metrics = MetricsRingBuffer(TaskMetrics, config.get('metrics', {}).get('capacity', 10000))
+        self.stats = RollingStats(**config.get('stats', {}))
     
     def track_metrics(self, metrics: TaskMetrics):
         """Registra métricas de ejecución"""
         self.metrics.append(metrics)
+        self.stats.record(
+            latency=metrics.latency,
+            success=metrics.success,
+            tokens=metrics.tokens_used,
+            cost=metrics.cost
+        )
     
     def get_metrics_summary(self) -> Dict[str, Any]:
-        """Obtiene resumen de métricas"""
+        """Obtiene resumen de métricas (totales desde el arranque, medias sobre la ventana reciente)"""
+        summary = self.metrics.summary()
         return {
-            'total_tokens': sum(m.tokens_used for m in self.metrics),
-            'total_cost': sum(m.cost for m in self.metrics),
-            'avg_latency': sum(m.latency for m in self.metrics) / len(self.metrics) if self.metrics else 0,
-            'success_rate': sum(1 for m in self.metrics if m.success) / len(self.metrics) if self.metrics else 0,
-            'total_tasks': len(self.metrics)
-        } 
\ No newline at end of file
+            'total_tokens': summary['total_tokens'],
+            'total_cost': summary['total_cost'],
+            'avg_latency': summary['avg_latency'],
+            'p95_latency': summary['p95_latency'],
+            'success_rate': summary['success_rate'],
+            'total_tasks': summary['total_requests']
+        }
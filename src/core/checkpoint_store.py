@@ -0,0 +1,107 @@
+import hashlib
+import json
+import os
+import re
+import shutil
+import time
+from pathlib import Path
+from typing import Dict, Any, Optional, List
+from src.core.metrics_registry import get_metrics_registry
+from src.core.logging_system import logger
+
+_registry = get_metrics_registry()
+CHECKPOINT_STEPS = _registry.counter(
+    'checkpoint_steps', 'Salidas de pasos guardadas y restauradas', ('action',)
+)
+
+_unsafe = re.compile(r'[^A-Za-z0-9_.-]')
+
+def make_run_id(workflow: str, config: Dict[str, Any]) -> str:
+    """ID estable de una ejecución: mismo workflow y configuración, mismo ID"""
+    payload = json.dumps(
+        {key: value for key, value in config.items() if key not in ('run_id', 'checkpoint')},
+        sort_keys=True,
+        default=str,
+        ensure_ascii=False
+    )
+    digest = hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+    return f"{workflow}-{digest}"
+
+class CheckpointStore:
+    """Salidas de los pasos de cada ejecución, guardadas en disco al terminar cada paso
+
+    Cada paso queda en ``<directory>/<run_id>/<paso>.json`` escrito de forma
+    atómica, así que un corte a mitad de escritura no deja un checkpoint a
+    medias. Las ejecuciones que terminan bien se borran; las que fallan se
+    conservan ``ttl`` segundos para reanudarlas.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        self.configure(config)
+
+    def configure(self, config: Optional[Dict[str, Any]]):
+        config = config or {}
+        self.enabled = config.get('enabled', True)
+        self.directory = Path(config.get('directory', 'data/checkpoints'))
+        self.ttl: Optional[float] = config.get('ttl_seconds', 7 * 24 * 3600)
+
+    def _run_dir(self, run_id: str) -> Path:
+        return self.directory / _unsafe.sub('_', run_id)
+
+    def save(self, run_id: str, step: str, value: Any):
+        """Guarda la salida de un paso (un error de disco no interrumpe el workflow)"""
+        path = self._run_dir(run_id) / f"{_unsafe.sub('_', step)}.json"
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(
+                    {'step': step, 'saved_at': time.time(), 'value': value},
+                    f,
+                    default=str,
+                    ensure_ascii=False
+                )
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"No se pudo guardar el checkpoint {run_id}/{step}: {str(e)}")
+            return
+        CHECKPOINT_STEPS.inc(action='saved')
+
+    def load(self, run_id: str) -> Dict[str, Any]:
+        """Salidas guardadas de una ejecución por nombre de paso"""
+        run_dir = self._run_dir(run_id)
+        steps: Dict[str, Any] = {}
+        now = time.time()
+        for path in sorted(run_dir.glob('*.json')):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    entry = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                continue
+            if self.ttl is not None and now - entry.get('saved_at', 0) > self.ttl:
+                continue
+            steps[entry['step']] = entry['value']
+        if steps:
+            CHECKPOINT_STEPS.inc(len(steps), action='restored')
+        return steps
+
+    def delete(self, run_id: str):
+        """Borra los checkpoints de una ejecución"""
+        shutil.rmtree(self._run_dir(run_id), ignore_errors=True)
+
+    def list_runs(self) -> List[str]:
+        """Ejecuciones con checkpoints pendientes"""
+        if not self.directory.exists():
+            return []
+        return sorted(path.name for path in self.directory.iterdir() if path.is_dir())
+
+_store = CheckpointStore()
+
+def get_checkpoint_store() -> CheckpointStore:
+    """Almacén de checkpoints compartido por todo el proceso"""
+    return _store
+
+def configure_checkpoint_store(config: Dict[str, Any]) -> CheckpointStore:
+    """Reconfigura el almacén compartido (directorio, retención, activado)"""
+    _store.configure(config)
+    return _store
@@ -0,0 +1,206 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from enum import Enum, auto
+from typing import Dict, Any, Optional, Callable, Awaitable, Tuple, Type
+from src.core.logging_system import logger
+
+class CircuitState(Enum):
+    CLOSED = auto()
+    OPEN = auto()
+    HALF_OPEN = auto()
+
+class CircuitOpenError(Exception):
+    """El circuito del proveedor está abierto y no admite peticiones"""
+
+class CircuitBreaker:
+    """Circuit breaker por proveedor con estados cerrado/abierto/semiabierto
+
+    Se abre cuando, sobre la ventana de llamadas recientes, la tasa de fallos o
+    la de llamadas lentas supera su umbral. Pasado ``open_timeout`` pasa a
+    semiabierto: si hay una sonda configurada se lanzan peticiones de prueba en
+    segundo plano y el tráfico real no vuelve hasta que ``probe_successes``
+    sondas seguidas funcionan; sin sonda, se admiten pocas peticiones reales de
+    prueba.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        config: Optional[Dict[str, Any]] = None,
+        probe: Optional[Callable[[], Awaitable[Any]]] = None,
+        ignore: Tuple[Type[BaseException], ...] = ()
+    ):
+        config = config or {}
+        self.name = name
+        self.probe = probe
+        # Excepciones que no dicen nada de la salud del proveedor (p. ej. rechazos locales)
+        self.ignore = ignore
+        self.window = config.get('window', 20)
+        self.min_calls = config.get('min_calls', 10)
+        self.failure_rate_threshold = config.get('failure_rate_threshold', 0.5)
+        self.slow_call_threshold = config.get('slow_call_threshold', 30.0)
+        self.slow_call_rate_threshold = config.get('slow_call_rate_threshold', 0.8)
+        self.open_timeout = config.get('open_timeout', 30.0)
+        self.half_open_max_calls = config.get('half_open_max_calls', 1)
+        self.probe_successes = config.get('probe_successes', 2)
+
+        self.state = CircuitState.CLOSED
+        self._outcomes: deque = deque(maxlen=self.window)
+        self._opened_at = 0.0
+        self._half_open_calls = 0
+        self._probe_streak = 0
+        self._probe_task: Optional[asyncio.Task] = None
+        self._lock = threading.Lock()
+        self.stats = {
+            'opened': 0,
+            'rejected': 0,
+            'probes': 0
+        }
+
+    def is_available(self) -> bool:
+        """Indica si el proveedor puede recibir tráfico real ahora"""
+        with self._lock:
+            if self.state == CircuitState.CLOSED:
+                return True
+
+            if self.state == CircuitState.OPEN:
+                if time.time() - self._opened_at < self.open_timeout:
+                    return False
+                self._transition(CircuitState.HALF_OPEN)
+
+            if self.probe is not None:
+                self._schedule_probe()
+                return False
+
+            return self._half_open_calls < self.half_open_max_calls
+
+    async def call(self, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """Ejecuta una llamada protegida por el circuito"""
+        if not self.is_available():
+            self.stats['rejected'] += 1
+            raise CircuitOpenError(f"Circuito abierto para {self.name}")
+
+        with self._lock:
+            if self.state == CircuitState.HALF_OPEN:
+                self._half_open_calls += 1
+
+        start_time = time.time()
+        try:
+            result = await factory()
+        except (asyncio.CancelledError, *self.ignore):
+            with self._lock:
+                if self.state == CircuitState.HALF_OPEN:
+                    self._half_open_calls -= 1
+            raise
+        except Exception:
+            self.record_failure()
+            raise
+
+        self.record_success(time.time() - start_time)
+        return result
+
+    def record_success(self, latency: float):
+        with self._lock:
+            slow = latency >= self.slow_call_threshold
+            if self.state == CircuitState.HALF_OPEN:
+                self._half_open_calls -= 1
+                if slow:
+                    self._trip()
+                else:
+                    self._transition(CircuitState.CLOSED)
+                return
+            self._outcomes.append((False, slow))
+            self._evaluate()
+
+    def record_failure(self):
+        with self._lock:
+            if self.state == CircuitState.HALF_OPEN:
+                self._half_open_calls -= 1
+                self._trip()
+                return
+            self._outcomes.append((True, False))
+            self._evaluate()
+
+    def _evaluate(self):
+        if self.state != CircuitState.CLOSED or len(self._outcomes) < self.min_calls:
+            return
+
+        failures = sum(1 for failed, _ in self._outcomes if failed)
+        slow_calls = sum(1 for _, slow in self._outcomes if slow)
+        total = len(self._outcomes)
+
+        if failures / total >= self.failure_rate_threshold:
+            logger.warning(f"Abriendo circuito de {self.name}: tasa de fallos {failures / total:.0%}")
+            self._trip()
+        elif slow_calls / total >= self.slow_call_rate_threshold:
+            logger.warning(f"Abriendo circuito de {self.name}: {slow_calls / total:.0%} de llamadas lentas")
+            self._trip()
+
+    def _trip(self):
+        self._transition(CircuitState.OPEN)
+        self._opened_at = time.time()
+        self.stats['opened'] += 1
+
+    def _transition(self, state: CircuitState):
+        if state != self.state:
+            logger.info(f"Circuito de {self.name}: {self.state.name} -> {state.name}")
+        self.state = state
+        if state == CircuitState.CLOSED:
+            self._outcomes.clear()
+        if state != CircuitState.OPEN:
+            self._half_open_calls = 0
+            self._probe_streak = 0
+
+    def _schedule_probe(self):
+        """Lanza una sonda en segundo plano si no hay otra en curso"""
+        if self._probe_task is not None and not self._probe_task.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._probe_task = loop.create_task(self._run_probe())
+
+    async def _run_probe(self):
+        self.stats['probes'] += 1
+        start_time = time.time()
+        try:
+            await self.probe()
+        except asyncio.CancelledError:
+            raise
+        except self.ignore as e:
+            # Rechazo local: la sonda no llegó al proveedor; se reintenta en la próxima consulta
+            logger.info(f"Sonda de {self.name} no ejecutada: {str(e)}")
+            return
+        except Exception as e:
+            logger.info(f"Sonda de {self.name} fallida: {str(e)}")
+            with self._lock:
+                self._trip()
+            return
+
+        with self._lock:
+            if self.state != CircuitState.HALF_OPEN:
+                return
+            if time.time() - start_time >= self.slow_call_threshold:
+                self._trip()
+                return
+            self._probe_streak += 1
+            if self._probe_streak >= self.probe_successes:
+                self._transition(CircuitState.CLOSED)
+                return
+
+        # Encadenar la siguiente sonda hasta alcanzar las exitosas requeridas
+        self._probe_task = asyncio.get_running_loop().create_task(self._run_probe())
+
+    def get_status(self) -> Dict[str, Any]:
+        """Obtiene el estado del circuito"""
+        with self._lock:
+            failures = sum(1 for failed, _ in self._outcomes if failed)
+            return {
+                'state': self.state.name,
+                'recent_calls': len(self._outcomes),
+                'recent_failures': failures,
+                **self.stats
+            }
@@ -0,0 +1,302 @@
+import hashlib
+import os
+import re
+import shutil
+import threading
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Callable
+import yaml
+from dotenv import dotenv_values
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
+from src.core.logging_system import logger
+
+ENV_PATTERN = re.compile(r'\$\{([A-Za-z_][A-Za-z0-9_]*)(?::-([^}]*))?\}')
+
+DEFAULT_PATHS = {
+    'default': 'config/default_config.yaml',
+    'inference': 'config/inference_providers.yaml',
+    'inference_example': 'config/inference_providers.example.yaml',
+    'settings': 'config/settings.yaml',
+    'engines': 'config/engines.yaml',
+    'env': '.env'
+}
+
+class ConfigError(ValueError):
+    """La configuración no es válida"""
+
+class _Section(BaseModel):
+    # Las claves no modeladas se conservan tal cual para los componentes que las leen
+    model_config = ConfigDict(extra='allow')
+
+class ConcurrencySettings(_Section):
+    initial: float = Field(4, gt=0)
+    min: float = Field(1, gt=0)
+    max: float = Field(32, gt=0)
+    increase: float = Field(1.0, ge=0)
+    decrease_factor: float = Field(0.5, gt=0, le=1)
+    decrease_cooldown: float = Field(1.0, ge=0)
+
+class AdmissionSettings(_Section):
+    enabled: bool = True
+    rpm: Optional[float] = Field(None, gt=0)
+    tpm: Optional[float] = Field(None, gt=0)
+    max_queue: int = Field(100, ge=0)
+    max_wait: float = Field(60.0, gt=0)
+    concurrency: ConcurrencySettings = Field(default_factory=ConcurrencySettings)
+
+class ProviderSettings(_Section):
+    type: str
+    enabled: bool = True
+    api_key: Optional[str] = None
+    base_url: Optional[str] = None
+    default_model: Optional[str] = None
+    cost_per_token: float = Field(0.0, ge=0)
+    models: List[str] = Field(default_factory=list)
+    admission: AdmissionSettings = Field(default_factory=AdmissionSettings)
+
+class BudgetSettings(_Section):
+    daily_limit: Optional[float] = Field(None, ge=0)
+    downgrade_threshold: float = Field(0.8, ge=0, le=1)
+    downgrades: Dict[str, str] = Field(default_factory=dict)
+    state_file: Optional[str] = None
+
+class InferenceSettings(_Section):
+    providers: Dict[str, ProviderSettings] = Field(default_factory=dict)
+    admission: AdmissionSettings = Field(default_factory=AdmissionSettings)
+    budget: BudgetSettings = Field(default_factory=BudgetSettings)
+
+class MetricsServerSettings(_Section):
+    enabled: bool = True
+    host: str = '127.0.0.1'
+    port: int = Field(9464, ge=0, le=65535)
+    path: str = '/metrics'
+
+class AppSettings(_Section):
+    app: Dict[str, Any] = Field(default_factory=dict)
+    metrics_server: MetricsServerSettings = Field(default_factory=MetricsServerSettings)
+    inference_providers: InferenceSettings = Field(default_factory=InferenceSettings)
+
+def interpolate_env(value: Any, missing: Optional[set] = None) -> Any:
+    """Sustituye ``${VAR}`` y ``${VAR:-defecto}`` por variables de entorno
+
+    Las variables sin valor ni defecto quedan como cadena vacía y se anotan en
+    ``missing``.
+    """
+    if isinstance(value, dict):
+        return {key: interpolate_env(item, missing) for key, item in value.items()}
+    if isinstance(value, list):
+        return [interpolate_env(item, missing) for item in value]
+    if not isinstance(value, str):
+        return value
+
+    def replace(match: re.Match) -> str:
+        name, default = match.group(1), match.group(2)
+        if name in os.environ:
+            return os.environ[name]
+        if default is None and missing is not None:
+            missing.add(name)
+        return default or ''
+
+    return ENV_PATTERN.sub(replace, value)
+
+class ConfigManager:
+    """Carga, valida y vigila la configuración de la aplicación
+
+    Une ``default_config.yaml``, ``inference_providers.yaml`` y el límite de
+    costo de ``settings.yaml``, interpola variables de entorno y valida el
+    resultado contra ``AppSettings`` una sola vez por cambio. ``check()``
+    compara los mtime de los archivos vigilados (y su contenido, para ignorar
+    escrituras sin cambios) y notifica a los suscriptores; si la nueva versión
+    no es válida se conserva la anterior.
+    """
+
+    def __init__(self, paths: Optional[Dict[str, str]] = None):
+        self.paths = {**DEFAULT_PATHS, **(paths or {})}
+        self.watched = [
+            self.paths[key] for key in ('default', 'inference', 'settings', 'engines', 'env')
+        ]
+        self.settings: Optional[AppSettings] = None
+        self._config: Dict[str, Any] = {}
+        self._mtimes: Dict[str, Optional[int]] = {}
+        self._hashes: Dict[str, Optional[str]] = {}
+        # Variables que puso el .env (las del entorno real nunca se sustituyen)
+        self._env_keys: set = set()
+        self._listeners: List[Callable[[Dict[str, Any], List[str]], None]] = []
+        self._lock = threading.RLock()
+        self._watcher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    @property
+    def config(self) -> Dict[str, Any]:
+        """Configuración validada como diccionario (la carga si aún no se hizo)"""
+        with self._lock:
+            if self.settings is None:
+                self.load()
+            return self._config
+
+    def _read_yaml(self, key: str) -> Dict[str, Any]:
+        path = Path(self.paths[key])
+        if not path.exists():
+            return {}
+        with open(path) as f:
+            return yaml.safe_load(f) or {}
+
+    def _read_raw(self) -> Dict[str, Any]:
+        config = self._read_yaml('default')
+
+        inference_path = Path(self.paths['inference'])
+        example_path = Path(self.paths['inference_example'])
+        if not inference_path.exists() and example_path.exists():
+            # Copiar el archivo de ejemplo si no existe
+            shutil.copy(example_path, inference_path)
+        if inference_path.exists():
+            config['inference_providers'] = self._read_yaml('inference')
+
+        # El límite de costo diario guardado desde la interfaz tiene prioridad
+        settings = self._read_yaml('settings')
+        if settings.get('daily_cost_limit') is not None:
+            config.setdefault('inference_providers', {}).setdefault('budget', {})['daily_limit'] = settings['daily_cost_limit']
+        return config
+
+    def _load_env(self):
+        """Carga el .env sin pisar el entorno real; al recargar refresca solo lo que vino de él"""
+        env_path = Path(self.paths['env'])
+        values = dotenv_values(env_path) if env_path.exists() else {}
+        for key, value in values.items():
+            if value is None or (key in os.environ and key not in self._env_keys):
+                continue
+            os.environ[key] = value
+            self._env_keys.add(key)
+        # Las variables que se quitaron del .env dejan de estar definidas
+        for key in self._env_keys - values.keys():
+            os.environ.pop(key, None)
+        self._env_keys &= values.keys()
+
+    def load(self) -> Dict[str, Any]:
+        """Lee, interpola y valida la configuración; lanza ConfigError si no es válida"""
+        with self._lock:
+            self._load_env()
+            missing: set = set()
+            raw = interpolate_env(self._read_raw(), missing)
+            if missing:
+                logger.warning(f"Variables de entorno sin definir en la configuración: {', '.join(sorted(missing))}")
+            try:
+                settings = AppSettings.model_validate(raw)
+            except ValidationError as e:
+                raise ConfigError(f"Configuración no válida: {e}") from e
+
+            self.settings = settings
+            self._config = settings.model_dump(exclude_unset=True)
+            self._snapshot()
+            return self._config
+
+    def _fingerprint(self, path: str) -> Optional[str]:
+        file_path = Path(path)
+        if not file_path.exists():
+            return None
+        return hashlib.sha256(file_path.read_bytes()).hexdigest()
+
+    def _mtime(self, path: str) -> Optional[int]:
+        try:
+            return os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def _snapshot(self):
+        for path in self.watched:
+            self._mtimes[path] = self._mtime(path)
+            self._hashes[path] = self._fingerprint(path)
+
+    def changed_files(self) -> List[str]:
+        """Archivos vigilados cuyo contenido cambió desde la última carga"""
+        changed = []
+        for path in self.watched:
+            mtime = self._mtime(path)
+            if mtime == self._mtimes.get(path):
+                continue
+            self._mtimes[path] = mtime
+            fingerprint = self._fingerprint(path)
+            if fingerprint != self._hashes.get(path):
+                self._hashes[path] = fingerprint
+                changed.append(path)
+        return changed
+
+    def check(self) -> List[str]:
+        """Recarga si algún archivo cambió y notifica a los suscriptores
+
+        Devuelve los archivos modificados (lista vacía si no hubo cambios o la
+        nueva configuración no es válida).
+        """
+        with self._lock:
+            if self.settings is None:
+                self.load()
+                return []
+            changed = self.changed_files()
+            if not changed:
+                return []
+            try:
+                config = self.load()
+            except (ConfigError, yaml.YAMLError) as e:
+                logger.error(f"Se mantiene la configuración anterior: {str(e)}")
+                return []
+            listeners = list(self._listeners)
+
+        logger.info(f"Configuración recargada: {', '.join(changed)}")
+        for listener in listeners:
+            try:
+                listener(config, changed)
+            except Exception as e:
+                logger.error(f"Error aplicando la configuración recargada: {str(e)}")
+        return changed
+
+    def subscribe(self, listener: Callable[[Dict[str, Any], List[str]], None]):
+        """Registra ``listener(config, changed_files)`` para cada recarga"""
+        with self._lock:
+            if listener not in self._listeners:
+                self._listeners.append(listener)
+
+    def unsubscribe(self, listener: Callable[[Dict[str, Any], List[str]], None]):
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    def start_watching(self, interval: float = 2.0):
+        """Comprueba los archivos cada ``interval`` segundos en un hilo de fondo"""
+        with self._lock:
+            if self._watcher is not None and self._watcher.is_alive():
+                return
+            self._stop.clear()
+            self._watcher = threading.Thread(
+                target=self._watch, args=(interval,), name='config-watcher', daemon=True
+            )
+            self._watcher.start()
+
+    def _watch(self, interval: float):
+        while not self._stop.wait(interval):
+            try:
+                self.check()
+            except Exception as e:
+                logger.error(f"Error vigilando la configuración: {str(e)}")
+
+    def stop_watching(self):
+        self._stop.set()
+
+_manager: Optional[ConfigManager] = None
+_manager_lock = threading.Lock()
+
+def get_config_manager() -> ConfigManager:
+    """Gestor de configuración compartido por todo el proceso"""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = ConfigManager()
+        return _manager
+
+def configure_config_manager(paths: Optional[Dict[str, str]] = None) -> ConfigManager:
+    """Sustituye el gestor compartido por uno con otras rutas"""
+    global _manager
+    with _manager_lock:
+        if _manager is not None:
+            _manager.stop_watching()
+        _manager = ConfigManager(paths)
+        return _manager
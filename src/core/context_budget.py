@@ -0,0 +1,128 @@
+import hashlib
+from typing import Dict, Any, Optional, Callable, Awaitable, Tuple
+from src.core.response_cache import MemoryLRUCache
+from src.core.request_coalescer import RequestCoalescer
+from src.core.prompt_templates import get_prompt_registry
+from src.core.token_counter import count_tokens, get_token_counter
+from src.core.metrics_registry import get_metrics_registry
+from src.core.logging_system import logger
+
+_registry = get_metrics_registry()
+CONTEXT_TOKENS = _registry.counter(
+    'context_budget_tokens', 'Tokens de contexto encadenado antes y después de resumir', ('kind',)
+)
+
+DIGEST_PROMPT = get_prompt_registry().register('context.digest', """
+    Resume el texto indicado para usarlo como contexto de un paso posterior.
+    Conserva cifras, nombres propios, conclusiones y recomendaciones concretas;
+    omite introducciones, repeticiones y formato decorativo.
+    Usa como máximo {max_words} palabras.
+
+    Texto:
+    {text}
+""")
+
+# Resúmenes compartidos por todos los workflows y agentes del proceso
+_digests = MemoryLRUCache(max_entries=1000, ttl=24 * 3600)
+_coalescer = RequestCoalescer()
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Conserva las primeras líneas completas que caben en ``max_tokens`` (aproximado)"""
+    counter = get_token_counter()
+    if counter.approximate(text) <= max_tokens:
+        return text
+    kept, used = [], 0
+    for line in text.splitlines():
+        tokens = counter.approximate(line) + 1
+        if used + tokens > max_tokens:
+            if not kept:
+                kept.append(line[:int(max_tokens * counter.chars_per_token)])
+            break
+        kept.append(line)
+        used += tokens
+    return '\n'.join(kept).rstrip() + '\n[...]'
+
+class ContextBudgeter:
+    """Ajusta la salida de un paso al presupuesto de tokens de cada consumidor
+
+    Si el texto ya cabe se pasa completo; si no, se sustituye por un resumen
+    generado una sola vez por (texto, objetivo) y cacheado para el resto de
+    consumidores y ejecuciones. Las peticiones concurrentes del mismo resumen
+    comparten una única llamada. Si el resumen falla se recorta el texto.
+
+    Configuración (sección ``context_budget``): ``enabled``,
+    ``default_target``, ``words_per_token`` y ``targets`` (consumidor ->
+    tokens; 0 pasa siempre el texto completo).
+    """
+
+    def __init__(
+        self,
+        config: Optional[Dict[str, Any]] = None,
+        summarize: Optional[Callable[[str, int], Awaitable[str]]] = None
+    ):
+        config = config or {}
+        self.enabled = config.get('enabled', True)
+        self.default_target = config.get('default_target', 600)
+        self.words_per_token = config.get('words_per_token', 0.75)
+        self.targets: Dict[str, int] = config.get('targets', {})
+        self.summarize = summarize
+        self.stats = {
+            'passthrough': 0,
+            'digests': 0,
+            'cache_hits': 0,
+            'fallbacks': 0
+        }
+
+    def target_for(self, consumer: str, target: Optional[int] = None) -> int:
+        """Objetivo de tokens de un consumidor (la configuración tiene prioridad)"""
+        if consumer in self.targets:
+            return self.targets[consumer]
+        return target if target is not None else self.default_target
+
+    async def fit(self, text: Any, consumer: str, target: Optional[int] = None) -> str:
+        """Texto completo o resumen cacheado según el objetivo del consumidor"""
+        text = str(text)
+        max_tokens = self.target_for(consumer, target)
+        tokens = count_tokens(text)
+        if not self.enabled or max_tokens <= 0 or tokens <= max_tokens:
+            self.stats['passthrough'] += 1
+            return text
+
+        key = hashlib.sha256(f"{max_tokens}\0{text}".encode('utf-8')).hexdigest()
+        digest = _digests.get(key)
+        if digest is not None:
+            self.stats['cache_hits'] += 1
+        else:
+            digest, cacheable = await _coalescer.run(key, lambda: self._digest(text, max_tokens))
+            if cacheable:
+                _digests.set(key, digest)
+
+        CONTEXT_TOKENS.inc(tokens, kind='original')
+        CONTEXT_TOKENS.inc(count_tokens(digest), kind='digest')
+        return digest
+
+    async def _digest(self, text: str, max_tokens: int) -> Tuple[str, bool]:
+        """Resumen y si puede cachearse (los recortes no se guardan)"""
+        self.stats['digests'] += 1
+        if self.summarize is None:
+            self.stats['fallbacks'] += 1
+            return truncate_to_tokens(text, max_tokens), False
+
+        prompt = DIGEST_PROMPT.render(
+            max_words=max(1, int(max_tokens * self.words_per_token)),
+            text=text
+        )
+        try:
+            digest = str(await self.summarize(prompt, max_tokens))
+        except Exception as e:
+            logger.warning(f"No se pudo resumir el contexto, se recorta: {str(e)}")
+            self.stats['fallbacks'] += 1
+            return truncate_to_tokens(text, max_tokens), False
+        return truncate_to_tokens(digest, max_tokens), True
+
+    def get_stats(self) -> Dict[str, Any]:
+        return dict(self.stats)
+
+def clear_digest_cache():
+    """Vacía los resúmenes compartidos"""
+    _digests.clear()
@@ -0,0 +1,193 @@
+import fnmatch
+import json
+import os
+import threading
+from datetime import date
+from itertools import count
+from pathlib import Path
+from typing import Dict, Any, Optional, Callable, Awaitable
+from src.core.logging_system import logger
+
+class BudgetExceededError(Exception):
+    """La llamada superaría el límite de costo diario"""
+
+class Reservation:
+    """Costo reservado para una llamada en curso"""
+
+    __slots__ = ('id', 'amount', 'day')
+
+    def __init__(self, id: int, amount: float, day: str):
+        self.id = id
+        self.amount = amount
+        self.day = day
+
+class CostBudget:
+    """Presupuesto de costo diario compartido por todos los workflows del proceso
+
+    Antes de cada llamada se reserva su costo estimado; al terminar se sustituye
+    la reserva por el costo real. Las reservas cuentan como gasto mientras la
+    llamada está en curso, así que muchas llamadas concurrentes no pueden
+    superar juntas el límite. Por encima de ``downgrade_threshold`` (fracción
+    del límite) se sugieren modelos más baratos y las llamadas que no caben se
+    rechazan con BudgetExceededError.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        self.state_file = (config or {}).get('state_file', 'data/budget/state.json')
+        self.configure(config)
+
+        self._day = date.today().isoformat()
+        self._spent = 0.0
+        self._reserved = 0.0
+        self._ids = count(1)
+        self._lock = threading.Lock()
+        self.stats = {
+            'reservations': 0,
+            'rejected': 0,
+            'downgraded': 0
+        }
+        self._load_state()
+
+    def configure(self, config: Optional[Dict[str, Any]]):
+        """Aplica límites y degradaciones sin perder el gasto ni las reservas en curso"""
+        config = config or {}
+        self.daily_limit: Optional[float] = config.get('daily_limit')
+        self.downgrade_threshold = config.get('downgrade_threshold', 0.8)
+        self.downgrades: Dict[str, str] = config.get('downgrades', {})
+
+    def _load_state(self):
+        """Recupera el gasto del día si el proceso se reinició"""
+        if not self.state_file:
+            return
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+        if state.get('day') == self._day:
+            self._spent = float(state.get('spent', 0.0))
+
+    def _save_state(self):
+        if not self.state_file:
+            return
+        path = Path(self.state_file)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'day': self._day, 'spent': self._spent}, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"No se pudo guardar el estado del presupuesto: {str(e)}")
+
+    def _rollover(self):
+        today = date.today().isoformat()
+        if today != self._day:
+            self._day = today
+            self._spent = 0.0
+            self._reserved = 0.0
+
+    @property
+    def committed(self) -> float:
+        """Gasto real más reservas en curso del día"""
+        with self._lock:
+            self._rollover()
+            return self._spent + self._reserved
+
+    def usage_ratio(self) -> float:
+        if not self.daily_limit:
+            return 0.0
+        return self.committed / self.daily_limit
+
+    def should_downgrade(self) -> bool:
+        """Indica si el gasto está cerca del límite y conviene usar modelos baratos"""
+        return self.daily_limit is not None and self.usage_ratio() >= self.downgrade_threshold
+
+    def choose_model(self, model: Optional[str]) -> Optional[str]:
+        """Devuelve un modelo más barato si el presupuesto está cerca del límite"""
+        if not model or not self.should_downgrade():
+            return model
+        name = model.lower()
+        for pattern, cheaper in self.downgrades.items():
+            if fnmatch.fnmatch(name, pattern.lower()):
+                self.stats['downgraded'] += 1
+                logger.info(f"Presupuesto al {self.usage_ratio():.0%}: usando {cheaper} en lugar de {model}")
+                return cheaper
+        return model
+
+    def reserve(self, estimated_cost: float) -> Reservation:
+        """Reserva el costo estimado o lanza BudgetExceededError si no cabe"""
+        with self._lock:
+            self._rollover()
+            if self.daily_limit is not None and estimated_cost > 0:
+                committed = self._spent + self._reserved
+                if committed + estimated_cost > self.daily_limit:
+                    self.stats['rejected'] += 1
+                    raise BudgetExceededError(
+                        f"Límite de costo diario alcanzado: ${committed:.4f} comprometidos "
+                        f"+ ${estimated_cost:.4f} estimados > ${self.daily_limit:.2f}"
+                    )
+            self._reserved += estimated_cost
+            self.stats['reservations'] += 1
+            return Reservation(next(self._ids), estimated_cost, self._day)
+
+    def reconcile(self, reservation: Reservation, actual_cost: Optional[float]):
+        """Sustituye la reserva por el costo real (la estimación si no se conoce)"""
+        with self._lock:
+            self._rollover()
+            if reservation.day == self._day:
+                self._reserved -= reservation.amount
+            self._spent += reservation.amount if actual_cost is None else actual_cost
+            self._save_state()
+
+    def cancel(self, reservation: Reservation):
+        """Libera una reserva cuya llamada no llegó a facturarse"""
+        with self._lock:
+            self._rollover()
+            if reservation.day == self._day:
+                self._reserved -= reservation.amount
+
+    async def run(
+        self,
+        factory: Callable[[], Awaitable[Any]],
+        estimated_cost: float,
+        cost_of: Callable[[Any], Optional[float]]
+    ) -> Any:
+        """Ejecuta ``factory`` con una reserva y la concilia con ``cost_of(resultado)``"""
+        reservation = self.reserve(estimated_cost)
+        try:
+            result = await factory()
+        except BaseException:
+            self.cancel(reservation)
+            raise
+        self.reconcile(reservation, cost_of(result))
+        return result
+
+    def set_daily_limit(self, limit: Optional[float]):
+        with self._lock:
+            self.daily_limit = limit
+
+    def get_status(self) -> Dict[str, Any]:
+        """Obtiene el estado del presupuesto del día"""
+        with self._lock:
+            self._rollover()
+            return {
+                'day': self._day,
+                'daily_limit': self.daily_limit,
+                'spent': self._spent,
+                'reserved': self._reserved,
+                'remaining': None if self.daily_limit is None
+                    else max(0.0, self.daily_limit - self._spent - self._reserved),
+                **self.stats
+            }
+
+_budget = CostBudget()
+
+def get_cost_budget() -> CostBudget:
+    """Presupuesto compartido por todo el proceso"""
+    return _budget
+
+def configure_cost_budget(config: Dict[str, Any]) -> CostBudget:
+    """Reconfigura el presupuesto compartido conservando el gasto y las reservas del día"""
+    _budget.configure(config)
+    return _budget
@@ -1,6 +1,34 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Callable, Awaitable
 from src.core.base_components import BaseComponent
 from src.engines.base_engine import BaseAIEngine
+from src.engines.registry import ENGINE_REGISTRY
+from src.core.response_cache import ResponseCache, make_cache_key
+from src.core.request_coalescer import RequestCoalescer
+from src.core.circuit_breaker import CircuitBreaker, CircuitOpenError
+from src.core.cost_budget import get_cost_budget, configure_cost_budget, BudgetExceededError
+from src.core.token_counter import ContextWindowExceededError
+from src.core.logging_system import logger
+
+# Envuelve la llamada protegida a un motor: (nombre, llamada) -> resultado de la llamada
+CallWrapper = Callable[[str, Callable[[], Awaitable[Dict[str, Any]]]], Awaitable[Dict[str, Any]]]
+
+class AllEnginesFailedError(RuntimeError):
+    """Fallaron el motor elegido y todos los de respaldo (mensaje del error del principal)"""
+
+class TaskEngine:
+    """Motor de una tarea cuyas llamadas van por el camino protegido del gestor
+
+    Tiene el ``generate_text`` de un motor, pero cada llamada pasa por caché,
+    coalescencia de llamadas idénticas, circuit breaker y fallback.
+    """
+
+    def __init__(self, manager: 'AIEngineManager', task: str, wrap_call: Optional[CallWrapper] = None):
+        self.manager = manager
+        self.task = task
+        self.wrap_call = wrap_call
+
+    async def generate_text(self, prompt: str, **kwargs) -> Dict[str, Any]:
+        return await self.manager.generate_for_task(self.task, prompt, wrap_call=self.wrap_call, **kwargs)
 
 class AIEngineManager(BaseComponent):
     """Gestor de motores de IA"""
@@ -8,42 +36,77 @@ class AIEngineManager(BaseComponent):
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
         self.engines: Dict[str, BaseAIEngine] = {}
+        self.breakers: Dict[str, CircuitBreaker] = {}
         self.fallback_strategy = config.get('fallback_strategy', 'round_robin')
+        self.cache = ResponseCache(config.get('cache', {}), namespace='engines')
+        self.coalescer = RequestCoalescer()
+        if 'budget' in config:
+            configure_cost_budget(config['budget'])
         self.load_engines()
     
     def load_engines(self):
         """Carga los motores configurados"""
         for engine_name, engine_config in self.config.get('engines', {}).items():
-            engine_class = self._get_engine_class(engine_config['type'])
-            self.engines[engine_name] = engine_class(
-                api_key=engine_config['api_key'],
-                config=engine_config
-            )
+            engine_class = self._get_engine_class(engine_name, engine_config.get('type'))
+            if not engine_class:
+                continue
+            engine = engine_class(engine_config)
+            self.engines[engine_name] = engine
+            self.breakers[engine_name] = self._create_breaker(engine_name, engine, engine_config)
     
-    def _get_engine_class(self, engine_type: str) -> type:
-        """Obtiene la clase del motor según el tipo"""
-        from src.engines.openai_engine import OpenAIEngine
-        from src.engines.anthropic_engine import AnthropicEngine
-        from src.engines.google_engine import GoogleEngine
-        
-        engine_classes = {
-            'openai': OpenAIEngine,
-            'anthropic': AnthropicEngine,
-            'google': GoogleEngine
+    def _create_breaker(
+        self,
+        name: str,
+        engine: BaseAIEngine,
+        engine_config: Dict[str, Any]
+    ) -> CircuitBreaker:
+        """Crea el circuit breaker de un motor con una sonda mínima"""
+        breaker_config = {
+            **self.config.get('circuit_breaker', {}),
+            **engine_config.get('circuit_breaker', {})
         }
-        
-        return engine_classes.get(engine_type)
+        return CircuitBreaker(
+            name,
+            breaker_config,
+            # Rechazos locales: no dicen nada de la salud del motor
+            ignore=(BudgetExceededError, ContextWindowExceededError),
+            probe=lambda: engine.probe(breaker_config.get('probe_prompt', 'ping'))
+        )
+    
+    def get_available_engines(self) -> Dict[str, BaseAIEngine]:
+        """Motores cuyo circuito admite tráfico"""
+        return {
+            name: engine
+            for name, engine in self.engines.items()
+            if self.breakers[name].is_available()
+        }
+    
+    def _get_engine_class(self, name: str, engine_type: str) -> Optional[type]:
+        """Clase del motor desde el registro (None si no se puede cargar)"""
+        try:
+            return ENGINE_REGISTRY.get(engine_type)
+        except KeyError:
+            logger.warning(f"Motor {name} ignorado: tipo desconocido {engine_type}")
+        except ImportError as e:
+            logger.error(f"Motor {name} ignorado: no se pudo importar {engine_type}: {str(e)}")
+        return None
     
     def select_best_engine(
         self, 
         task: str, 
         criteria: List[str] = ["cost", "speed", "quality"]
     ) -> BaseAIEngine:
-        """Selecciona el mejor motor para una tarea"""
+        """Selecciona el mejor motor disponible para una tarea"""
         scored_engines = [
             (engine, self._evaluate_engine(engine, task, criteria))
-            for engine in self.engines.values()
+            for engine in self.get_available_engines().values()
         ]
+        if not scored_engines:
+            raise CircuitOpenError("No hay motores disponibles: todos los circuitos están abiertos")
+        
+        if get_cost_budget().should_downgrade():
+            # Cerca del límite diario: el motor más barato, sin importar la puntuación
+            return min(scored_engines, key=lambda x: x[0]._calculate_cost(1000))[0]
         
         return max(scored_engines, key=lambda x: x[1])[0]
     
@@ -53,38 +116,114 @@ class AIEngineManager(BaseComponent):
         task: str, 
         criteria: List[str]
     ) -> float:
-        """Evalúa un motor según criterios"""
+        """Evalúa un motor según criterios (estadísticas recientes, O(1))"""
         score = 0.0
-        metrics = engine.get_usage_report()
+        stats = engine.stats.snapshot()
         
         if "cost" in criteria:
-            # Menor costo = mejor puntuación
-            cost_score = 1.0 / (metrics['total_cost'] + 1.0)
+            # Menor costo por 1K tokens = mejor puntuación
+            cost_score = 1.0 / ((stats['cost_per_1k_tokens'] or 0.0) + 1.0)
             score += cost_score * 0.4
         
         if "speed" in criteria:
             # Menor latencia = mejor puntuación
-            speed_score = 1.0 / (metrics.get('avg_latency', 1.0) + 1.0)
+            ewma_latency = stats['ewma_latency'] if stats['ewma_latency'] is not None else 1.0
+            speed_score = 1.0 / (ewma_latency + 1.0)
             score += speed_score * 0.3
         
         if "quality" in criteria:
-            # Mayor tasa de éxito = mejor puntuación
-            quality_score = metrics.get('success_rate', 0.5)
+            # Mayor tasa de éxito reciente = mejor puntuación
+            quality_score = stats['success_rate'] if stats['success_rate'] is not None else 0.5
             score += quality_score * 0.3
         
         return score
     
-    def execute_with_fallback(
+    def engine_for_task(self, task: str, wrap_call: Optional[CallWrapper] = None) -> TaskEngine:
+        """Motor para una tarea con caché, coalescencia, circuit breaker y fallback"""
+        return TaskEngine(self, task, wrap_call)
+    
+    async def generate_for_task(
+        self,
+        task: str,
+        prompt: str,
+        use_cache: bool = True,
+        wrap_call: Optional[CallWrapper] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """Como ``execute_with_fallback`` pero devuelve la respuesta del motor
+
+        Si fallan todos los motores lanza ``AllEnginesFailedError``.
+        ``wrap_call`` envuelve la llamada a cada motor por fuera del circuit
+        breaker (p. ej. los límites por motor de un lote: esperar turno no
+        cuenta como llamada lenta).
+        """
+        response = await self._execute(task, prompt, use_cache, wrap_call, kwargs)
+        return response['result']
+    
+    async def execute_with_fallback(
         self, 
         task: str, 
         prompt: str, 
+        use_cache: bool = True,
         **kwargs
     ) -> Dict[str, Any]:
         """Ejecuta una tarea con manejo de fallback"""
-        primary_engine = self.select_best_engine(task)
+        try:
+            return await self._execute(task, prompt, use_cache, None, kwargs)
+        except AllEnginesFailedError as e:
+            return {
+                'result': None,
+                'error': str(e),
+                'success': False
+            }
+    
+    async def _execute(
+        self,
+        task: str,
+        prompt: str,
+        use_cache: bool,
+        wrap_call: Optional[CallWrapper],
+        kwargs: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Caché y coalescencia alrededor de la ejecución con fallback
+
+        La clave incluye la tarea y el motor y modelo elegidos: tareas que se
+        enrutan a motores distintos no comparten respuestas.
+        """
+        try:
+            primary_engine = self.select_best_engine(task)
+        except CircuitOpenError as e:
+            # Sin motores disponibles: mismo fallo que si hubieran fallado todos
+            raise AllEnginesFailedError(str(e)) from e
         
+        route = f"{self.engine_name(primary_engine)}:{getattr(primary_engine, 'model', None)}"
+        cache_key = make_cache_key(prompt, route, {**kwargs, 'task': task})
+        if use_cache:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return {**cached, 'cached': True}
+        
+        # Las llamadas idénticas concurrentes comparten una sola ejecución
+        response = await self.coalescer.run(
+            cache_key,
+            lambda: self._execute_uncached(primary_engine, prompt, wrap_call, **kwargs)
+        )
+        
+        if use_cache:
+            self.cache.set(cache_key, response)
+        
+        return response
+    
+    async def _execute_uncached(
+        self,
+        primary_engine: BaseAIEngine,
+        prompt: str,
+        wrap_call: Optional[CallWrapper] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """Ejecuta la tarea en el motor elegido y recurre a los demás si falla"""
         try:
-            result = primary_engine.generate_text(prompt, **kwargs)
+            result = await self._call_engine(primary_engine, prompt, wrap_call, **kwargs)
             return {
                 'result': result,
                 'engine': primary_engine.__class__.__name__,
@@ -93,24 +232,42 @@ class AIEngineManager(BaseComponent):
         except Exception as e:
             # Si falla, intenta con el siguiente mejor motor
             backup_engines = [
-                engine for engine in self.engines.values()
+                engine for engine in self.get_available_engines().values()
                 if engine != primary_engine
             ]
             
             for engine in backup_engines:
                 try:
-                    result = engine.generate_text(prompt, **kwargs)
+                    result = await self._call_engine(engine, prompt, wrap_call, **kwargs)
                     return {
                         'result': result,
                         'engine': engine.__class__.__name__,
                         'success': True,
                         'fallback_used': True
                     }
-                except:
+                except Exception:
                     continue
             
-            return {
-                'result': None,
-                'error': str(e),
-                'success': False
-            } 
\ No newline at end of file
+            raise AllEnginesFailedError(str(e)) from e
+    
+    def engine_name(self, engine: BaseAIEngine) -> str:
+        """Nombre con el que está registrado un motor"""
+        return next(name for name, registered in self.engines.items() if registered is engine)
+    
+    async def _call_engine(
+        self,
+        engine: BaseAIEngine,
+        prompt: str,
+        wrap_call: Optional[CallWrapper] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """Llama a un motor a través de su circuit breaker"""
+        name = self.engine_name(engine)
+        breaker = self.breakers[name]
+        
+        def call():
+            return breaker.call(lambda: engine.generate_text(prompt, **kwargs))
+        
+        if wrap_call is None:
+            return await call()
+        return await wrap_call(name, call)
@@ -0,0 +1,64 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Optional, List, Iterable, Callable, Awaitable
+from src.core.metrics_registry import get_metrics_registry
+
+_registry = get_metrics_registry()
+FAN_OUT_ITEMS = _registry.counter(
+    'fan_out_items', 'Elementos procesados en paralelo por resultado', ('name', 'status')
+)
+FAN_OUT_LATENCY = _registry.histogram(
+    'fan_out_item_latency_seconds', 'Latencia de cada elemento de un fan-out', ('name',)
+)
+
+@dataclass
+class FanOutResult:
+    """Resultado de un elemento: ``value`` si terminó bien, ``error`` si falló"""
+    item: Any
+    value: Any = None
+    error: Optional[Exception] = None
+    latency: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+async def fan_out(
+    items: Iterable[Any],
+    func: Callable[[Any], Awaitable[Any]],
+    limit: Optional[int] = 4,
+    name: str = 'fan_out'
+) -> List[FanOutResult]:
+    """Aplica ``func`` a cada elemento con como máximo ``limit`` llamadas a la vez
+
+    Los resultados se devuelven en el orden de ``items`` sin importar cuándo
+    termina cada uno. El error de un elemento queda en su resultado y no
+    interrumpe a los demás; la cancelación sí se propaga. ``limit`` None o
+    menor que 1 no limita.
+    """
+    items = list(items)
+    semaphore = asyncio.Semaphore(limit) if limit and limit > 0 else None
+
+    async def run(item: Any) -> FanOutResult:
+        if semaphore is not None:
+            await semaphore.acquire()
+        start = time.monotonic()
+        try:
+            result = FanOutResult(item, value=await func(item))
+        except Exception as e:
+            result = FanOutResult(item, error=e)
+        finally:
+            if semaphore is not None:
+                semaphore.release()
+        result.latency = time.monotonic() - start
+        FAN_OUT_LATENCY.observe(result.latency, name=name)
+        FAN_OUT_ITEMS.inc(name=name, status='success' if result.ok else 'error')
+        return result
+
+    return list(await asyncio.gather(*(run(item) for item in items)))
+
+def raise_if_all_failed(results: List[FanOutResult]):
+    """Propaga el primer error si ningún elemento terminó bien"""
+    if results and not any(result.ok for result in results):
+        raise results[0].error
@@ -0,0 +1,38 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Tuple
+
+async def run_hedged(
+    primary: Callable[[], Awaitable[Any]],
+    backup: Callable[[], Awaitable[Any]],
+    delay: float
+) -> Tuple[str, Any, bool]:
+    """Ejecuta ``primary`` y, si no responde en ``delay`` segundos, lanza ``backup``
+
+    Devuelve ``(ganador, resultado, cubierta)`` donde ``ganador`` es
+    ``'primary'`` o ``'backup'`` y ``cubierta`` indica si se lanzó el respaldo.
+    Usa la primera respuesta exitosa y cancela la otra. Si el primario falla antes del plazo se lanza el
+    respaldo de inmediato. Si ambos fallan se propaga el error del primario.
+    """
+    primary_task = asyncio.ensure_future(primary())
+    tasks = {primary_task: 'primary'}
+
+    try:
+        done, _ = await asyncio.wait({primary_task}, timeout=delay)
+        if primary_task in done and primary_task.exception() is None:
+            return 'primary', primary_task.result(), False
+
+        backup_task = asyncio.ensure_future(backup())
+        tasks[backup_task] = 'backup'
+        pending = {task for task in tasks if not task.done()}
+
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return tasks[task], task.result(), True
+
+        raise primary_task.exception()
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
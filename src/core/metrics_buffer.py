@@ -0,0 +1,149 @@
+import threading
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Type
+import numpy as np
+
+NUMERIC_COLUMNS = {
+    'latency': np.float64,
+    'tokens_used': np.int64,
+    'cost': np.float64,
+    'success': np.bool_,
+    'timestamp': np.float64
+}
+
+class MetricsRingBuffer:
+    """Buffer circular columnar de métricas sobre arrays NumPy preasignados
+
+    Guarda los últimos ``capacity`` registros: las columnas numéricas en arrays
+    contiguos y el resto de campos del registro (mensaje de error, modelo) en
+    arrays de objetos. La memoria es fija sin importar el tráfico. Los totales
+    de tokens, costo y peticiones se acumulan desde el arranque; medias, tasas y
+    percentiles se calculan vectorizados sobre la ventana retenida.
+    """
+
+    def __init__(self, record_type: Type, capacity: int = 10000):
+        self.record_type = record_type
+        self.capacity = capacity
+        self.columns = {
+            name: np.zeros(capacity, dtype=dtype)
+            for name, dtype in NUMERIC_COLUMNS.items()
+        }
+        self.labels = {
+            name: np.full(capacity, None, dtype=object)
+            for name in record_type.__slots__
+            if name not in NUMERIC_COLUMNS
+        }
+        self._next = 0
+        self._size = 0
+        self._lock = threading.Lock()
+        self.totals = {
+            'count': 0,
+            'tokens': 0,
+            'cost': 0.0
+        }
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, record: Any):
+        """Añade un registro (sobrescribe el más antiguo si está lleno)"""
+        with self._lock:
+            slot = self._next
+            for name, column in self.columns.items():
+                value = getattr(record, name)
+                column[slot] = value.timestamp() if isinstance(value, datetime) else value
+            for name, column in self.labels.items():
+                column[slot] = getattr(record, name)
+
+            self._next = (slot + 1) % self.capacity
+            self._size = min(self._size + 1, self.capacity)
+            self.totals['count'] += 1
+            self.totals['tokens'] += int(record.tokens_used)
+            self.totals['cost'] += float(record.cost)
+
+    def _order(self) -> np.ndarray:
+        """Índices de la ventana retenida en orden cronológico"""
+        if self._size < self.capacity:
+            return np.arange(self._size)
+        return (np.arange(self.capacity) + self._next) % self.capacity
+
+    def column(self, name: str) -> np.ndarray:
+        """Copia de una columna en orden cronológico"""
+        with self._lock:
+            source = self.columns.get(name)
+            if source is None:
+                source = self.labels[name]
+            return source[self._order()]
+
+    def records(self, last: Optional[int] = None) -> List[Any]:
+        """Reconstruye los registros retenidos (los ``last`` más recientes si se indica)"""
+        with self._lock:
+            order = self._order()
+            if last is not None:
+                order = order[-last:] if last > 0 else order[:0]
+            result = []
+            for slot in order:
+                fields = {name: column[slot].item() for name, column in self.columns.items()}
+                fields['timestamp'] = datetime.fromtimestamp(fields['timestamp'])
+                fields.update({name: column[slot] for name, column in self.labels.items()})
+                result.append(self.record_type(**fields))
+            return result
+
+    def summary(self) -> Dict[str, Any]:
+        """Totales desde el arranque y estadísticas vectorizadas de la ventana"""
+        with self._lock:
+            size = self._size
+            latency = self.columns['latency'][:size]
+            success = self.columns['success'][:size]
+            summary = {
+                'total_tokens': self.totals['tokens'],
+                'total_cost': self.totals['cost'],
+                'total_requests': self.totals['count'],
+                'avg_latency': 0.0,
+                'p50_latency': 0.0,
+                'p95_latency': 0.0,
+                'success_rate': 0.0
+            }
+            if size:
+                p50, p95 = np.percentile(latency, [50, 95])
+                summary.update({
+                    'avg_latency': float(latency.mean()),
+                    'p50_latency': float(p50),
+                    'p95_latency': float(p95),
+                    'success_rate': float(success.mean())
+                })
+            return summary
+
+    def group_summary(self, label: str) -> Dict[Any, Dict[str, Any]]:
+        """Costo, tokens y latencia media de la ventana agrupados por un campo (p. ej. modelo)"""
+        with self._lock:
+            size = self._size
+            keys = self.labels[label][:size]
+            if not size:
+                return {}
+            groups, inverse = np.unique(keys.astype(str), return_inverse=True)
+            counts = np.bincount(inverse, minlength=len(groups))
+            cost = np.bincount(inverse, weights=self.columns['cost'][:size], minlength=len(groups))
+            tokens = np.bincount(inverse, weights=self.columns['tokens_used'][:size], minlength=len(groups))
+            latency = np.bincount(inverse, weights=self.columns['latency'][:size], minlength=len(groups))
+            return {
+                group: {
+                    'requests_count': int(counts[i]),
+                    'total_cost': float(cost[i]),
+                    'total_tokens': int(tokens[i]),
+                    'avg_latency': float(latency[i] / counts[i])
+                }
+                for i, group in enumerate(groups)
+            }
+
+    def clear(self):
+        with self._lock:
+            self._next = 0
+            self._size = 0
+            for column in self.labels.values():
+                column.fill(None)
+            self.totals = {
+                'count': 0,
+                'tokens': 0,
+                'cost': 0.0
+            }
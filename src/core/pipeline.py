@@ -0,0 +1,116 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Optional, Dict, List, Iterable, Callable, Awaitable
+from src.core.fan_out import FanOutResult
+from src.core.metrics_registry import get_metrics_registry
+
+_registry = get_metrics_registry()
+PIPELINE_ITEMS = _registry.counter(
+    'pipeline_items', 'Elementos procesados por etapa de pipeline y resultado', ('pipeline', 'stage', 'status')
+)
+PIPELINE_STAGE_LATENCY = _registry.histogram(
+    'pipeline_stage_latency_seconds', 'Latencia de cada elemento en cada etapa', ('pipeline', 'stage')
+)
+
+# Marca de fin de entrada para los workers de una etapa
+_DONE = object()
+
+@dataclass
+class PipelineStage:
+    """Etapa del pipeline: ``func`` recibe la salida de la etapa anterior"""
+    name: str
+    func: Callable[[Any], Awaitable[Any]]
+    workers: int = 1
+
+@dataclass
+class PipelineResult(FanOutResult):
+    """Resultado de un elemento con la etapa en la que falló y la latencia de cada una"""
+    stage: Optional[str] = None
+    stage_latencies: Dict[str, float] = field(default_factory=dict)
+
+class AsyncPipeline:
+    """Pipeline por elemento entre etapas unidas por colas acotadas
+
+    Cada elemento pasa a la siguiente etapa en cuanto termina la anterior, sin
+    esperar al resto, así que un elemento lento no retrasa a los demás. Las
+    colas de tamaño ``queue_size`` aplican contrapresión a las etapas
+    previas. Un error descarta solo ese elemento (queda en su resultado con la
+    etapa que falló); los resultados se devuelven en el orden de entrada y
+    ``latency`` es el tiempo desde el inicio hasta que el elemento terminó.
+    """
+
+    def __init__(self, stages: List[PipelineStage], queue_size: int = 4, name: str = 'pipeline'):
+        if not stages:
+            raise ValueError("El pipeline necesita al menos una etapa")
+        self.stages = stages
+        self.queue_size = max(1, queue_size)
+        self._workers = [max(1, stage.workers) for stage in stages]
+        self.name = name
+
+    async def run(
+        self,
+        items: Iterable[Any],
+        on_result: Optional[Callable[[PipelineResult], None]] = None
+    ) -> List[PipelineResult]:
+        """Procesa ``items``; ``on_result`` se llama con cada elemento al terminar"""
+        items = list(items)
+        results: List[Optional[PipelineResult]] = [None] * len(items)
+        queues = [asyncio.Queue(maxsize=self.queue_size) for _ in self.stages]
+        started = time.monotonic()
+
+        def finish(index: int, result: PipelineResult):
+            result.latency = time.monotonic() - started
+            results[index] = result
+            if on_result is not None:
+                on_result(result)
+
+        async def feed():
+            for index, item in enumerate(items):
+                await queues[0].put((index, PipelineResult(item), item))
+            for _ in range(self._workers[0]):
+                await queues[0].put(_DONE)
+
+        async def work(position: int):
+            stage = self.stages[position]
+            last = position == len(self.stages) - 1
+            labels = {'pipeline': self.name, 'stage': stage.name}
+            while True:
+                entry = await queues[position].get()
+                if entry is _DONE:
+                    return
+                index, result, value = entry
+                stage_start = time.monotonic()
+                try:
+                    value = await stage.func(value)
+                except Exception as e:
+                    result.error = e
+                    result.stage = stage.name
+                result.stage_latencies[stage.name] = time.monotonic() - stage_start
+                PIPELINE_STAGE_LATENCY.observe(result.stage_latencies[stage.name], **labels)
+                PIPELINE_ITEMS.inc(status='success' if result.ok else 'error', **labels)
+
+                if not result.ok:
+                    finish(index, result)
+                elif last:
+                    result.value = value
+                    finish(index, result)
+                else:
+                    await queues[position + 1].put((index, result, value))
+
+        async def run_stage(position: int):
+            await asyncio.gather(*(work(position) for _ in range(self._workers[position])))
+            if position + 1 < len(self.stages):
+                for _ in range(self._workers[position + 1]):
+                    await queues[position + 1].put(_DONE)
+
+        tasks = [asyncio.ensure_future(feed())]
+        tasks += [asyncio.ensure_future(run_stage(position)) for position in range(len(self.stages))]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        return results
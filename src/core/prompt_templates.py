@@ -0,0 +1,124 @@
+import inspect
+import re
+import string
+import threading
+from typing import Dict, Any, Optional, List, Tuple
+from src.core.token_counter import count_tokens
+
+_formatter = string.Formatter()
+
+def normalize_template(text: str) -> str:
+    """Quita la sangría común, los espacios finales y las líneas en blanco repetidas"""
+    text = inspect.cleandoc(text)
+    text = '\n'.join(line.rstrip() for line in text.splitlines())
+    return re.sub(r'\n{3,}', '\n\n', text)
+
+class PromptTemplate:
+    """Template de prompt compilado una sola vez
+
+    El texto se normaliza al registrarlo y se descompone en tramos literales y
+    campos, así que renderizar es una concatenación sin volver a parsear. La
+    parte estática (instrucciones) debe ir antes que los campos: así todas las
+    peticiones de un mismo paso comparten un prefijo largo que los proveedores
+    pueden reutilizar de su caché de prompts.
+    """
+
+    def __init__(self, name: str, text: str):
+        self.name = name
+        self.text = normalize_template(text)
+        self._parts: List[Tuple[str, Optional[str], str, Optional[str]]] = []
+        fields = []
+        for literal, field, spec, conversion in _formatter.parse(self.text):
+            if field is not None and (field == '' or field.isdigit()):
+                raise ValueError(f"El template {name} solo admite campos con nombre")
+            self._parts.append((literal, field, spec or '', conversion))
+            if field is not None and field not in fields:
+                fields.append(field)
+        self.fields = tuple(fields)
+        self.static_text = ''.join(literal for literal, _, _, _ in self._parts)
+        self.static_prefix = self._parts[0][0] if self._parts else ''
+        self.renders = 0
+
+    def render(self, **kwargs) -> str:
+        """Sustituye los campos; lanza KeyError si falta alguno"""
+        chunks = []
+        for literal, field, spec, conversion in self._parts:
+            chunks.append(literal)
+            if field is None:
+                continue
+            value = _formatter.get_field(field, (), kwargs)[0]
+            value = _formatter.convert_field(value, conversion)
+            chunks.append(format(value, spec))
+        self.renders += 1
+        return ''.join(chunks)
+
+    def static_tokens(self, model: Optional[str] = None) -> int:
+        """Tokens de las instrucciones fijas del template"""
+        return count_tokens(self.static_text, model)
+
+    def prefix_tokens(self, model: Optional[str] = None) -> int:
+        """Tokens del prefijo común a todas las peticiones (hasta el primer campo)"""
+        return count_tokens(self.static_prefix, model)
+
+class PromptRegistry:
+    """Registro de templates del proceso
+
+    Los templates con nombre se declaran junto al workflow que los usa; los
+    anónimos (``compile``) se cachean por su texto para que los agentes no los
+    vuelvan a procesar en cada llamada.
+    """
+
+    def __init__(self):
+        self._templates: Dict[str, PromptTemplate] = {}
+        self._compiled: Dict[str, PromptTemplate] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, text: str) -> PromptTemplate:
+        """Compila y registra un template (volver a registrarlo lo sustituye)"""
+        template = PromptTemplate(name, text)
+        with self._lock:
+            self._templates[name] = template
+        return template
+
+    def get(self, name: str) -> PromptTemplate:
+        with self._lock:
+            template = self._templates.get(name)
+        if template is None:
+            raise KeyError(f"Template de prompt desconocido: {name}")
+        return template
+
+    def compile(self, text: str) -> PromptTemplate:
+        """Template compilado para un texto literal (cacheado por contenido)"""
+        with self._lock:
+            template = self._compiled.get(text)
+        if template is None:
+            template = PromptTemplate(f"inline:{len(self._compiled)}", text)
+            with self._lock:
+                template = self._compiled.setdefault(text, template)
+        return template
+
+    def render(self, template_name: str, /, **kwargs) -> str:
+        return self.get(template_name).render(**kwargs)
+
+    def get_stats(self, model: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """Costo en tokens de la parte estática de cada template con nombre"""
+        with self._lock:
+            templates = list(self._templates.values())
+        stats = {}
+        for template in templates:
+            static_tokens = template.static_tokens(model)
+            prefix_tokens = template.prefix_tokens(model)
+            stats[template.name] = {
+                'fields': list(template.fields),
+                'static_tokens': static_tokens,
+                'prefix_tokens': prefix_tokens,
+                'prefix_ratio': prefix_tokens / static_tokens if static_tokens else 0.0,
+                'renders': template.renders
+            }
+        return stats
+
+_registry = PromptRegistry()
+
+def get_prompt_registry() -> PromptRegistry:
+    """Registro de templates compartido por todo el proceso"""
+    return _registry
@@ -0,0 +1,152 @@
+from collections import deque
+from typing import Dict, Any, Optional, List
+
+class P2Quantile:
+    """Estimador de cuantiles en streaming (algoritmo P² de Jain y Chlamtac)
+
+    Mantiene cinco marcadores y actualiza la estimación en O(1) por muestra sin
+    guardar el historial.
+    """
+
+    def __init__(self, quantile: float):
+        self.quantile = quantile
+        self.count = 0
+        self._initial: List[float] = []
+        self._heights: List[float] = []
+        self._positions: List[int] = []
+        self._desired: List[float] = []
+        self._increments: List[float] = []
+
+    def add(self, value: float):
+        self.count += 1
+        if len(self._heights) < 5:
+            self._initial.append(value)
+            if len(self._initial) == 5:
+                p = self.quantile
+                self._heights = sorted(self._initial)
+                self._positions = [0, 1, 2, 3, 4]
+                self._desired = [0, 2 * p, 4 * p, 2 + 2 * p, 4]
+                self._increments = [0, p / 2, p, (1 + p) / 2, 1]
+            return
+
+        q, n = self._heights, self._positions
+        if value < q[0]:
+            q[0] = value
+            k = 0
+        elif value >= q[4]:
+            q[4] = value
+            k = 3
+        else:
+            k = next(i for i in range(1, 5) if value < q[i]) - 1
+
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self._desired[i] += self._increments[i]
+
+        for i in range(1, 4):
+            d = self._desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                step = 1 if d > 0 else -1
+                height = self._parabolic(i, step)
+                if not q[i - 1] < height < q[i + 1]:
+                    height = q[i] + step * (q[i + step] - q[i]) / (n[i + step] - n[i])
+                q[i] = height
+                n[i] += step
+
+    def _parabolic(self, i: int, step: int) -> float:
+        q, n = self._heights, self._positions
+        return q[i] + step / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + step) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - step) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    def value(self) -> Optional[float]:
+        if self._heights:
+            return self._heights[2]
+        if not self._initial:
+            return None
+        ordered = sorted(self._initial)
+        return ordered[int(round(self.quantile * (len(ordered) - 1)))]
+
+class WindowedQuantile:
+    """Cuantil P² que se reinicia cada ``window`` muestras para reflejar el comportamiento reciente"""
+
+    def __init__(self, quantile: float, window: int = 500):
+        self.quantile = quantile
+        self.window = window
+        self._current = P2Quantile(quantile)
+        self._previous: Optional[P2Quantile] = None
+
+    def add(self, value: float):
+        if self._current.count >= self.window:
+            self._previous = self._current
+            self._current = P2Quantile(self.quantile)
+        self._current.add(value)
+
+    def value(self) -> Optional[float]:
+        # Mientras la ventana nueva tiene pocas muestras se usa la anterior
+        if self._previous is not None and self._current.count < self.window // 4:
+            return self._previous.value()
+        return self._current.value()
+
+class RollingStats:
+    """Estadísticas incrementales de latencia, éxito y costo (actualización y lectura en O(1))"""
+
+    def __init__(self, window: int = 200, alpha: float = 0.2):
+        self.window = window
+        self.alpha = alpha
+        self.count = 0
+        self.ewma_latency: Optional[float] = None
+        self.p50 = WindowedQuantile(0.5, window=window * 2)
+        self.p95 = WindowedQuantile(0.95, window=window * 2)
+        self._outcomes: deque = deque(maxlen=window)
+        self._successes = 0
+        self._ewma_cost: Optional[float] = None
+        self._ewma_tokens: Optional[float] = None
+
+    def _ewma(self, current: Optional[float], value: float) -> float:
+        if current is None:
+            return value
+        return self.alpha * value + (1 - self.alpha) * current
+
+    def record(self, latency: float, success: bool = True, tokens: int = 0, cost: float = 0.0):
+        """Registra una petición"""
+        self.count += 1
+
+        if len(self._outcomes) == self._outcomes.maxlen:
+            self._successes -= self._outcomes[0]
+        self._outcomes.append(1 if success else 0)
+        self._successes += 1 if success else 0
+
+        # Las peticiones fallidas no aportan a latencia ni a costo por token
+        if success:
+            self.ewma_latency = self._ewma(self.ewma_latency, latency)
+            self.p50.add(latency)
+            self.p95.add(latency)
+            if tokens > 0:
+                self._ewma_cost = self._ewma(self._ewma_cost, cost)
+                self._ewma_tokens = self._ewma(self._ewma_tokens, tokens)
+
+    @property
+    def success_rate(self) -> Optional[float]:
+        if not self._outcomes:
+            return None
+        return self._successes / len(self._outcomes)
+
+    @property
+    def cost_per_1k_tokens(self) -> Optional[float]:
+        if not self._ewma_tokens:
+            return None
+        return self._ewma_cost / self._ewma_tokens * 1000
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Obtiene las estadísticas actuales"""
+        return {
+            'requests_count': self.count,
+            'ewma_latency': self.ewma_latency,
+            'p50_latency': self.p50.value(),
+            'p95_latency': self.p95.value(),
+            'success_rate': self.success_rate,
+            'cost_per_1k_tokens': self.cost_per_1k_tokens
+        }
@@ -0,0 +1,93 @@
+import asyncio
+import concurrent.futures
+import threading
+from typing import Dict, Any, Callable, Awaitable, Optional
+
+class _Flight:
+    """Ejecución compartida de una clave en curso"""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.future: concurrent.futures.Future = concurrent.futures.Future()
+        self.task: Optional[asyncio.Task] = None
+        self.waiters = 0
+
+class RequestCoalescer:
+    """Agrupa llamadas idénticas concurrentes en una única ejecución (single-flight)
+
+    La primera llamada con una clave ejecuta la corrutina; las siguientes esperan
+    el mismo resultado, incluso desde otros event loops (sesiones de Streamlit en
+    hilos distintos). Los errores se propagan a todos los que esperan. Cancelar a
+    un solo solicitante no afecta a los demás; la ejecución compartida solo se
+    cancela cuando ya no queda nadie esperando.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[str, _Flight] = {}
+        self._lock = threading.Lock()
+        self.stats = {
+            'executions': 0,
+            'coalesced': 0
+        }
+
+    async def run(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """Ejecuta ``factory`` o se une a la ejecución en curso con la misma clave"""
+        while True:
+            flight = self._join(key, factory)
+            waiter = asyncio.wrap_future(flight.future)
+            try:
+                return await asyncio.shield(waiter)
+            except asyncio.CancelledError:
+                if not waiter.cancelled():
+                    # Cancelación propia: la ejecución compartida continúa
+                    raise
+                # La ejecución compartida se canceló (p. ej. se cerró el loop que
+                # la lanzó) sin que este solicitante lo pidiera: reintentar
+            finally:
+                self._leave(flight)
+
+    def _join(self, key: str, factory: Callable[[], Awaitable[Any]]) -> _Flight:
+        with self._lock:
+            flight = self._inflight.get(key)
+            if flight is None:
+                flight = _Flight(asyncio.get_running_loop())
+                flight.task = flight.loop.create_task(factory())
+                flight.task.add_done_callback(lambda task: self._complete(key, flight, task))
+                self._inflight[key] = flight
+                self.stats['executions'] += 1
+            else:
+                self.stats['coalesced'] += 1
+            flight.waiters += 1
+            return flight
+
+    def _leave(self, flight: _Flight):
+        with self._lock:
+            flight.waiters -= 1
+            abandoned = flight.waiters == 0 and not flight.future.done()
+        if abandoned and not flight.loop.is_closed():
+            flight.loop.call_soon_threadsafe(flight.task.cancel)
+
+    def _complete(self, key: str, flight: _Flight, task: asyncio.Task):
+        with self._lock:
+            if self._inflight.get(key) is flight:
+                del self._inflight[key]
+
+        if flight.future.done():
+            return
+        if task.cancelled():
+            flight.future.cancel()
+        elif task.exception() is not None:
+            flight.future.set_exception(task.exception())
+        else:
+            flight.future.set_result(task.result())
+
+    def in_flight(self) -> int:
+        """Número de claves ejecutándose actualmente"""
+        with self._lock:
+            return len(self._inflight)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            'in_flight': self.in_flight()
+        }
@@ -0,0 +1,208 @@
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple
+from src.core.logging_system import logger
+
+def normalize_prompt(prompt: str) -> str:
+    """Normaliza saltos de línea y espacios finales de un prompt"""
+    lines = prompt.replace('\r\n', '\n').replace('\r', '\n').split('\n')
+    return '\n'.join(line.rstrip() for line in lines).strip()
+
+def make_cache_key(prompt: str, model: Optional[str] = None, params: Optional[Dict[str, Any]] = None) -> str:
+    """Genera la clave de contenido a partir del prompt, modelo y parámetros de muestreo"""
+    payload = json.dumps(
+        {
+            'prompt': normalize_prompt(prompt),
+            'model': model,
+            'params': params or {}
+        },
+        sort_keys=True,
+        default=str,
+        ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+class MemoryLRUCache:
+    """Nivel en memoria con política LRU y TTL"""
+
+    def __init__(self, max_entries: int = 1000, ttl: Optional[float] = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        created_at, value = entry
+        if self.ttl is not None and time.time() - created_at > self.ttl:
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, created_at: Optional[float] = None):
+        self._entries[key] = (created_at or time.time(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+class DiskCache:
+    """Nivel persistente en disco (un archivo JSON por entrada)"""
+
+    def __init__(self, directory: str, max_bytes: int = 100 * 1024 * 1024, ttl: Optional[float] = None):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.evictions = 0
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._size = sum(p.stat().st_size for p in self.directory.glob('*/*.json'))
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Tuple[float, Any]]:
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+        if self.ttl is not None and time.time() - entry['created_at'] > self.ttl:
+            self._remove(path)
+            return None
+
+        # Actualizar mtime para que la evicción sea LRU
+        os.utime(path)
+        return entry['created_at'], entry['value']
+
+    def set(self, key: str, value: Any, created_at: Optional[float] = None):
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        previous_size = path.stat().st_size if path.exists() else 0
+
+        tmp_path = path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'created_at': created_at or time.time(), 'value': value}, f, default=str, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+        self._size += path.stat().st_size - previous_size
+        if self._size > self.max_bytes:
+            self._evict()
+
+    def _remove(self, path: Path):
+        try:
+            size = path.stat().st_size
+            path.unlink()
+            self._size -= size
+        except FileNotFoundError:
+            pass
+
+    def _evict(self):
+        """Elimina las entradas menos usadas hasta quedar al 90% del límite"""
+        files = sorted(self.directory.glob('*/*.json'), key=lambda p: p.stat().st_mtime)
+        target = self.max_bytes * 0.9
+        for path in files:
+            if self._size <= target:
+                break
+            self._remove(path)
+            self.evictions += 1
+
+    def clear(self):
+        for path in self.directory.glob('*/*.json'):
+            self._remove(path)
+
+class ResponseCache:
+    """Caché de respuestas de dos niveles (memoria LRU + disco bajo data/cache)"""
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None, namespace: str = 'responses'):
+        config = config or {}
+        self.enabled = config.get('enabled', True)
+        ttl = config.get('ttl_seconds', 24 * 3600)
+
+        self.memory = MemoryLRUCache(
+            max_entries=config.get('memory_max_entries', 1000),
+            ttl=ttl
+        )
+        self.disk: Optional[DiskCache] = None
+        if self.enabled and config.get('disk_enabled', True):
+            self.disk = DiskCache(
+                directory=os.path.join(config.get('directory', 'data/cache'), namespace),
+                max_bytes=int(config.get('disk_max_mb', 100) * 1024 * 1024),
+                ttl=ttl
+            )
+
+        self.stats = {
+            'memory_hits': 0,
+            'disk_hits': 0,
+            'misses': 0,
+            'sets': 0
+        }
+
+    def get(self, key: str) -> Optional[Any]:
+        """Busca una respuesta en memoria y luego en disco"""
+        if not self.enabled:
+            return None
+
+        value = self.memory.get(key)
+        if value is not None:
+            self.stats['memory_hits'] += 1
+            return value
+
+        if self.disk is not None:
+            entry = self.disk.get(key)
+            if entry is not None:
+                created_at, value = entry
+                # Promover al nivel en memoria conservando la antigüedad original
+                self.memory.set(key, value, created_at=created_at)
+                self.stats['disk_hits'] += 1
+                return value
+
+        self.stats['misses'] += 1
+        return None
+
+    def set(self, key: str, value: Any):
+        """Guarda una respuesta en ambos niveles"""
+        if not self.enabled:
+            return
+
+        self.memory.set(key, value)
+        if self.disk is not None:
+            try:
+                self.disk.set(key, value)
+            except (OSError, TypeError) as e:
+                logger.warning(f"No se pudo persistir la entrada de caché {key[:8]}: {str(e)}")
+        self.stats['sets'] += 1
+
+    def clear(self):
+        """Vacía ambos niveles"""
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Obtiene contadores de aciertos y fallos"""
+        hits = self.stats['memory_hits'] + self.stats['disk_hits']
+        lookups = hits + self.stats['misses']
+        return {
+            **self.stats,
+            'hit_rate': hits / lookups if lookups else 0.0,
+            'memory_entries': len(self.memory),
+            'memory_evictions': self.memory.evictions,
+            'disk_evictions': self.disk.evictions if self.disk else 0
+        }
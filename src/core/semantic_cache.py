@@ -0,0 +1,140 @@
+import time
+from typing import Dict, Any, Optional, List, Tuple
+import numpy as np
+
+class SemanticCache:
+    """Caché semántica sobre una matriz NumPy de embeddings normalizados
+
+    Cada entrada guarda el embedding del prompt, un ``scope`` (modelo y
+    parámetros que deben coincidir) y la respuesta. La búsqueda calcula la
+    similitud coseno contra todas las entradas con un único producto matricial;
+    los scopes se guardan como identificadores enteros en un array paralelo a
+    la matriz para filtrarlos también de forma vectorizada.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        config = config or {}
+        self.enabled = config.get('enabled', False)
+        self.threshold = config.get('threshold', 0.95)
+        self.max_entries = config.get('max_entries', 5000)
+        self.ttl = config.get('ttl_seconds', 24 * 3600)
+
+        self._matrix: Optional[np.ndarray] = None
+        self._scopes = np.zeros(0, dtype=np.int32)
+        self._scope_ids: Dict[Optional[str], int] = {}
+        self._values: List[Any] = []
+        self._created_at = np.zeros(0, dtype=np.float64)
+        self._next_slot = 0
+
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'sets': 0
+        }
+
+    @property
+    def size(self) -> int:
+        return len(self._values)
+
+    def _normalize(self, vectors: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    def _ensure_capacity(self, dim: int):
+        if self._matrix is None:
+            capacity = min(self.max_entries, 64)
+            self._matrix = np.zeros((capacity, dim), dtype=np.float32)
+            self._created_at = np.zeros(capacity, dtype=np.float64)
+            self._scopes = np.zeros(capacity, dtype=np.int32)
+        elif self._matrix.shape[1] != dim:
+            raise ValueError(
+                f"Dimensión de embedding {dim} distinta a la del índice ({self._matrix.shape[1]})"
+            )
+        elif self.size == self._matrix.shape[0] and self.size < self.max_entries:
+            capacity = min(self.max_entries, self._matrix.shape[0] * 2)
+            matrix = np.zeros((capacity, dim), dtype=np.float32)
+            matrix[:self.size] = self._matrix[:self.size]
+            created_at = np.zeros(capacity, dtype=np.float64)
+            created_at[:self.size] = self._created_at[:self.size]
+            scopes = np.zeros(capacity, dtype=np.int32)
+            scopes[:self.size] = self._scopes[:self.size]
+            self._matrix, self._created_at, self._scopes = matrix, created_at, scopes
+
+    def lookup_many(
+        self,
+        embeddings: List[List[float]],
+        scope: Optional[str] = None
+    ) -> List[Optional[Tuple[Any, float]]]:
+        """Busca en lote las respuestas más similares a varios embeddings"""
+        if not self.enabled or self.size == 0:
+            self.stats['misses'] += len(embeddings)
+            return [None] * len(embeddings)
+
+        queries = self._normalize(np.asarray(embeddings, dtype=np.float32))
+        similarities = queries @ self._matrix[:self.size].T
+
+        # Descartar entradas expiradas o de otro scope
+        invalid = time.time() - self._created_at[:self.size] > self.ttl
+        if scope is not None:
+            scope_id = self._scope_ids.get(scope)
+            if scope_id is None:
+                # Ninguna entrada tiene ese scope
+                invalid[:] = True
+            else:
+                invalid |= self._scopes[:self.size] != scope_id
+        similarities[:, invalid] = -1.0
+
+        best = similarities.argmax(axis=1)
+        results: List[Optional[Tuple[Any, float]]] = []
+        for row, index in enumerate(best):
+            score = float(similarities[row, index])
+            if score >= self.threshold:
+                self.stats['hits'] += 1
+                results.append((self._values[index], score))
+            else:
+                self.stats['misses'] += 1
+                results.append(None)
+        return results
+
+    def lookup(self, embedding: List[float], scope: Optional[str] = None) -> Optional[Tuple[Any, float]]:
+        """Busca la respuesta más similar a un embedding"""
+        return self.lookup_many([embedding], scope)[0]
+
+    def add(self, embedding: List[float], value: Any, scope: Optional[str] = None):
+        """Añade una respuesta al índice (reemplaza la más antigua si está lleno)"""
+        if not self.enabled:
+            return
+
+        vector = self._normalize(np.asarray(embedding, dtype=np.float32))
+        self._ensure_capacity(vector.shape[-1])
+
+        if self.size < self.max_entries:
+            slot = self.size
+            self._values.append(value)
+        else:
+            slot = self._next_slot
+            self._next_slot = (self._next_slot + 1) % self.max_entries
+            self._values[slot] = value
+
+        self._matrix[slot] = vector
+        self._scopes[slot] = self._scope_ids.setdefault(scope, len(self._scope_ids))
+        self._created_at[slot] = time.time()
+        self.stats['sets'] += 1
+
+    def clear(self):
+        self._matrix = None
+        self._scopes = np.zeros(0, dtype=np.int32)
+        self._scope_ids = {}
+        self._values = []
+        self._created_at = np.zeros(0, dtype=np.float64)
+        self._next_slot = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Obtiene contadores de aciertos y fallos"""
+        lookups = self.stats['hits'] + self.stats['misses']
+        return {
+            **self.stats,
+            'entries': self.size,
+            'hit_rate': self.stats['hits'] / lookups if lookups else 0.0
+        }
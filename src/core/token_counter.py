@@ -0,0 +1,210 @@
+import asyncio
+import fnmatch
+import math
+import re
+import threading
+from typing import Dict, Any, Optional, List, Tuple
+from src.core.logging_system import logger
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+try:
+    from tokenizers import Tokenizer
+except ImportError:
+    Tokenizer = None
+
+# Patrón de modelo -> tokenizador ("tiktoken:<encoding>" o "hf:<repositorio>")
+DEFAULT_TOKENIZERS: List[Tuple[str, str]] = [
+    ('gpt-4o*', 'tiktoken:o200k_base'),
+    ('gpt-4*', 'tiktoken:cl100k_base'),
+    ('gpt-3.5*', 'tiktoken:cl100k_base'),
+    ('text-embedding-*', 'tiktoken:cl100k_base'),
+    ('text-davinci*', 'tiktoken:p50k_base')
+]
+
+# Palabras, números y signos sueltos: aproxima mejor que split() en código y JSON
+_PIECES = re.compile(r"\w+|[^\w\s]", re.UNICODE)
+
+class ContextWindowExceededError(ValueError):
+    """El prompt no cabe en la ventana de contexto del modelo"""
+
+class TokenCounter:
+    """Servicio de conteo de tokens con tokenizadores por modelo
+
+    Los tokenizadores se cargan la primera vez que se piden y quedan en caché;
+    si el modelo no tiene uno configurado o no se puede cargar (dependencia
+    ausente, sin red) se usa una aproximación rápida por caracteres y piezas.
+    Cargar puede descargar archivos, así que dentro de un event loop la carga
+    se hace en un hilo y mientras tanto se aproxima; ``preload`` los carga
+    todos al arrancar. Los fallos también quedan en caché.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        config = config or {}
+        self.chars_per_token = config.get('chars_per_token', 4.0)
+        self.tokenizers = list(config.get('tokenizers', {}).items()) + DEFAULT_TOKENIZERS
+        self.context_windows: Dict[str, int] = config.get('context_windows', {})
+        self._loaded: Dict[str, Any] = {}
+        self._loading: set = set()
+        self._lock = threading.Lock()
+        self.stats = {
+            'exact': 0,
+            'approximate': 0
+        }
+
+    def _spec_for(self, model: Optional[str]) -> Optional[str]:
+        if not model:
+            return None
+        name = model.lower()
+        for pattern, spec in self.tokenizers:
+            if fnmatch.fnmatch(name, pattern.lower()):
+                return spec
+        return None
+
+    def _load(self, spec: str) -> Any:
+        kind, _, name = spec.partition(':')
+        if kind == 'tiktoken' and tiktoken is not None:
+            return tiktoken.get_encoding(name)
+        if kind == 'hf' and Tokenizer is not None:
+            return Tokenizer.from_pretrained(name)
+        return None
+
+    def get_tokenizer(self, model: Optional[str]) -> Any:
+        """Tokenizador del modelo (None si se debe usar la aproximación)"""
+        spec = self._spec_for(model)
+        if spec is None:
+            return None
+
+        with self._lock:
+            if spec in self._loaded:
+                return self._loaded[spec]
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return self._load_spec(spec)
+
+        # No bloquear el event loop con una descarga: se carga en un hilo y
+        # hasta entonces se aproxima
+        with self._lock:
+            if spec in self._loading:
+                return None
+            self._loading.add(spec)
+        loop.run_in_executor(None, self._load_spec, spec)
+        return None
+
+    def _load_spec(self, spec: str) -> Any:
+        with self._lock:
+            if spec in self._loaded:
+                return self._loaded[spec]
+        try:
+            tokenizer = self._load(spec)
+        except Exception as e:
+            logger.warning(f"No se pudo cargar el tokenizador {spec}, se usará una aproximación: {str(e)}")
+            tokenizer = None
+
+        with self._lock:
+            self._loading.discard(spec)
+            # Los fallos también se cachean para no reintentar la carga en cada llamada
+            return self._loaded.setdefault(spec, tokenizer)
+
+    def preload(self):
+        """Carga todos los tokenizadores configurados (bloqueante: usar al arrancar)"""
+        for spec in dict.fromkeys(spec for _, spec in self.tokenizers):
+            self._load_spec(spec)
+
+    async def apreload(self):
+        """``preload`` en un hilo, sin bloquear el event loop"""
+        await asyncio.to_thread(self.preload)
+
+    def preload_in_background(self) -> threading.Thread:
+        """Lanza ``preload`` en un hilo de fondo (p. ej. al inicializar la aplicación)"""
+        thread = threading.Thread(target=self.preload, name='tokenizer-preload', daemon=True)
+        thread.start()
+        return thread
+
+    def approximate(self, text: str) -> int:
+        """Aproximación rápida sin tokenizador"""
+        if not text:
+            return 0
+        by_chars = len(text) / self.chars_per_token
+        by_pieces = len(_PIECES.findall(text))
+        return int(math.ceil(max(by_chars, by_pieces * 0.75)))
+
+    def count(self, text: str, model: Optional[str] = None) -> int:
+        """Número de tokens de ``text`` para ``model``"""
+        if not text:
+            return 0
+
+        tokenizer = self.get_tokenizer(model)
+        if tokenizer is None:
+            self.stats['approximate'] += 1
+            return self.approximate(text)
+
+        self.stats['exact'] += 1
+        encoded = tokenizer.encode(text)
+        # tiktoken devuelve una lista; tokenizers, un objeto Encoding
+        return len(getattr(encoded, 'ids', encoded))
+
+    def count_usage(self, prompt: str, completion: str = '', model: Optional[str] = None) -> Dict[str, int]:
+        """Uso en el formato de los proveedores a partir del prompt y la respuesta"""
+        prompt_tokens = self.count(prompt, model)
+        completion_tokens = self.count(completion, model)
+        return {
+            'prompt_tokens': prompt_tokens,
+            'completion_tokens': completion_tokens,
+            'total_tokens': prompt_tokens + completion_tokens
+        }
+
+    def context_window(self, model: Optional[str]) -> Optional[int]:
+        """Ventana de contexto configurada para el modelo, si se conoce"""
+        if not model:
+            return None
+        name = model.lower()
+        for pattern, size in self.context_windows.items():
+            if fnmatch.fnmatch(name, pattern.lower()):
+                return size
+        return None
+
+    def fit_max_tokens(self, prompt: str, model: Optional[str], max_tokens: int) -> int:
+        """Ajusta ``max_tokens`` a lo que cabe en la ventana de contexto
+
+        Lanza ContextWindowExceededError si el prompt por sí solo no cabe, para
+        no gastar una llamada que el proveedor rechazaría.
+        """
+        window = self.context_window(model)
+        if window is None:
+            return max_tokens
+
+        prompt_tokens = self.count(prompt, model)
+        available = window - prompt_tokens
+        if available <= 0:
+            raise ContextWindowExceededError(
+                f"El prompt ({prompt_tokens} tokens) excede la ventana de {model} ({window} tokens)"
+            )
+        return min(max_tokens, available)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            'loaded_tokenizers': [spec for spec, tokenizer in self._loaded.items() if tokenizer is not None]
+        }
+
+_counter = TokenCounter()
+
+def get_token_counter() -> TokenCounter:
+    """Servicio de conteo compartido por todo el proceso"""
+    return _counter
+
+def configure_token_counter(config: Dict[str, Any]) -> TokenCounter:
+    """Reconfigura el servicio de conteo compartido"""
+    global _counter
+    _counter = TokenCounter(config)
+    return _counter
+
+def count_tokens(text: str, model: Optional[str] = None) -> int:
+    """Atajo para contar tokens con el servicio compartido"""
+    return _counter.count(text, model)
@@ -0,0 +1,175 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, List, Callable, Awaitable, Tuple
+from src.core.metrics_registry import get_metrics_registry
+
+_registry = get_metrics_registry()
+STEP_LATENCY = _registry.histogram(
+    'workflow_step_latency_seconds', 'Duración de cada paso del grafo de un workflow', ('workflow', 'step')
+)
+STEP_RUNS = _registry.counter(
+    'workflow_step_runs', 'Pasos del grafo ejecutados por resultado', ('workflow', 'step', 'status')
+)
+
+class StepTimeoutError(asyncio.TimeoutError):
+    """Un paso superó su tiempo máximo"""
+
+@dataclass
+class WorkflowStep:
+    """Paso de un workflow: ``func`` recibe los resultados de ``inputs`` en ese orden"""
+    name: str
+    func: Callable[..., Awaitable[Any]]
+    inputs: Tuple[str, ...] = ()
+    timeout: Optional[float] = None
+
+class WorkflowEngine:
+    """Ejecuta los pasos de un workflow como un grafo de dependencias
+
+    Cada paso arranca en cuanto terminan los pasos de los que depende, así que
+    los independientes se ejecutan a la vez en el mismo event loop. Si un paso
+    falla o agota su tiempo, se cancelan los que siguen en curso y se propaga
+    el error. Los tiempos por paso (``timeouts`` en la configuración tienen
+    prioridad sobre los del paso, ``default_timeout`` para el resto) y la
+    duración de cada uno quedan en ``step_metrics``.
+    """
+
+    def __init__(self, name: str, steps: List[WorkflowStep], config: Optional[Dict[str, Any]] = None):
+        config = config or {}
+        self.name = name
+        self.steps: Dict[str, WorkflowStep] = {}
+        for step in steps:
+            if step.name in self.steps:
+                raise ValueError(f"Paso duplicado en {name}: {step.name}")
+            self.steps[step.name] = step
+        self.timeouts: Dict[str, float] = config.get('timeouts', {})
+        self.default_timeout: Optional[float] = config.get('default_timeout')
+        self.step_metrics: Dict[str, Dict[str, Any]] = {}
+        self.order = self._topological_order()
+
+    def _topological_order(self) -> List[str]:
+        """Orden válido de ejecución; valida entradas desconocidas y ciclos"""
+        for step in self.steps.values():
+            for dependency in step.inputs:
+                if dependency not in self.steps:
+                    raise ValueError(f"El paso {step.name} depende de un paso desconocido: {dependency}")
+
+        order: List[str] = []
+        state: Dict[str, int] = {}
+
+        def visit(name: str, path: Tuple[str, ...]):
+            if state.get(name) == 2:
+                return
+            if state.get(name) == 1:
+                raise ValueError(f"Ciclo de dependencias en {self.name}: {' -> '.join(path + (name,))}")
+            state[name] = 1
+            for dependency in self.steps[name].inputs:
+                visit(dependency, path + (name,))
+            state[name] = 2
+            order.append(name)
+
+        for name in self.steps:
+            visit(name, ())
+        return order
+
+    def timeout_for(self, step: WorkflowStep) -> Optional[float]:
+        return self.timeouts.get(step.name, step.timeout if step.timeout is not None else self.default_timeout)
+
+    async def _run_step(self, step: WorkflowStep, results: Dict[str, Any], started: float) -> Any:
+        metrics = self.step_metrics[step.name] = {
+            'status': 'running',
+            'started_at': time.monotonic() - started,
+            'latency': None
+        }
+        labels = {'workflow': self.name, 'step': step.name}
+        step_start = time.monotonic()
+        timeout = self.timeout_for(step)
+        try:
+            call = step.func(*(results[dependency] for dependency in step.inputs))
+            if timeout is not None:
+                try:
+                    return await asyncio.wait_for(call, timeout)
+                except asyncio.TimeoutError:
+                    metrics['status'] = 'timeout'
+                    raise StepTimeoutError(f"El paso {step.name} de {self.name} superó {timeout}s")
+            return await call
+        except asyncio.CancelledError:
+            metrics['status'] = 'cancelled'
+            raise
+        except Exception:
+            if metrics['status'] == 'running':
+                metrics['status'] = 'error'
+            raise
+        finally:
+            metrics['latency'] = time.monotonic() - step_start
+            if metrics['status'] == 'running':
+                metrics['status'] = 'success'
+            STEP_LATENCY.observe(metrics['latency'], **labels)
+            STEP_RUNS.inc(status=metrics['status'], **labels)
+
+    async def run(
+        self,
+        results: Optional[Dict[str, Any]] = None,
+        on_step_complete: Optional[Callable[[str, Any], None]] = None
+    ) -> Dict[str, Any]:
+        """Ejecuta el grafo y devuelve el resultado de cada paso por nombre
+
+        ``results`` permite aportar salidas ya conocidas (p. ej. restauradas de
+        un checkpoint); esos pasos no se vuelven a ejecutar. ``on_step_complete``
+        recibe el nombre y la salida de cada paso en cuanto termina bien; en
+        ese caso, si un paso falla, los que ya estaban en curso terminan (y se
+        notifican) antes de propagar el error para no perder lo ya pagado.
+        """
+        results = {name: value for name, value in (results or {}).items() if name in self.steps}
+        for name in results:
+            self.step_metrics[name] = {'status': 'restored', 'started_at': 0.0, 'latency': 0.0}
+        pending = [name for name in self.order if name not in results]
+        running: Dict[asyncio.Task, str] = {}
+        started = time.monotonic()
+
+        try:
+            while pending or running:
+                for name in list(pending):
+                    if all(dependency in results for dependency in self.steps[name].inputs):
+                        pending.remove(name)
+                        task = asyncio.ensure_future(self._run_step(self.steps[name], results, started))
+                        running[task] = name
+
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                failed: List[Tuple[str, asyncio.Task]] = []
+                # Los que terminaron bien junto al que falló también se guardan
+                for task in done:
+                    name = running.pop(task)
+                    if task.exception() is not None:
+                        failed.append((name, task))
+                        continue
+                    results[name] = task.result()
+                    if on_step_complete is not None:
+                        on_step_complete(name, results[name])
+                if failed:
+                    if on_step_complete is not None:
+                        await self._drain(running, results, on_step_complete)
+                    # Propaga el primer error (en orden del grafo); el resto se cancela en el finally
+                    min(failed, key=lambda item: self.order.index(item[0]))[1].result()
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
+        return results
+
+    async def _drain(
+        self,
+        running: Dict[asyncio.Task, str],
+        results: Dict[str, Any],
+        on_step_complete: Callable[[str, Any], None]
+    ):
+        """Espera a los pasos en curso y notifica los que terminan bien"""
+        if running:
+            await asyncio.wait(running)
+        for task, name in list(running.items()):
+            del running[task]
+            if not task.cancelled() and task.exception() is None:
+                results[name] = task.result()
+                on_step_complete(name, results[name])
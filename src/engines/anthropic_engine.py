@@ -1,15 +1,23 @@
 import anthropic
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, AsyncIterator
 from datetime import datetime
 import time
-from src.core.base_components import BaseComponent, TaskMetrics
+from src.core.base_components import TaskMetrics
+from src.engines.base_engine import BaseAIEngine
+from src.engines.http_transport import get_http_transport
+from src.engines.streaming import StreamTracker
 
-class AnthropicEngine(BaseComponent):
+class AnthropicEngine(BaseAIEngine):
     """Motor de IA basado en Anthropic Claude"""
     
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
-        self.client = anthropic.Client(api_key=config['api_key'])
+        self.base_url = config.get('base_url', "https://api.anthropic.com")
+        self.client = anthropic.AsyncAnthropic(
+            api_key=config['api_key'],
+            base_url=self.base_url,
+            http_client=get_http_transport().get_client(self.base_url)
+        )
         self.model = config.get('model', 'claude-2')
         self.default_params = {
             'temperature': config.get('temperature', 0.7),
@@ -17,7 +25,7 @@ class AnthropicEngine(BaseComponent):
             'top_p': config.get('top_p', 1.0)
         }
     
-    async def generate_text(
+    async def _generate_text(
         self,
         prompt: str,
         system_prompt: Optional[str] = None,
@@ -27,18 +35,12 @@ class AnthropicEngine(BaseComponent):
         start_time = time.time()
         
         try:
-            # Preparar el mensaje
-            if system_prompt:
-                full_prompt = f"{system_prompt}\n\nHuman: {prompt}\n\nAssistant:"
-            else:
-                full_prompt = f"Human: {prompt}\n\nAssistant:"
-            
             # Combinar parámetros
             params = {**self.default_params, **kwargs}
             
             response = await self.client.completions.create(
                 model=self.model,
-                prompt=full_prompt,
+                prompt=self._build_prompt(prompt, system_prompt),
                 **params
             )
             
@@ -82,6 +84,58 @@ class AnthropicEngine(BaseComponent):
             ))
             raise
     
+    async def _generate_text_stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        **kwargs
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Genera texto en streaming usando Claude"""
+        tracker = StreamTracker(self.model)
+        
+        try:
+            params = {**self.default_params, **kwargs}
+            
+            stream = await self.client.completions.create(
+                model=self.model,
+                prompt=self._build_prompt(prompt, system_prompt),
+                stream=True,
+                **params
+            )
+            
+            async for event in stream:
+                if event.completion:
+                    yield tracker.chunk(event.completion)
+            
+            # La API de completions no reporta uso en streaming
+            usage = tracker.estimate_usage(prompt)
+            cost = self._calculate_cost(usage['total_tokens'])
+            
+            self.track_metrics(TaskMetrics(
+                tokens_used=usage['total_tokens'],
+                cost=cost,
+                latency=tracker.latency,
+                success=True,
+                timestamp=datetime.now()
+            ))
+            
+            yield tracker.final(usage, cost)
+            
+        except Exception as e:
+            self.track_metrics(TaskMetrics(
+                success=False,
+                error_message=str(e),
+                latency=tracker.latency,
+                timestamp=datetime.now()
+            ))
+            raise
+    
+    def _build_prompt(self, prompt: str, system_prompt: Optional[str] = None) -> str:
+        """Construye el prompt en formato Human/Assistant"""
+        if system_prompt:
+            return f"{system_prompt}\n\nHuman: {prompt}\n\nAssistant:"
+        return f"Human: {prompt}\n\nAssistant:"
+    
     def _calculate_cost(self, tokens: int) -> float:
         """Calcula el costo basado en el modelo y tokens usados"""
         costs = {
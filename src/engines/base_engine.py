@@ -0,0 +1,82 @@
+from abc import abstractmethod
+from typing import Dict, Any, Optional, AsyncIterator
+from src.core.base_components import BaseComponent
+from src.core.cost_budget import get_cost_budget
+from src.core.token_counter import count_tokens
+
+class BaseAIEngine(BaseComponent):
+    """Interfaz base para motores de IA"""
+    
+    async def generate_text(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """Genera texto usando el motor (reserva el costo estimado en el presupuesto diario)"""
+        return await get_cost_budget().run(
+            lambda: self._generate_text(prompt, system_prompt, **kwargs),
+            estimated_cost=self.estimate_cost(prompt, system_prompt, **kwargs),
+            cost_of=lambda result: result.get('metrics', {}).get('cost')
+        )
+    
+    async def probe(self, prompt: str = 'ping') -> Dict[str, Any]:
+        """Petición mínima de sonda del circuit breaker (no reserva presupuesto)"""
+        return await self._generate_text(prompt, max_tokens=1)
+    
+    async def generate_text_stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        **kwargs
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Genera texto en streaming (mismo formato de eventos que los proveedores)"""
+        budget = get_cost_budget()
+        reservation = budget.reserve(self.estimate_cost(prompt, system_prompt, **kwargs))
+        
+        actual_cost = None
+        try:
+            async for event in self._generate_text_stream(prompt, system_prompt, **kwargs):
+                if event.get('done'):
+                    actual_cost = event.get('metrics', {}).get('cost')
+                yield event
+        except BaseException:
+            budget.cancel(reservation)
+            raise
+        
+        budget.reconcile(reservation, actual_cost)
+    
+    @abstractmethod
+    async def _generate_text(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """Llamada al motor para generar texto"""
+        pass
+    
+    @abstractmethod
+    def _generate_text_stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        **kwargs
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Llamada al motor en streaming"""
+        pass
+    
+    def _calculate_cost(self, tokens: int) -> float:
+        """Calcula el costo de ``tokens`` con el precio del modelo"""
+        return 0.0
+    
+    def estimate_cost(self, prompt: str, system_prompt: Optional[str] = None, **kwargs) -> float:
+        """Costo máximo estimado de una llamada: prompt más el máximo de tokens de salida"""
+        model = getattr(self, 'model', None)
+        max_tokens = kwargs.get('max_tokens', getattr(self, 'default_params', {}).get('max_tokens', 0))
+        tokens = count_tokens(prompt, model) + count_tokens(system_prompt or '', model) + max_tokens
+        return self._calculate_cost(tokens)
+    
+    def get_usage_report(self) -> Dict[str, Any]:
+        """Obtiene el reporte de uso del motor"""
+        return self.get_metrics_summary()
@@ -0,0 +1,103 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, Callable
+from src.core.admission import AdmissionRejectedError
+from src.core.metrics_registry import get_metrics_registry
+
+_registry = get_metrics_registry()
+EXECUTOR_QUEUE_DEPTH = _registry.gauge(
+    'provider_executor_queue_depth', 'Llamadas síncronas esperando hilo por proveedor', ('provider',)
+)
+EXECUTOR_ACTIVE = _registry.gauge(
+    'provider_executor_active', 'Llamadas síncronas ejecutándose por proveedor', ('provider',)
+)
+
+class ExecutorQueueFullError(AdmissionRejectedError):
+    """La cola del pool de hilos del proveedor está llena"""
+
+class BoundedExecutor:
+    """Pool de hilos acotado por proveedor para SDK sin cliente asíncrono
+
+    Las llamadas bloqueantes se ejecutan fuera del event loop en como mucho
+    ``max_workers`` hilos; si ya hay ``max_queue`` llamadas esperando hilo se
+    rechaza la nueva en lugar de acumularla. La profundidad de cola se expone
+    en el registro de métricas.
+    """
+
+    def __init__(self, name: str, config: Optional[Dict[str, Any]] = None):
+        config = config or {}
+        self.name = name
+        self.max_workers = config.get('max_workers', 4)
+        self.max_queue = config.get('max_queue', 32)
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=f"{name}-sync")
+        self._queued = 0
+        self._active = 0
+        self._lock = threading.Lock()
+        self.stats = {
+            'completed': 0,
+            'rejected': 0
+        }
+
+        EXECUTOR_QUEUE_DEPTH.set_function(lambda: self.queue_depth, provider=name)
+        EXECUTOR_ACTIVE.set_function(lambda: self.active, provider=name)
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queued
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    def _run(self, fn: Callable[..., Any], args, kwargs) -> Any:
+        with self._lock:
+            self._queued -= 1
+            self._active += 1
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._active -= 1
+                self.stats['completed'] += 1
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Ejecuta ``fn`` en el pool sin bloquear el event loop"""
+        with self._lock:
+            if self._queued + self._active >= self.max_workers + self.max_queue:
+                self.stats['rejected'] += 1
+                raise ExecutorQueueFullError(
+                    f"Pool de {self.name} saturado ({self._active} en curso, {self._queued} en cola)"
+                )
+            self._queued += 1
+
+        future = self._pool.submit(self._run, fn, args, kwargs)
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            # Si aún no había empezado se retira de la cola
+            if future.cancel():
+                with self._lock:
+                    self._queued -= 1
+            raise
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            'max_workers': self.max_workers,
+            'active': self.active,
+            'queue_depth': self.queue_depth,
+            **self.stats
+        }
+
+    def shutdown(self, cancel_pending: bool = True, on_drained: Optional[Callable[[], Any]] = None):
+        """Libera el pool sin esperar a las llamadas en curso
+
+        Con ``cancel_pending=False`` también terminan las ya encoladas;
+        ``on_drained`` se llama desde otro hilo cuando el pool queda vacío.
+        """
+        self._pool.shutdown(wait=False, cancel_futures=cancel_pending)
+        if on_drained is not None:
+            def drain():
+                self._pool.shutdown(wait=True)
+                on_drained()
+            threading.Thread(target=drain, name=f'{self.name}-shutdown', daemon=True).start()
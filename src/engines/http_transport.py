@@ -0,0 +1,130 @@
+import asyncio
+import weakref
+from typing import Dict, Any, Optional
+from urllib.parse import urlsplit
+import httpx
+from src.core.logging_system import logger
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+DEFAULT_LIMITS = {
+    'max_connections': 100,
+    'max_keepalive_connections': 20,
+    'keepalive_expiry': 30.0
+}
+
+class _LoopBoundTransport(httpx.AsyncBaseTransport):
+    """Transporte que mantiene un pool de conexiones por event loop
+
+    Streamlit ejecuta cada workflow con ``asyncio.run``, que crea un loop nuevo.
+    Las conexiones de httpx quedan ligadas al loop que las abrió, así que el
+    cliente compartido delega en un pool distinto para cada loop activo.
+    """
+
+    def __init__(self, http2: bool, limits: httpx.Limits):
+        self.http2 = http2
+        self.limits = limits
+        self._pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncHTTPTransport]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def _get_pool(self) -> httpx.AsyncHTTPTransport:
+        loop = asyncio.get_running_loop()
+        pool = self._pools.get(loop)
+        if pool is None:
+            # Descartar pools de loops ya cerrados
+            for closed_loop in [l for l in self._pools.keys() if l.is_closed()]:
+                self._pools.pop(closed_loop, None)
+            pool = httpx.AsyncHTTPTransport(http2=self.http2, limits=self.limits)
+            self._pools[loop] = pool
+        return pool
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await self._get_pool().handle_async_request(request)
+
+    async def aclose(self) -> None:
+        loop = asyncio.get_running_loop()
+        pool = self._pools.pop(loop, None)
+        if pool is not None:
+            await pool.aclose()
+
+class HTTPTransport:
+    """Capa de transporte HTTP compartida por todos los proveedores y motores"""
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._transports: Dict[str, _LoopBoundTransport] = {}
+        self.configure(config or {})
+
+    def configure(self, config: Dict[str, Any]):
+        """Actualiza la configuración (aplica a los hosts creados después)"""
+        self.http2 = config.get('http2', True)
+        self.timeout = config.get('timeout', 60.0)
+        self.limits = {**DEFAULT_LIMITS, **config.get('limits', {})}
+        self.host_limits: Dict[str, Dict[str, Any]] = config.get('hosts', {})
+
+        if self.http2 and not HTTP2_AVAILABLE:
+            logger.warning("Paquete 'h2' no instalado, usando HTTP/1.1 con keep-alive")
+            self.http2 = False
+
+    def get_client(self, base_url: str) -> httpx.AsyncClient:
+        """Obtiene el cliente compartido para el host de la URL"""
+        host = self._host_key(base_url)
+        client = self._clients.get(host)
+        if client is None or client.is_closed:
+            client = self._create_client(host)
+            self._clients[host] = client
+        return client
+
+    def _create_client(self, host: str) -> httpx.AsyncClient:
+        netloc = urlsplit(host).netloc
+        limits = {**self.limits, **self.host_limits.get(netloc, {})}
+        transport = _LoopBoundTransport(
+            http2=self.http2,
+            limits=httpx.Limits(**limits)
+        )
+        self._transports[host] = transport
+        logger.info(f"Creando pool HTTP para {host} (http2={self.http2}, limits={limits})")
+        return httpx.AsyncClient(transport=transport, timeout=self.timeout)
+
+    def _host_key(self, base_url: str) -> str:
+        parts = urlsplit(base_url)
+        if not parts.scheme or not parts.netloc:
+            raise ValueError(f"URL base inválida: {base_url}")
+        return f"{parts.scheme}://{parts.netloc}"
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Obtiene el estado de los pools"""
+        return {
+            'http2': self.http2,
+            'hosts': sorted(self._clients.keys())
+        }
+
+    async def aclose(self):
+        """Cierra las conexiones abiertas en el event loop actual"""
+        for transport in self._transports.values():
+            await transport.aclose()
+
+_transport: Optional[HTTPTransport] = None
+
+def get_http_transport() -> HTTPTransport:
+    """Obtiene la capa de transporte del proceso"""
+    global _transport
+    if _transport is None:
+        _transport = HTTPTransport()
+    return _transport
+
+def configure_http_transport(config: Dict[str, Any]) -> HTTPTransport:
+    """Configura la capa de transporte del proceso"""
+    transport = get_http_transport()
+    transport.configure(config)
+    return transport
+
+async def close_http_transport():
+    """Cierra las conexiones del proceso en el event loop actual"""
+    if _transport is not None:
+        await _transport.aclose()
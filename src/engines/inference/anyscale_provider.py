@@ -1,22 +1,26 @@
 import openai
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, AsyncIterator
 from datetime import datetime
 import time
 from .base_inference import BaseInferenceProvider, InferenceMetrics
+from src.engines.http_transport import get_http_transport
+from src.engines.streaming import StreamTracker, iter_chat_chunks
 
 class AnyscaleProvider(BaseInferenceProvider):
     """Proveedor de inferencia usando Anyscale"""
     
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
-        self.client = openai.Client(
+        self.base_url = config.get('base_url', "https://api.endpoints.anyscale.com/v1")
+        self.client = openai.AsyncOpenAI(
             api_key=self.api_key,
-            base_url="https://api.endpoints.anyscale.com/v1"
+            base_url=self.base_url,
+            http_client=get_http_transport().get_client(self.base_url)
         )
         self.default_model = config.get('default_model', 'meta-llama/Llama-2-70b-chat-hf')
         self.cost_per_token = config.get('cost_per_token', 0.0001)
     
-    async def generate_text(
+    async def _generate_text(
         self,
         prompt: str,
         model: Optional[str] = None,
@@ -68,6 +72,53 @@ class AnyscaleProvider(BaseInferenceProvider):
                 latency=end_time - start_time,
                 tokens_used=0,
                 cost=0,
+                model_name=model,
+                success=False
+            ))
+            raise
+    
+    async def _generate_text_stream(
+        self,
+        prompt: str,
+        model: Optional[str] = None,
+        max_tokens: int = 1000,
+        temperature: float = 0.7,
+        **kwargs
+    ) -> AsyncIterator[Dict[str, Any]]:
+        model = model or self.default_model
+        tracker = StreamTracker(model)
+        
+        try:
+            stream = await self.client.chat.completions.create(
+                model=model,
+                messages=[{"role": "user", "content": prompt}],
+                max_tokens=max_tokens,
+                temperature=temperature,
+                stream=True,
+                **kwargs
+            )
+            
+            async for event in iter_chat_chunks(stream, tracker):
+                yield event
+            
+            usage = tracker.estimate_usage(prompt)
+            cost = usage['total_tokens'] * self.cost_per_token
+            
+            self.track_metrics(InferenceMetrics(
+                latency=tracker.latency,
+                tokens_used=usage['total_tokens'],
+                cost=cost,
                 model_name=model
             ))
-            raise 
\ No newline at end of file
+            
+            yield tracker.final(usage, cost)
+            
+        except Exception as e:
+            self.track_metrics(InferenceMetrics(
+                latency=tracker.latency,
+                tokens_used=0,
+                cost=0,
+                model_name=model,
+                success=False
+            ))
+            raise
@@ -1,65 +1,336 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional, List
-from dataclasses import dataclass
+from typing import Dict, Any, Optional, List, AsyncIterator, TYPE_CHECKING
 from datetime import datetime
+from src.engines.streaming import StreamTracker
+from src.core.provider_stats import RollingStats
+from src.core.metrics_buffer import MetricsRingBuffer
+from src.core.admission import AdmissionController
+from src.core.token_counter import get_token_counter
+from src.core.cost_budget import get_cost_budget
+from src.core.metrics_registry import get_metrics_registry
+
+if TYPE_CHECKING:
+    from src.core.circuit_breaker import CircuitBreaker
+
+_registry = get_metrics_registry()
+INFERENCE_REQUESTS = _registry.counter(
+    'inference_requests', 'Peticiones a proveedores de inferencia', ('provider', 'model', 'status')
+)
+INFERENCE_LATENCY = _registry.histogram(
+    'inference_latency_seconds', 'Latencia de las peticiones de inferencia', ('provider', 'model')
+)
+INFERENCE_TOKENS = _registry.counter(
+    'inference_tokens', 'Tokens consumidos en inferencia', ('provider', 'model')
+)
+INFERENCE_COST = _registry.counter(
+    'inference_cost_dollars', 'Costo de inferencia en dólares', ('provider', 'model')
+)
 
-@dataclass
 class InferenceMetrics:
-    """Métricas de inferencia"""
-    latency: float
-    tokens_used: int
-    cost: float
-    model_name: str
-    timestamp: datetime = datetime.now()
+    """Métricas de inferencia (registro compacto con ``__slots__``)"""
+    
+    __slots__ = ('latency', 'tokens_used', 'cost', 'model_name', 'success', 'timestamp')
+    
+    def __init__(
+        self,
+        latency: float,
+        tokens_used: int,
+        cost: float,
+        model_name: str,
+        success: bool = True,
+        timestamp: Optional[datetime] = None
+    ):
+        self.latency = latency
+        self.tokens_used = tokens_used
+        self.cost = cost
+        self.model_name = model_name
+        self.success = success
+        self.timestamp = timestamp or datetime.now()
+    
+    def __repr__(self) -> str:
+        fields = ', '.join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"InferenceMetrics({fields})"
+
+# Claves que fijan el cliente o el pool de hilos al construir el proveedor
+REBUILD_KEYS = ('type', 'api_key', 'base_url', 'executor')
 
 class BaseInferenceProvider(ABC):
     """Interfaz base para proveedores de inferencia"""
     
     def __init__(self, config: Dict[str, Any]):
         self.config = config
+        self.name = config.get('name', self.__class__.__name__)
         self.api_key = config['api_key']
         self.default_model = config.get('default_model')
-        self.metrics: List[InferenceMetrics] = []
+        self.metrics = MetricsRingBuffer(InferenceMetrics, config.get('metrics', {}).get('capacity', 10000))
+        self.stats_config = config.get('stats', {})
+        self.stats = RollingStats(**self.stats_config)
+        self.model_stats: Dict[str, RollingStats] = {}
+        self.admission = AdmissionController(self.name, config.get('admission', {}))
+    
+    def requires_rebuild(self, config: Dict[str, Any]) -> bool:
+        """Indica si el cambio de configuración exige crear un proveedor nuevo
+
+        Tipo, credenciales, URL base y pool de hilos se fijan al construir el
+        cliente; el resto se aplica con ``update_config``.
+        """
+        return any(self.config.get(key) != config.get(key) for key in REBUILD_KEYS)
+    
+    def update_config(self, config: Dict[str, Any]):
+        """Aplica en caliente modelos, precios y límites de admisión
+
+        Las peticiones en curso terminan con los valores con los que empezaron.
+        """
+        self.config = config
+        if config.get('default_model'):
+            self.default_model = config['default_model']
+        if 'cost_per_token' in config:
+            self.cost_per_token = config['cost_per_token']
+        self.admission.configure(config.get('admission', {}))
+    
+    def close(self):
+        """Libera los recursos propios al sustituir o deshabilitar el proveedor
+
+        El pool de hilos deja de aceptar llamadas sin esperar a las que ya
+        recibió, que terminan con esta instancia; el cliente se cierra después.
+        """
+        executor = getattr(self, 'executor', None)
+        if executor is None:
+            self._close_client()
+        else:
+            executor.shutdown(cancel_pending=False, on_drained=self._close_client)
+    
+    def _close_client(self):
+        """Cierra el cliente si es propio (los HTTP son del transporte compartido)"""
+        pass
     
-    @abstractmethod
     async def generate_text(
         self,
         prompt: str,
         model: Optional[str] = None,
         max_tokens: int = 1000,
         temperature: float = 0.7,
+        breaker: Optional['CircuitBreaker'] = None,
         **kwargs
     ) -> Dict[str, Any]:
-        """Genera texto usando el modelo especificado"""
-        pass
+        """Genera texto usando el modelo especificado
+
+        Reserva el costo estimado en el presupuesto diario y pasa por el control
+        de admisión del proveedor. Con ``breaker`` el circuito envuelve solo la
+        llamada al proveedor: las esperas locales (cola de admisión, cuotas
+        RPM/TPM) no cuentan como llamadas lentas.
+        """
+        model = self.budget_model(model)
+        max_tokens = self.fit_max_tokens(prompt, model, max_tokens)
+        tokens = self.estimate_request_tokens(prompt, max_tokens, model)
+        
+        def call():
+            return self._generate_text(
+                prompt,
+                model=model,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                **kwargs
+            )
+        
+        return await get_cost_budget().run(
+            lambda: self.admission.run(
+                call if breaker is None else lambda: breaker.call(call),
+                tokens=tokens,
+                usage=lambda result: result.get('usage', {}).get('total_tokens')
+            ),
+            estimated_cost=self.estimate_cost(tokens, model),
+            cost_of=lambda result: result.get('metrics', {}).get('cost')
+        )
+    
+    async def probe(self, prompt: str = 'ping') -> Dict[str, Any]:
+        """Petición mínima de sonda del circuit breaker
+
+        Pasa por admisión pero no reserva presupuesto: con el límite diario
+        agotado la sonda debe seguir midiendo la salud del proveedor.
+        """
+        return await self.admission.run(
+            lambda: self._generate_text(prompt, max_tokens=1),
+            tokens=self.estimate_request_tokens(prompt, 1)
+        )
+    
+    async def generate_text_stream(
+        self,
+        prompt: str,
+        model: Optional[str] = None,
+        max_tokens: int = 1000,
+        temperature: float = 0.7,
+        **kwargs
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Genera texto en streaming
+
+        Emite eventos ``{'text', 'done': False}`` por fragmento y un evento final
+        con ``done=True``, ``full_text``, ``usage`` y ``metrics`` (incluye ``ttft``).
+        La reserva de presupuesto y la plaza de admisión se mantienen hasta que
+        termina el stream.
+        """
+        model = self.budget_model(model)
+        max_tokens = self.fit_max_tokens(prompt, model, max_tokens)
+        tokens = self.estimate_request_tokens(prompt, max_tokens, model)
+        budget = get_cost_budget()
+        reservation = budget.reserve(self.estimate_cost(tokens, model))
+        # Como en ``AdmissionController.run``: deshabilitada no se toma plaza
+        # (se fija al empezar para que una recarga no libere una plaza no tomada)
+        admitted = self.admission.enabled
+        try:
+            if admitted:
+                await self.admission.acquire(tokens)
+        except BaseException:
+            budget.cancel(reservation)
+            raise
+        
+        actual = None
+        actual_cost = None
+        try:
+            async for event in self._generate_text_stream(
+                prompt,
+                model=model,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                **kwargs
+            ):
+                if event.get('done'):
+                    actual = event.get('usage', {}).get('total_tokens')
+                    actual_cost = event.get('metrics', {}).get('cost')
+                yield event
+        except Exception as e:
+            budget.cancel(reservation)
+            if admitted:
+                self.admission.release(error=e)
+            raise
+        except BaseException:
+            # Cancelación o cierre del generador: liberar sin ajustar el límite
+            budget.cancel(reservation)
+            if admitted:
+                self.admission.limiter.release()
+            raise
+        
+        budget.reconcile(reservation, actual_cost)
+        if admitted:
+            self.admission.release(tokens_delta=tokens - actual if actual is not None else 0)
     
-    @abstractmethod
     async def embed_text(
         self,
         text: str,
         model: Optional[str] = None,
         **kwargs
     ) -> Dict[str, Any]:
-        """Genera embeddings del texto"""
+        """Genera embeddings del texto (pasa por el control de admisión)"""
+        return await self.admission.run(
+            lambda: self._embed_text(text, model=model, **kwargs),
+            tokens=self.estimate_request_tokens(text, model=model)
+        )
+    
+    @abstractmethod
+    async def _generate_text(
+        self,
+        prompt: str,
+        model: Optional[str] = None,
+        max_tokens: int = 1000,
+        temperature: float = 0.7,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """Llamada al proveedor para generar texto"""
         pass
     
+    async def _generate_text_stream(
+        self,
+        prompt: str,
+        model: Optional[str] = None,
+        max_tokens: int = 1000,
+        temperature: float = 0.7,
+        **kwargs
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Llamada al proveedor en streaming
+
+        Por defecto emite la respuesta completa como un único fragmento.
+        """
+        tracker = StreamTracker(model or self.default_model)
+        result = await self._generate_text(
+            prompt,
+            model=model,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            **kwargs
+        )
+        yield tracker.chunk(result['text'])
+        yield tracker.final(result.get('usage', {}), result.get('metrics', {}).get('cost'))
+    
+    async def _embed_text(
+        self,
+        text: str,
+        model: Optional[str] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """Llamada al proveedor para generar embeddings"""
+        raise NotImplementedError(f"{self.__class__.__name__} no soporta embeddings")
+    
+    def estimate_request_tokens(self, prompt: str, max_tokens: int = 0, model: Optional[str] = None) -> int:
+        """Tokens de una petición (prompt + máximo de salida) para reservar cuota TPM"""
+        return get_token_counter().count(prompt, model or self.default_model) + max_tokens
+    
+    def estimate_cost(self, tokens: int, model: Optional[str] = None) -> float:
+        """Costo estimado de ``tokens`` con el precio del modelo (por 1K tokens) o el del proveedor"""
+        prices = self.config.get('prices', {})
+        model = model or self.default_model
+        if model in prices:
+            return tokens / 1000 * prices[model]
+        return tokens * getattr(self, 'cost_per_token', self.config.get('cost_per_token', 0.0))
+    
+    def budget_model(self, model: Optional[str]) -> Optional[str]:
+        """Modelo a usar según el presupuesto: uno más barato si este proveedor lo sirve"""
+        model = model or self.default_model
+        cheaper = get_cost_budget().choose_model(model)
+        if cheaper != model and cheaper not in self.config.get('models', []):
+            return model
+        return cheaper
+    
+    def fit_max_tokens(self, prompt: str, model: Optional[str], max_tokens: int) -> int:
+        """Ajusta ``max_tokens`` a la ventana de contexto antes de llamar al proveedor"""
+        return get_token_counter().fit_max_tokens(prompt, model or self.default_model, max_tokens)
+    
     def track_metrics(self, metrics: InferenceMetrics):
         """Registra métricas de inferencia"""
         self.metrics.append(metrics)
+        
+        labels = {'provider': self.name, 'model': metrics.model_name or 'unknown'}
+        INFERENCE_REQUESTS.inc(status='success' if metrics.success else 'error', **labels)
+        INFERENCE_LATENCY.observe(metrics.latency, **labels)
+        if metrics.tokens_used:
+            INFERENCE_TOKENS.inc(metrics.tokens_used, **labels)
+        if metrics.cost:
+            INFERENCE_COST.inc(metrics.cost, **labels)
+        
+        # Estadísticas incrementales por proveedor y por modelo para el enrutado
+        model_stats = self.model_stats.get(metrics.model_name)
+        if model_stats is None:
+            model_stats = self.model_stats[metrics.model_name] = RollingStats(**self.stats_config)
+        for stats in (self.stats, model_stats):
+            stats.record(
+                latency=metrics.latency,
+                success=metrics.success,
+                tokens=metrics.tokens_used,
+                cost=metrics.cost
+            )
+    
+    def get_routing_stats(self, model: Optional[str] = None) -> Dict[str, Any]:
+        """Estadísticas recientes del proveedor (o de un modelo concreto)"""
+        stats = self.model_stats.get(model, self.stats) if model else self.stats
+        return stats.snapshot()
     
     def get_metrics_summary(self) -> Dict[str, Any]:
-        """Obtiene resumen de métricas"""
-        if not self.metrics:
-            return {
-                'total_cost': 0.0,
-                'avg_latency': 0.0,
-                'total_tokens': 0,
-                'requests_count': 0
-            }
-        
+        """Obtiene resumen de métricas (totales desde el arranque, medias sobre la ventana reciente)"""
+        summary = self.metrics.summary()
         return {
-            'total_cost': sum(m.cost for m in self.metrics),
-            'avg_latency': sum(m.latency for m in self.metrics) / len(self.metrics),
-            'total_tokens': sum(m.tokens_used for m in self.metrics),
-            'requests_count': len(self.metrics)
-        } 
\ No newline at end of file
+            'total_cost': summary['total_cost'],
+            'avg_latency': summary['avg_latency'],
+            'p95_latency': summary['p95_latency'],
+            'total_tokens': summary['total_tokens'],
+            'requests_count': summary['total_requests'],
+            'by_model': self.metrics.group_summary('model_name')
+        }
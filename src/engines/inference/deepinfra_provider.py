@@ -1,8 +1,9 @@
-import httpx
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, AsyncIterator
 from datetime import datetime
 import time
 from .base_inference import BaseInferenceProvider, InferenceMetrics
+from src.engines.http_transport import get_http_transport
+from src.engines.streaming import StreamTracker, iter_sse_data
 
 class DeepInfraProvider(BaseInferenceProvider):
     """Proveedor de inferencia usando DeepInfra"""
@@ -11,11 +12,10 @@ class DeepInfraProvider(BaseInferenceProvider):
         super().__init__(config)
         self.base_url = "https://api.deepinfra.com/v1/inference"
         self.default_model = config.get('default_model', 'meta-llama/Llama-2-70b-chat-hf')
-        self.client = httpx.AsyncClient(
-            headers={"Authorization": f"Bearer {self.api_key}"}
-        )
+        self.headers = {"Authorization": f"Bearer {self.api_key}"}
+        self.client = get_http_transport().get_client(self.base_url)
     
-    async def generate_text(
+    async def _generate_text(
         self,
         prompt: str,
         model: Optional[str] = None,
@@ -34,7 +34,8 @@ class DeepInfraProvider(BaseInferenceProvider):
                     "max_tokens": max_tokens,
                     "temperature": temperature,
                     **kwargs
-                }
+                },
+                headers=self.headers
             )
             response.raise_for_status()
             data = response.json()
@@ -64,6 +65,61 @@ class DeepInfraProvider(BaseInferenceProvider):
                 latency=end_time - start_time,
                 tokens_used=0,
                 cost=0,
+                model_name=model,
+                success=False
+            ))
+            raise
+    
+    async def _generate_text_stream(
+        self,
+        prompt: str,
+        model: Optional[str] = None,
+        max_tokens: int = 1000,
+        temperature: float = 0.7,
+        **kwargs
+    ) -> AsyncIterator[Dict[str, Any]]:
+        model = model or self.default_model
+        tracker = StreamTracker(model)
+        
+        try:
+            async with self.client.stream(
+                "POST",
+                f"{self.base_url}/{model}",
+                json={
+                    "input": prompt,
+                    "max_tokens": max_tokens,
+                    "temperature": temperature,
+                    "stream": True,
+                    **kwargs
+                },
+                headers=self.headers
+            ) as response:
+                response.raise_for_status()
+                async for data in iter_sse_data(response):
+                    if data.get('usage'):
+                        tracker.usage = data['usage']
+                    text = (data.get('token') or {}).get('text')
+                    if text:
+                        yield tracker.chunk(text)
+            
+            usage = tracker.estimate_usage(prompt)
+            cost = 0.0
+            
+            self.track_metrics(InferenceMetrics(
+                latency=tracker.latency,
+                tokens_used=usage['total_tokens'],
+                cost=cost,
                 model_name=model
             ))
-            raise 
\ No newline at end of file
+            
+            yield tracker.final(usage, cost)
+            
+        except Exception as e:
+            self.track_metrics(InferenceMetrics(
+                latency=tracker.latency,
+                tokens_used=0,
+                cost=0,
+                model_name=model,
+                success=False
+            ))
+            raise
@@ -1,19 +1,27 @@
 import groq
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, AsyncIterator
 from datetime import datetime
 import time
 from .base_inference import BaseInferenceProvider, InferenceMetrics
+from src.core.token_counter import count_tokens
+from src.engines.http_transport import get_http_transport
+from src.engines.streaming import StreamTracker, iter_chat_chunks
 
 class GroqProvider(BaseInferenceProvider):
     """Proveedor de inferencia usando Groq"""
     
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
-        self.client = groq.Client(api_key=self.api_key)
+        self.base_url = config.get('base_url', "https://api.groq.com")
+        self.client = groq.AsyncGroq(
+            api_key=self.api_key,
+            base_url=self.base_url,
+            http_client=get_http_transport().get_client(self.base_url)
+        )
         self.default_model = config.get('default_model', 'mixtral-8x7b-32768')
         self.cost_per_token = config.get('cost_per_token', 0.0001)
     
-    async def generate_text(
+    async def _generate_text(
         self,
         prompt: str,
         model: Optional[str] = None,
@@ -66,11 +74,58 @@ class GroqProvider(BaseInferenceProvider):
                 latency=end_time - start_time,
                 tokens_used=0,
                 cost=0,
+                model_name=model,
+                success=False
+            ))
+            raise
+    
+    async def _generate_text_stream(
+        self,
+        prompt: str,
+        model: Optional[str] = None,
+        max_tokens: int = 1000,
+        temperature: float = 0.7,
+        **kwargs
+    ) -> AsyncIterator[Dict[str, Any]]:
+        model = model or self.default_model
+        tracker = StreamTracker(model)
+        
+        try:
+            stream = await self.client.chat.completions.create(
+                model=model,
+                messages=[{"role": "user", "content": prompt}],
+                max_tokens=max_tokens,
+                temperature=temperature,
+                stream=True,
+                **kwargs
+            )
+            
+            async for event in iter_chat_chunks(stream, tracker):
+                yield event
+            
+            usage = tracker.estimate_usage(prompt)
+            cost = usage['total_tokens'] * self.cost_per_token
+            
+            self.track_metrics(InferenceMetrics(
+                latency=tracker.latency,
+                tokens_used=usage['total_tokens'],
+                cost=cost,
                 model_name=model
             ))
+            
+            yield tracker.final(usage, cost)
+            
+        except Exception as e:
+            self.track_metrics(InferenceMetrics(
+                latency=tracker.latency,
+                tokens_used=0,
+                cost=0,
+                model_name=model,
+                success=False
+            ))
             raise
     
-    async def embed_text(
+    async def _embed_text(
         self,
         text: str,
         model: Optional[str] = None,
@@ -92,7 +147,7 @@ class GroqProvider(BaseInferenceProvider):
             # Registrar métricas
             self.track_metrics(InferenceMetrics(
                 latency=latency,
-                tokens_used=len(text.split()),  # Aproximación
+                tokens_used=count_tokens(text, model),
                 cost=0.0,  # Ajustar según pricing
                 model_name=model
             ))
@@ -111,6 +166,7 @@ class GroqProvider(BaseInferenceProvider):
                 latency=end_time - start_time,
                 tokens_used=0,
                 cost=0,
-                model_name=model
+                model_name=model,
+                success=False
             ))
             raise 
\ No newline at end of file
@@ -0,0 +1,130 @@
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, List, Callable
+
+@dataclass
+class ModelOffering:
+    """Un modelo lógico servido por un proveedor concreto"""
+    logical_model: str
+    provider: str
+    model: str
+    input_price: float = 0.0
+    output_price: float = 0.0
+
+    def estimate_cost(self, prompt_tokens: int, completion_tokens: int) -> float:
+        """Costo estimado con los precios por 1K tokens de entrada y salida"""
+        return (prompt_tokens * self.input_price + completion_tokens * self.output_price) / 1000
+
+@dataclass
+class RouteCandidate:
+    """Oferta evaluada para una petición concreta"""
+    offering: ModelOffering
+    estimated_cost: float
+    p95_latency: Optional[float]
+    meets_target: bool
+
+class ModelCatalog:
+    """Catálogo de modelos lógicos y los proveedores que los sirven
+
+    Configuración (sección ``model_catalog``)::
+
+        llama-2-70b-chat:
+          latency_target: 8.0
+          providers:
+            deepinfra: {model: "meta-llama/Llama-2-70b-chat-hf", input_price: 0.0007, output_price: 0.0009}
+
+    El enrutado elige la oferta más barata cuya latencia p95 reciente cumple el
+    objetivo; las ofertas sin muestras suficientes se consideran dentro del
+    objetivo para que reciban tráfico y acumulen estadísticas.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        config = config or {}
+        self.min_samples = config.get('min_samples', 5)
+        self.default_latency_target = config.get('default_latency_target')
+        self.latency_targets: Dict[str, Optional[float]] = {}
+        self._offerings: Dict[str, List[ModelOffering]] = {}
+
+        for logical_model, entry in config.get('models', {}).items():
+            self.latency_targets[logical_model] = entry.get('latency_target', self.default_latency_target)
+            self._offerings[logical_model] = [
+                ModelOffering(
+                    logical_model=logical_model,
+                    provider=provider,
+                    model=offer['model'],
+                    input_price=offer.get('input_price', 0.0),
+                    output_price=offer.get('output_price', 0.0)
+                )
+                for provider, offer in entry.get('providers', {}).items()
+            ]
+
+    def __contains__(self, logical_model: Optional[str]) -> bool:
+        return logical_model in self._offerings
+
+    def logical_models(self) -> List[str]:
+        return list(self._offerings)
+
+    def offerings(self, logical_model: str) -> List[ModelOffering]:
+        """Proveedores que sirven un modelo lógico"""
+        return list(self._offerings.get(logical_model, []))
+
+    def find(self, provider: str, model: str) -> Optional[ModelOffering]:
+        """Oferta de un proveedor para un identificador de modelo concreto"""
+        for offerings in self._offerings.values():
+            for offering in offerings:
+                if offering.provider == provider and offering.model == model:
+                    return offering
+        return None
+
+    def route(
+        self,
+        logical_model: str,
+        stats: Callable[[str, str], Dict[str, Any]],
+        prompt_tokens: int,
+        completion_tokens: int,
+        latency_target: Optional[float] = None,
+        available: Optional[Callable[[str], bool]] = None
+    ) -> List[RouteCandidate]:
+        """Ordena las ofertas disponibles para una petición
+
+        Primero las que cumplen el objetivo de latencia, de más barata a más
+        cara; después el resto, de más rápida a más lenta. ``stats(provider,
+        model)`` devuelve las estadísticas de enrutado del proveedor para ese
+        modelo.
+        """
+        if logical_model not in self._offerings:
+            raise KeyError(f"Modelo lógico desconocido: {logical_model}")
+        target = latency_target if latency_target is not None else self.latency_targets.get(logical_model)
+
+        candidates = []
+        for offering in self._offerings[logical_model]:
+            if available is not None and not available(offering.provider):
+                continue
+            snapshot = stats(offering.provider, offering.model)
+            p95 = snapshot.get('p95_latency') if snapshot.get('requests_count', 0) >= self.min_samples else None
+            candidates.append(RouteCandidate(
+                offering=offering,
+                estimated_cost=offering.estimate_cost(prompt_tokens, completion_tokens),
+                p95_latency=p95,
+                meets_target=target is None or p95 is None or p95 <= target
+            ))
+
+        within = sorted((c for c in candidates if c.meets_target), key=lambda c: c.estimated_cost)
+        outside = sorted((c for c in candidates if not c.meets_target), key=lambda c: (c.p95_latency, c.estimated_cost))
+        return within + outside
+
+    def get_catalog(self) -> Dict[str, Any]:
+        """Vista serializable del catálogo"""
+        return {
+            logical_model: {
+                'latency_target': self.latency_targets.get(logical_model),
+                'providers': {
+                    o.provider: {
+                        'model': o.model,
+                        'input_price': o.input_price,
+                        'output_price': o.output_price
+                    }
+                    for o in offerings
+                }
+            }
+            for logical_model, offerings in self._offerings.items()
+        }
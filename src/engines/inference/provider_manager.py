@@ -1,12 +1,18 @@
 from typing import Dict, Any, Optional, List
 from .base_inference import BaseInferenceProvider
-from .groq_provider import GroqProvider
-from .anthropic_provider import AnthropicProvider
-from .together_provider import TogetherProvider
-from .anyscale_provider import AnyscaleProvider
-from .replicate_provider import ReplicateProvider
-from .deepinfra_provider import DeepInfraProvider
-from .sambanova_provider import SambanovaProvider
+from .model_catalog import ModelCatalog
+from src.engines.registry import PROVIDER_REGISTRY
+from src.engines.http_transport import configure_http_transport, close_http_transport
+from src.core.response_cache import ResponseCache, make_cache_key
+from src.core.semantic_cache import SemanticCache
+from src.core.request_coalescer import RequestCoalescer
+from src.core.hedging import run_hedged
+from src.core.circuit_breaker import CircuitBreaker, CircuitOpenError
+from src.core.admission import AdmissionRejectedError
+from src.core.token_counter import configure_token_counter, count_tokens, ContextWindowExceededError
+from src.core.cost_budget import configure_cost_budget, BudgetExceededError
+from src.core.metrics_registry import get_metrics_registry
+from src.core.logging_system import logger
 
 class InferenceProviderManager:
     """Gestor de proveedores de inferencia"""
@@ -14,25 +20,179 @@ class InferenceProviderManager:
     def __init__(self, config: Dict[str, Any]):
         self.config = config
         self.providers: Dict[str, BaseInferenceProvider] = {}
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self.transport = configure_http_transport(config.get('http_transport', {}))
+        self.token_counter = configure_token_counter(config.get('tokenizer', {}))
+        self.budget = configure_cost_budget(config.get('budget', {}))
+        self.cache = ResponseCache(config.get('cache', {}), namespace='inference')
+        self.semantic_config = config.get('semantic_cache', {})
+        self.semantic_cache = SemanticCache(self.semantic_config)
+        self.coalescer = RequestCoalescer()
+        self.hedging_config = config.get('hedging', {})
+        self.catalog = ModelCatalog(config.get('model_catalog', {}))
+        self.hedge_stats: Dict[str, Any] = {
+            'hedged_requests': 0,
+            'primary_wins': 0,
+            'backup_wins': 0,
+            'wins_by_provider': {}
+        }
         self.load_providers()
     
     def load_providers(self):
-        """Carga los proveedores configurados"""
-        provider_classes = {
-            'groq': GroqProvider,
-            'anthropic': AnthropicProvider,
-            'together': TogetherProvider,
-            'anyscale': AnyscaleProvider,
-            'replicate': ReplicateProvider,
-            'deepinfra': DeepInfraProvider,
-            'sambanova': SambanovaProvider
-        }
-        
+        """Carga los proveedores configurados
+
+        Solo se importan los módulos (y sus SDK) de los proveedores habilitados.
+        """
         for name, provider_config in self.config.get('providers', {}).items():
             if provider_config.get('enabled', True):
-                provider_class = provider_classes.get(provider_config['type'])
-                if provider_class:
-                    self.providers[name] = provider_class(provider_config)
+                self._load_provider(name, provider_config)
+        
+        self._seed_catalog_prices()
+        
+        registry = get_metrics_registry()
+        budget = registry.gauge('cost_budget_dollars', 'Presupuesto diario de costo', ('kind',))
+        budget.set_function(lambda: self.budget.get_status()['spent'], kind='spent')
+        budget.set_function(lambda: self.budget.get_status()['reserved'], kind='reserved')
+        budget.set_function(lambda: self.budget.daily_limit, kind='limit')
+        registry.gauge(
+            'inference_cache_hit_ratio', 'Tasa de aciertos de la caché de respuestas', ('cache',)
+        ).set_function(lambda: self.cache.get_stats()['hit_rate'], cache='exact')
+    
+    def _provider_config(self, name: str, provider_config: Dict[str, Any]) -> Dict[str, Any]:
+        """Configuración efectiva de un proveedor con la admisión global aplicada"""
+        return {
+            **provider_config,
+            'name': name,
+            'admission': {
+                **self.config.get('admission', {}),
+                **provider_config.get('admission', {})
+            }
+        }
+    
+    def _load_provider(self, name: str, provider_config: Dict[str, Any]) -> Optional[BaseInferenceProvider]:
+        """Crea un proveedor con su circuit breaker y sus métricas"""
+        provider_class = self._get_provider_class(name, provider_config['type'])
+        if not provider_class:
+            return None
+        provider = provider_class(self._provider_config(name, provider_config))
+        self.providers[name] = provider
+        self.breakers[name] = self._create_breaker(name, provider, provider_config)
+        self._register_gauges(name, provider)
+        return provider
+    
+    def _seed_catalog_prices(self):
+        """Los precios del catálogo alimentan la reserva de presupuesto de cada proveedor"""
+        for logical_model in self.catalog.logical_models():
+            for offering in self.catalog.offerings(logical_model):
+                provider = self.providers.get(offering.provider)
+                if provider is not None:
+                    prices = provider.config.setdefault('prices', {})
+                    prices.setdefault(offering.model, max(offering.input_price, offering.output_price))
+    
+    def apply_config(self, config: Dict[str, Any]):
+        """Aplica en caliente una nueva configuración de proveedores
+
+        Límites de admisión, modelos y precios se actualizan sobre los
+        proveedores existentes; los que cambian de credenciales o URL se
+        sustituyen por una instancia nueva y los deshabilitados dejan de
+        recibir tráfico. Las peticiones en curso conservan la instancia con la
+        que empezaron y después se liberan sus pools de hilos y clientes.
+        Presupuesto, catálogo y hedging también se recargan;
+        transporte HTTP y cachés requieren reiniciar.
+        """
+        self.config = config
+        self.budget = configure_cost_budget(config.get('budget', {}))
+        self.hedging_config = config.get('hedging', {})
+        self.catalog = ModelCatalog(config.get('model_catalog', {}))
+        
+        providers: Dict[str, BaseInferenceProvider] = {}
+        breakers: Dict[str, CircuitBreaker] = {}
+        previous_providers, previous_breakers = self.providers, self.breakers
+        # Los diccionarios se sustituyen enteros para no alterar iteraciones en curso
+        self.providers, self.breakers = providers, breakers
+        for name, provider_config in config.get('providers', {}).items():
+            if not provider_config.get('enabled', True):
+                continue
+            current = previous_providers.get(name)
+            effective = self._provider_config(name, provider_config)
+            if current is not None and not current.requires_rebuild(effective):
+                current.update_config(effective)
+                providers[name] = current
+                breakers[name] = previous_breakers[name]
+            else:
+                # Si la nueva no se puede crear, la anterior se cierra abajo como deshabilitada
+                if self._load_provider(name, provider_config) is not None and current is not None:
+                    current.close()
+        
+        for name in previous_providers.keys() - providers.keys():
+            logger.info(f"Proveedor {name} deshabilitado en caliente")
+            self._unregister_gauges(name)
+            previous_providers[name].close()
+        self._seed_catalog_prices()
+    
+    def _get_provider_class(self, name: str, provider_type: str) -> Optional[type]:
+        """Clase del proveedor desde el registro (None si no se puede cargar)"""
+        try:
+            return PROVIDER_REGISTRY.get(provider_type)
+        except KeyError:
+            logger.warning(f"Proveedor {name} ignorado: tipo desconocido {provider_type}")
+        except ImportError as e:
+            logger.error(f"Proveedor {name} ignorado: no se pudo importar {provider_type}: {str(e)}")
+        return None
+    
+    def _register_gauges(self, name: str, provider: BaseInferenceProvider):
+        """Expone el estado de circuito y admisión del proveedor en el registro de métricas"""
+        registry = get_metrics_registry()
+        breaker = self.breakers[name]
+        limiter = provider.admission.limiter
+        registry.gauge(
+            'provider_circuit_state', 'Estado del circuito (0 cerrado, 1 semiabierto, 2 abierto)', ('provider',)
+        ).set_function(lambda: {'CLOSED': 0, 'HALF_OPEN': 1, 'OPEN': 2}[breaker.state.name], provider=name)
+        registry.gauge(
+            'provider_concurrency_limit', 'Límite de concurrencia AIMD actual', ('provider',)
+        ).set_function(lambda: int(limiter.limit), provider=name)
+        registry.gauge(
+            'provider_in_flight', 'Peticiones en curso por proveedor', ('provider',)
+        ).set_function(lambda: limiter.in_flight, provider=name)
+        registry.gauge(
+            'provider_queue_depth', 'Peticiones esperando admisión por proveedor', ('provider',)
+        ).set_function(lambda: limiter.queued, provider=name)
+    
+    def _unregister_gauges(self, name: str):
+        """Deja de exponer las series de un proveedor retirado"""
+        registry = get_metrics_registry()
+        for metric in ('provider_circuit_state', 'provider_concurrency_limit', 'provider_in_flight', 'provider_queue_depth'):
+            registry.gauge(metric, '', ('provider',)).set_function(lambda: None, provider=name)
+    
+    def _create_breaker(
+        self,
+        name: str,
+        provider: BaseInferenceProvider,
+        provider_config: Dict[str, Any]
+    ) -> CircuitBreaker:
+        """Crea el circuit breaker de un proveedor con una sonda mínima"""
+        breaker_config = {
+            **self.config.get('circuit_breaker', {}),
+            **provider_config.get('circuit_breaker', {})
+        }
+        return CircuitBreaker(
+            name,
+            breaker_config,
+            # Rechazos locales: no dicen nada de la salud del proveedor
+            ignore=(AdmissionRejectedError, BudgetExceededError, ContextWindowExceededError),
+            probe=lambda: provider.probe(breaker_config.get('probe_prompt', 'ping'))
+        )
+    
+    async def aclose(self):
+        """Cierra las conexiones HTTP abiertas en el event loop actual"""
+        await close_http_transport()
+    
+    def shutdown(self):
+        """Libera los pools de hilos de los proveedores al descartar el gestor"""
+        for provider in self.providers.values():
+            executor = getattr(provider, 'executor', None)
+            if executor is not None:
+                executor.shutdown()
     
     def get_provider(self, name: str) -> Optional[BaseInferenceProvider]:
         """Obtiene un proveedor específico"""
@@ -42,14 +202,236 @@ class InferenceProviderManager:
         """Obtiene todos los proveedores activos"""
         return self.providers
     
+    def get_provider_name(self, provider: BaseInferenceProvider) -> Optional[str]:
+        """Obtiene el nombre con el que está registrado un proveedor"""
+        for name, registered in self.providers.items():
+            if registered is provider:
+                return name
+        return None
+    
+    async def generate_text(
+        self,
+        prompt: str,
+        task: str = 'general',
+        provider_name: Optional[str] = None,
+        model: Optional[str] = None,
+        use_cache: bool = True,
+        latency_target: Optional[float] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """Genera texto con el proveedor indicado o con el mejor para la tarea
+
+        Si ``model`` es un modelo lógico del catálogo y no se indica proveedor,
+        se enruta al proveedor más barato que cumple ``latency_target`` (o el
+        objetivo configurado para ese modelo).
+        """
+        cache_params = {**kwargs, 'provider': provider_name} if provider_name else kwargs
+        cache_key = make_cache_key(prompt, model, cache_params)
+        
+        embedding = None
+        semantic_scope = self._semantic_scope(model, provider_name, kwargs)
+        
+        if use_cache:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return {**cached, 'cached': True}
+            
+            if self.semantic_cache.enabled:
+                embedding = await self._embed_for_cache(prompt)
+                if embedding is not None:
+                    match = self.semantic_cache.lookup(embedding, scope=semantic_scope)
+                    if match is not None:
+                        value, similarity = match
+                        return {**value, 'cached': True, 'similarity': similarity}
+        
+        # Las llamadas idénticas concurrentes comparten una sola petición
+        result = await self.coalescer.run(
+            cache_key,
+            lambda: self._generate_uncached(prompt, task, provider_name, model, latency_target, **kwargs)
+        )
+        
+        if use_cache:
+            self.cache.set(cache_key, result)
+            if embedding is not None:
+                self.semantic_cache.add(embedding, result, scope=semantic_scope)
+        
+        return {**result, 'cached': False}
+    
+    async def _generate_uncached(
+        self,
+        prompt: str,
+        task: str,
+        provider_name: Optional[str],
+        model: Optional[str],
+        latency_target: Optional[float] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """Llama al proveedor indicado o al mejor para la tarea"""
+        if provider_name is None and model in self.catalog:
+            return await self._generate_routed(prompt, model, latency_target, **kwargs)
+        
+        if provider_name:
+            provider = self.get_provider(provider_name)
+            if provider is None:
+                raise ValueError(f"Proveedor no disponible: {provider_name}")
+        elif self.hedging_config.get('enabled', False) and model is None:
+            # Solo se cubre sin modelo explícito: cada proveedor usa su modelo por defecto
+            return await self._generate_hedged(prompt, task, **kwargs)
+        else:
+            provider = self.get_best_provider(task)
+        
+        return await self._call_provider(provider, prompt, model, **kwargs)
+    
+    async def _call_provider(
+        self,
+        provider: BaseInferenceProvider,
+        prompt: str,
+        model: Optional[str],
+        **kwargs
+    ) -> Dict[str, Any]:
+        name = self.get_provider_name(provider)
+        breaker = self.breakers[name]
+        # Sin plaza en el circuito no tiene sentido esperar admisión ni reservar presupuesto
+        if not breaker.is_available():
+            breaker.stats['rejected'] += 1
+            raise CircuitOpenError(f"Circuito abierto para {name}")
+        result = await provider.generate_text(prompt, model=model, breaker=breaker, **kwargs)
+        result['provider'] = name
+        return result
+    
+    async def _generate_routed(
+        self,
+        prompt: str,
+        logical_model: str,
+        latency_target: Optional[float] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """Enruta un modelo lógico por orden de costo y latencia, pasando al siguiente si falla"""
+        candidates = self.catalog.route(
+            logical_model,
+            stats=self._offering_stats,
+            prompt_tokens=count_tokens(prompt, logical_model),
+            completion_tokens=kwargs.get('max_tokens', 1000),
+            latency_target=latency_target,
+            available=lambda name: name in self.providers and self.breakers[name].is_available()
+        )
+        if not candidates:
+            raise CircuitOpenError(f"No hay proveedores disponibles para {logical_model}")
+        
+        last_error: Optional[Exception] = None
+        for candidate in candidates:
+            offering = candidate.offering
+            try:
+                result = await self._call_provider(
+                    self.providers[offering.provider], prompt, offering.model, **kwargs
+                )
+            except Exception as e:
+                logger.warning(f"{offering.provider} falló sirviendo {logical_model}: {str(e)}")
+                last_error = e
+                continue
+            result['logical_model'] = logical_model
+            result['route'] = {
+                'estimated_cost': candidate.estimated_cost,
+                'p95_latency': candidate.p95_latency,
+                'meets_target': candidate.meets_target
+            }
+            return result
+        
+        raise last_error
+    
+    def _offering_stats(self, provider_name: str, model: str) -> Dict[str, Any]:
+        """Estadísticas recientes de un proveedor para un modelo concreto (vacías si no hay)"""
+        stats = self.providers[provider_name].model_stats.get(model)
+        return stats.snapshot() if stats is not None else {'requests_count': 0}
+    
+    async def _generate_hedged(self, prompt: str, task: str, **kwargs) -> Dict[str, Any]:
+        """Lanza la petición al siguiente mejor proveedor si el primario supera su p95"""
+        ranked = self.rank_providers(task)
+        if not ranked:
+            raise CircuitOpenError("No hay proveedores disponibles: todos los circuitos están abiertos")
+        primary = ranked[0]
+        if len(ranked) < 2:
+            return await self._call_provider(primary, prompt, None, **kwargs)
+        backup = ranked[1]
+        
+        delay = self._hedge_delay(primary)
+        winner, result, hedged = await run_hedged(
+            lambda: self._call_provider(primary, prompt, None, **kwargs),
+            lambda: self._call_provider(backup, prompt, None, **kwargs),
+            delay
+        )
+        
+        if hedged:
+            self._record_hedge(winner, result['provider'])
+            result['hedged'] = True
+        return result
+    
+    def _hedge_delay(self, provider: BaseInferenceProvider) -> float:
+        """Tiempo de espera antes de cubrir la petición (p95 observado del proveedor)"""
+        min_samples = self.hedging_config.get('min_samples', 20)
+        p95 = None
+        if provider.stats.count >= min_samples:
+            p95 = provider.stats.p95.value()
+        
+        delay = p95 if p95 is not None else self.hedging_config.get('default_delay', 5.0)
+        return min(
+            max(delay, self.hedging_config.get('min_delay', 0.5)),
+            self.hedging_config.get('max_delay', 30.0)
+        )
+    
+    def _record_hedge(self, winner: str, provider_name: Optional[str]):
+        self.hedge_stats['hedged_requests'] += 1
+        self.hedge_stats[f'{winner}_wins'] += 1
+        wins = self.hedge_stats['wins_by_provider']
+        wins[provider_name] = wins.get(provider_name, 0) + 1
+        logger.info(f"Petición cubierta: ganó {winner} ({provider_name})")
+    
+    def _semantic_scope(
+        self,
+        model: Optional[str],
+        provider_name: Optional[str],
+        params: Dict[str, Any]
+    ) -> str:
+        """Modelo, proveedor y parámetros que deben coincidir en la caché semántica"""
+        scope_params = {
+            name: params.get(name)
+            for name in self.semantic_config.get('scope_params', [])
+        }
+        return make_cache_key('', model, {**scope_params, 'provider': provider_name})
+    
+    async def _embed_for_cache(self, prompt: str) -> Optional[List[float]]:
+        """Calcula el embedding de un prompt para la caché semántica"""
+        provider = self.get_provider(self.semantic_config.get('embedding_provider', 'together'))
+        if provider is None:
+            return None
+        
+        try:
+            result = await provider.embed_text(
+                ' '.join(prompt.split()),
+                model=self.semantic_config.get('embedding_model')
+            )
+            return result['embeddings']
+        except Exception as e:
+            logger.warning(f"No se pudo calcular el embedding para la caché semántica: {str(e)}")
+            return None
+    
     def get_best_provider(self, task: str, criteria: List[str] = ["cost", "speed", "quality"]) -> BaseInferenceProvider:
         """Selecciona el mejor proveedor para una tarea"""
+        ranked = self.rank_providers(task, criteria)
+        if not ranked:
+            raise CircuitOpenError("No hay proveedores disponibles: todos los circuitos están abiertos")
+        return ranked[0]
+    
+    def rank_providers(self, task: str, criteria: List[str] = ["cost", "speed", "quality"]) -> List[BaseInferenceProvider]:
+        """Ordena los proveedores disponibles (circuito no abierto) de mejor a peor"""
         scored_providers = [
             (provider, self._evaluate_provider(provider, task, criteria))
-            for provider in self.providers.values()
+            for name, provider in self.providers.items()
+            if self.breakers[name].is_available()
         ]
+        scored_providers.sort(key=lambda x: x[1], reverse=True)
         
-        return max(scored_providers, key=lambda x: x[1])[0]
+        return [provider for provider, _ in scored_providers]
     
     def _evaluate_provider(
         self,
@@ -57,20 +439,24 @@ class InferenceProviderManager:
         task: str,
         criteria: List[str]
     ) -> float:
-        """Evalúa un proveedor según criterios"""
-        metrics = provider.get_metrics_summary()
+        """Evalúa un proveedor según criterios (estadísticas recientes, O(1))"""
+        stats = provider.get_routing_stats()
         score = 0.0
         
         if "cost" in criteria:
-            cost_score = 1.0 / (metrics['total_cost'] + 1.0)
+            # Costo por 1K tokens observado o, sin datos, el configurado
+            cost_per_1k = stats['cost_per_1k_tokens']
+            if cost_per_1k is None:
+                cost_per_1k = provider.config.get('cost_per_token', 0.0) * 1000
+            cost_score = 1.0 / (cost_per_1k + 1.0)
             score += cost_score * 0.4
         
         if "speed" in criteria:
-            speed_score = 1.0 / (metrics['avg_latency'] + 1.0)
+            speed_score = 1.0 / ((stats['ewma_latency'] or 0.0) + 1.0)
             score += speed_score * 0.3
         
         if "quality" in criteria:
-            success_rate = metrics['success_rate'] if 'success_rate' in metrics else 0.5
+            success_rate = stats['success_rate'] if stats['success_rate'] is not None else 0.5
             score += success_rate * 0.3
         
         return score 
\ No newline at end of file
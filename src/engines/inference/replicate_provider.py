@@ -1,8 +1,11 @@
 import replicate
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, AsyncIterator
 from datetime import datetime
 import time
 from .base_inference import BaseInferenceProvider, InferenceMetrics
+from src.core.token_counter import get_token_counter
+from src.engines.streaming import StreamTracker, iterate_in_thread
+from src.engines.executor import BoundedExecutor
 
 class ReplicateProvider(BaseInferenceProvider):
     """Proveedor de inferencia usando Replicate"""
@@ -10,10 +13,18 @@ class ReplicateProvider(BaseInferenceProvider):
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
         self.client = replicate.Client(api_token=self.api_key)
+        # Cliente síncrono: las llamadas van a un pool de hilos acotado propio
+        self.executor = BoundedExecutor(self.name, config.get('executor', {}))
         self.default_model = config.get('default_model', 'meta/llama-2-70b-chat')
         self.cost_per_token = config.get('cost_per_token', 0.0002)
     
-    async def generate_text(
+    def _close_client(self):
+        # El cliente síncrono de Replicate tiene su propia conexión HTTP
+        close = getattr(self.client, 'close', None)
+        if close is not None:
+            close()
+    
+    async def _generate_text(
         self,
         prompt: str,
         model: Optional[str] = None,
@@ -25,9 +36,10 @@ class ReplicateProvider(BaseInferenceProvider):
         model = model or self.default_model
         
         try:
-            output = await self.client.run(
+            output = await self.executor.run(
+                self._run_model,
                 model,
-                input={
+                {
                     "prompt": prompt,
                     "max_tokens": max_tokens,
                     "temperature": temperature,
@@ -38,7 +50,8 @@ class ReplicateProvider(BaseInferenceProvider):
             end_time = time.time()
             latency = end_time - start_time
             # Replicate no proporciona conteo de tokens directamente
-            tokens_used = len(prompt.split()) + len(output.split())
+            usage = get_token_counter().count_usage(prompt, output, model)
+            tokens_used = usage['total_tokens']
             cost = tokens_used * self.cost_per_token
             
             self.track_metrics(InferenceMetrics(
@@ -50,9 +63,7 @@ class ReplicateProvider(BaseInferenceProvider):
             
             return {
                 'text': output,
-                'usage': {
-                    'total_tokens': tokens_used
-                },
+                'usage': usage,
                 'model': model,
                 'metrics': {
                     'latency': latency,
@@ -66,6 +77,62 @@ class ReplicateProvider(BaseInferenceProvider):
                 latency=end_time - start_time,
                 tokens_used=0,
                 cost=0,
+                model_name=model,
+                success=False
+            ))
+            raise
+    
+    def _run_model(self, model: str, model_input: Dict[str, Any]) -> str:
+        """Ejecuta el modelo (bloqueante); los modelos de lenguaje devuelven un iterador de fragmentos"""
+        output = self.client.run(model, input=model_input)
+        return output if isinstance(output, str) else ''.join(str(part) for part in output)
+    
+    async def _generate_text_stream(
+        self,
+        prompt: str,
+        model: Optional[str] = None,
+        max_tokens: int = 1000,
+        temperature: float = 0.7,
+        **kwargs
+    ) -> AsyncIterator[Dict[str, Any]]:
+        model = model or self.default_model
+        tracker = StreamTracker(model)
+        
+        try:
+            events = iterate_in_thread(lambda: self.client.stream(
+                model,
+                input={
+                    "prompt": prompt,
+                    "max_tokens": max_tokens,
+                    "temperature": temperature,
+                    **kwargs
+                }
+            ), executor=self.executor)
+            
+            async for event in events:
+                # Solo los eventos de tipo "output" contienen texto
+                text = str(event)
+                if text:
+                    yield tracker.chunk(text)
+            
+            usage = tracker.estimate_usage(prompt)
+            cost = usage['total_tokens'] * self.cost_per_token
+            
+            self.track_metrics(InferenceMetrics(
+                latency=tracker.latency,
+                tokens_used=usage['total_tokens'],
+                cost=cost,
                 model_name=model
             ))
-            raise 
\ No newline at end of file
+            
+            yield tracker.final(usage, cost)
+            
+        except Exception as e:
+            self.track_metrics(InferenceMetrics(
+                latency=tracker.latency,
+                tokens_used=0,
+                cost=0,
+                model_name=model,
+                success=False
+            ))
+            raise
@@ -1,22 +1,22 @@
-from typing import Dict, Any, Optional
-import httpx
+from typing import Dict, Any, Optional, AsyncIterator
 from datetime import datetime
 import time
 from .base_inference import BaseInferenceProvider, InferenceMetrics
+from src.core.token_counter import count_tokens
+from src.engines.http_transport import get_http_transport
+from src.engines.streaming import StreamTracker, iter_sse_data
 
 class SambanovaProvider(BaseInferenceProvider):
     """Proveedor de inferencia usando SambaNova"""
     
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
-        self.base_url = config['base_url']
+        self.base_url = config['base_url'].rstrip('/')
         self.default_model = config.get('default_model', 'sambanova-gpt')
-        self.client = httpx.AsyncClient(
-            base_url=self.base_url,
-            headers={"Authorization": f"Bearer {self.api_key}"}
-        )
+        self.headers = {"Authorization": f"Bearer {self.api_key}"}
+        self.client = get_http_transport().get_client(self.base_url)
     
-    async def generate_text(
+    async def _generate_text(
         self,
         prompt: str,
         model: Optional[str] = None,
@@ -29,14 +29,15 @@ class SambanovaProvider(BaseInferenceProvider):
         
         try:
             response = await self.client.post(
-                "/v1/completions",
+                f"{self.base_url}/v1/completions",
                 json={
                     "model": model,
                     "prompt": prompt,
                     "max_tokens": max_tokens,
                     "temperature": temperature,
                     **kwargs
-                }
+                },
+                headers=self.headers
             )
             response.raise_for_status()
             data = response.json()
@@ -67,11 +68,68 @@ class SambanovaProvider(BaseInferenceProvider):
                 latency=end_time - start_time,
                 tokens_used=0,
                 cost=0,
+                model_name=model,
+                success=False
+            ))
+            raise
+    
+    async def _generate_text_stream(
+        self,
+        prompt: str,
+        model: Optional[str] = None,
+        max_tokens: int = 1000,
+        temperature: float = 0.7,
+        **kwargs
+    ) -> AsyncIterator[Dict[str, Any]]:
+        model = model or self.default_model
+        tracker = StreamTracker(model)
+        
+        try:
+            async with self.client.stream(
+                "POST",
+                f"{self.base_url}/v1/completions",
+                json={
+                    "model": model,
+                    "prompt": prompt,
+                    "max_tokens": max_tokens,
+                    "temperature": temperature,
+                    "stream": True,
+                    **kwargs
+                },
+                headers=self.headers
+            ) as response:
+                response.raise_for_status()
+                async for data in iter_sse_data(response):
+                    if data.get('usage'):
+                        tracker.usage = data['usage']
+                    choices = data.get('choices') or [{}]
+                    text = choices[0].get('text')
+                    if text:
+                        yield tracker.chunk(text)
+            
+            usage = tracker.estimate_usage(prompt)
+            cost = 0.0  # Ajustar según pricing
+            
+            self.track_metrics(InferenceMetrics(
+                latency=tracker.latency,
+                tokens_used=usage['total_tokens'],
+                cost=cost,
                 model_name=model
             ))
+            
+            yield tracker.final(usage, cost)
+            
+        except Exception as e:
+            self.track_metrics(InferenceMetrics(
+                latency=tracker.latency,
+                tokens_used=0,
+                cost=0,
+                model_name=model,
+                success=False
+            ))
             raise
     
-    async def embed_text(
+    async def _embed_text(
         self,
         text: str,
         model: Optional[str] = None,
@@ -82,12 +140,13 @@ class SambanovaProvider(BaseInferenceProvider):
         
         try:
             response = await self.client.post(
-                "/v1/embeddings",
+                f"{self.base_url}/v1/embeddings",
                 json={
                     "model": model,
                     "input": text,
                     **kwargs
-                }
+                },
+                headers=self.headers
             )
             response.raise_for_status()
             data = response.json()
@@ -98,7 +157,7 @@ class SambanovaProvider(BaseInferenceProvider):
             # Registrar métricas
             self.track_metrics(InferenceMetrics(
                 latency=latency,
-                tokens_used=len(text.split()),  # Aproximación
+                tokens_used=count_tokens(text, model),
                 cost=0.0,  # Ajustar según pricing
                 model_name=model
             ))
@@ -117,6 +176,7 @@ class SambanovaProvider(BaseInferenceProvider):
                 latency=end_time - start_time,
                 tokens_used=0,
                 cost=0,
-                model_name=model
+                model_name=model,
+                success=False
             ))
             raise 
\ No newline at end of file
@@ -1,19 +1,27 @@
 import together
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, AsyncIterator
 from datetime import datetime
 import time
 from .base_inference import BaseInferenceProvider, InferenceMetrics
+from src.core.token_counter import count_tokens
+from src.engines.streaming import StreamTracker, iterate_in_thread
+from src.engines.executor import BoundedExecutor
 
 class TogetherProvider(BaseInferenceProvider):
-    """Proveedor de inferencia usando Together AI"""
+    """Proveedor de inferencia usando Together AI
+
+    El SDK de Together solo es síncrono: las llamadas se ejecutan en un pool de
+    hilos acotado propio del proveedor.
+    """
     
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
         together.api_key = self.api_key
+        self.executor = BoundedExecutor(self.name, config.get('executor', {}))
         self.default_model = config.get('default_model', 'togethercomputer/llama-2-70b')
         self.cost_per_token = config.get('cost_per_token', 0.0002)
     
-    async def generate_text(
+    async def _generate_text(
         self,
         prompt: str,
         model: Optional[str] = None,
@@ -25,7 +33,8 @@ class TogetherProvider(BaseInferenceProvider):
         model = model or self.default_model
         
         try:
-            response = await together.Complete.create(
+            response = await self.executor.run(
+                together.Complete.create,
                 prompt=prompt,
                 model=model,
                 max_tokens=max_tokens,
@@ -61,11 +70,58 @@ class TogetherProvider(BaseInferenceProvider):
                 latency=end_time - start_time,
                 tokens_used=0,
                 cost=0,
+                model_name=model,
+                success=False
+            ))
+            raise
+    
+    async def _generate_text_stream(
+        self,
+        prompt: str,
+        model: Optional[str] = None,
+        max_tokens: int = 1000,
+        temperature: float = 0.7,
+        **kwargs
+    ) -> AsyncIterator[Dict[str, Any]]:
+        model = model or self.default_model
+        tracker = StreamTracker(model)
+        
+        try:
+            chunks = iterate_in_thread(lambda: together.Complete.create_streaming(
+                prompt=prompt,
+                model=model,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                **kwargs
+            ), executor=self.executor)
+            
+            async for text in chunks:
+                if text:
+                    yield tracker.chunk(text)
+            
+            usage = tracker.estimate_usage(prompt)
+            cost = usage['total_tokens'] * self.cost_per_token
+            
+            self.track_metrics(InferenceMetrics(
+                latency=tracker.latency,
+                tokens_used=usage['total_tokens'],
+                cost=cost,
                 model_name=model
             ))
+            
+            yield tracker.final(usage, cost)
+            
+        except Exception as e:
+            self.track_metrics(InferenceMetrics(
+                latency=tracker.latency,
+                tokens_used=0,
+                cost=0,
+                model_name=model,
+                success=False
+            ))
             raise
     
-    async def embed_text(
+    async def _embed_text(
         self,
         text: str,
         model: Optional[str] = None,
@@ -75,7 +131,8 @@ class TogetherProvider(BaseInferenceProvider):
         model = model or 'togethercomputer/m2-bert-80M-8k-base'
         
         try:
-            response = await together.Embeddings.create(
+            response = await self.executor.run(
+                together.Embeddings.create,
                 input=text,
                 model=model,
                 **kwargs
@@ -86,7 +143,7 @@ class TogetherProvider(BaseInferenceProvider):
             
             self.track_metrics(InferenceMetrics(
                 latency=latency,
-                tokens_used=len(text.split()),
+                tokens_used=count_tokens(text, model),
                 cost=0.0,
                 model_name=model
             ))
@@ -105,6 +162,7 @@ class TogetherProvider(BaseInferenceProvider):
                 latency=end_time - start_time,
                 tokens_used=0,
                 cost=0,
-                model_name=model
+                model_name=model,
+                success=False
             ))
             raise 
\ No newline at end of file
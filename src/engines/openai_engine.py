@@ -1,15 +1,24 @@
 import openai
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, List, AsyncIterator
 from datetime import datetime
 import time
-from src.core.base_components import BaseComponent, TaskMetrics
+from src.core.base_components import TaskMetrics
+from src.engines.base_engine import BaseAIEngine
+from src.core.cost_budget import get_cost_budget
+from src.engines.http_transport import get_http_transport
+from src.engines.streaming import StreamTracker, iter_chat_chunks
 
-class OpenAIEngine(BaseComponent):
+class OpenAIEngine(BaseAIEngine):
     """Motor de IA basado en OpenAI"""
     
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
-        openai.api_key = config['api_key']
+        self.base_url = config.get('base_url', "https://api.openai.com/v1")
+        self.client = openai.AsyncOpenAI(
+            api_key=config['api_key'],
+            base_url=self.base_url,
+            http_client=get_http_transport().get_client(self.base_url)
+        )
         self.model = config.get('model', 'gpt-4')
         self.default_params = {
             'temperature': config.get('temperature', 0.7),
@@ -19,7 +28,7 @@ class OpenAIEngine(BaseComponent):
             'presence_penalty': config.get('presence_penalty', 0.0)
         }
     
-    async def generate_text(
+    async def _generate_text(
         self,
         prompt: str,
         system_prompt: Optional[str] = None,
@@ -29,22 +38,12 @@ class OpenAIEngine(BaseComponent):
         start_time = time.time()
         
         try:
-            messages = []
-            if system_prompt:
-                messages.append({
-                    "role": "system",
-                    "content": system_prompt
-                })
-            
-            messages.append({
-                "role": "user",
-                "content": prompt
-            })
+            messages = self._build_messages(prompt, system_prompt)
             
             # Combinar parámetros por defecto con los proporcionados
             params = {**self.default_params, **kwargs}
             
-            response = await openai.ChatCompletion.acreate(
+            response = await self.client.chat.completions.create(
                 model=self.model,
                 messages=messages,
                 **params
@@ -53,7 +52,7 @@ class OpenAIEngine(BaseComponent):
             # Calcular métricas
             end_time = time.time()
             latency = end_time - start_time
-            tokens_used = response['usage']['total_tokens']
+            tokens_used = response.usage.total_tokens
             cost = self._calculate_cost(tokens_used)
             
             # Registrar métricas
@@ -66,8 +65,8 @@ class OpenAIEngine(BaseComponent):
             ))
             
             return {
-                'text': response.choices[0].message['content'],
-                'usage': response['usage'],
+                'text': response.choices[0].message.content,
+                'usage': response.usage.model_dump(),
                 'model': self.model,
                 'finish_reason': response.choices[0].finish_reason,
                 'metrics': {
@@ -87,6 +86,51 @@ class OpenAIEngine(BaseComponent):
             ))
             raise
     
+    async def _generate_text_stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        **kwargs
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Genera texto en streaming usando OpenAI"""
+        tracker = StreamTracker(self.model)
+        
+        try:
+            params = {**self.default_params, **kwargs}
+            
+            stream = await self.client.chat.completions.create(
+                model=self.model,
+                messages=self._build_messages(prompt, system_prompt),
+                stream=True,
+                stream_options={"include_usage": True},
+                **params
+            )
+            
+            async for event in iter_chat_chunks(stream, tracker):
+                yield event
+            
+            usage = tracker.estimate_usage(prompt)
+            cost = self._calculate_cost(usage['total_tokens'])
+            
+            self.track_metrics(TaskMetrics(
+                tokens_used=usage['total_tokens'],
+                cost=cost,
+                latency=tracker.latency,
+                success=True,
+                timestamp=datetime.now()
+            ))
+            
+            yield tracker.final(usage, cost)
+            
+        except Exception as e:
+            self.track_metrics(TaskMetrics(
+                success=False,
+                error_message=str(e),
+                latency=tracker.latency,
+                timestamp=datetime.now()
+            ))
+            raise
+    
     async def generate_image(
         self,
         prompt: str,
@@ -99,12 +143,16 @@ class OpenAIEngine(BaseComponent):
         start_time = time.time()
         
         try:
-            response = await openai.Image.acreate(
-                prompt=prompt,
-                size=size,
-                quality=quality,
-                style=style,
-                **kwargs
+            response = await get_cost_budget().run(
+                lambda: self.client.images.generate(
+                    prompt=prompt,
+                    size=size,
+                    quality=quality,
+                    style=style,
+                    **kwargs
+                ),
+                estimated_cost=self._calculate_image_cost(size, quality),
+                cost_of=lambda response: self._calculate_image_cost(size, quality)
             )
             
             # Calcular métricas
@@ -121,7 +169,7 @@ class OpenAIEngine(BaseComponent):
             ))
             
             return {
-                'urls': [img['url'] for img in response['data']],
+                'urls': [img.url for img in response.data],
                 'metrics': {
                     'cost': cost,
                     'latency': latency
@@ -138,6 +186,21 @@ class OpenAIEngine(BaseComponent):
             ))
             raise
     
+    def _build_messages(self, prompt: str, system_prompt: Optional[str] = None) -> List[Dict[str, str]]:
+        """Construye la lista de mensajes del chat"""
+        messages = []
+        if system_prompt:
+            messages.append({
+                "role": "system",
+                "content": system_prompt
+            })
+        
+        messages.append({
+            "role": "user",
+            "content": prompt
+        })
+        return messages
+    
     def _calculate_cost(self, tokens: int) -> float:
         """Calcula el costo basado en el modelo y tokens usados"""
         costs = {
@@ -0,0 +1,110 @@
+import importlib
+import threading
+from importlib import metadata
+from typing import Dict, Union, List, Optional
+from src.core.logging_system import logger
+
+class PluginRegistry:
+    """Registro de clases por tipo con importación diferida
+
+    Cada tipo apunta a ``"modulo:Clase"`` y el módulo (con su SDK) solo se
+    importa la primera vez que se pide esa clase. Paquetes de terceros pueden
+    añadir tipos declarando entry points en ``entry_point_group``, por ejemplo
+    en su pyproject.toml::
+
+        [project.entry-points."money_machine.inference_providers"]
+        mi_proveedor = "mi_paquete.proveedor:MiProveedor"
+    """
+
+    def __init__(self, kind: str, entry_point_group: str, builtins: Optional[Dict[str, str]] = None):
+        self.kind = kind
+        self.entry_point_group = entry_point_group
+        self._targets: Dict[str, Union[str, type]] = dict(builtins or {})
+        self._classes: Dict[str, type] = {}
+        self._entry_points_loaded = False
+        self._lock = threading.Lock()
+
+    def register(self, type_name: str, target: Union[str, type]):
+        """Registra una clase o una ruta ``"modulo:Clase"`` para un tipo"""
+        with self._lock:
+            self._targets[type_name] = target
+            self._classes.pop(type_name, None)
+
+    def _load_entry_points(self):
+        if self._entry_points_loaded:
+            return
+        self._entry_points_loaded = True
+        try:
+            entry_points = metadata.entry_points()
+            if hasattr(entry_points, 'select'):
+                group = entry_points.select(group=self.entry_point_group)
+            else:
+                group = entry_points.get(self.entry_point_group, [])
+        except Exception as e:
+            logger.warning(f"No se pudieron leer los entry points de {self.entry_point_group}: {str(e)}")
+            return
+        for entry_point in group:
+            # Los tipos integrados no se sobrescriben salvo registro explícito
+            self._targets.setdefault(entry_point.name, entry_point.value)
+
+    def get(self, type_name: str) -> type:
+        """Clase registrada para un tipo (la importa si es la primera vez)"""
+        with self._lock:
+            cls = self._classes.get(type_name)
+            if cls is not None:
+                return cls
+            if type_name not in self._targets:
+                self._load_entry_points()
+            target = self._targets.get(type_name)
+
+        if target is None:
+            raise KeyError(f"Tipo de {self.kind} desconocido: {type_name}")
+
+        if isinstance(target, str):
+            module_name, _, class_name = target.partition(':')
+            cls = getattr(importlib.import_module(module_name), class_name)
+        else:
+            cls = target
+
+        with self._lock:
+            return self._classes.setdefault(type_name, cls)
+
+    def is_loaded(self, type_name: str) -> bool:
+        """Indica si la clase de un tipo ya se importó"""
+        return type_name in self._classes
+
+    def available_types(self) -> List[str]:
+        """Tipos conocidos (integrados, registrados y de entry points)"""
+        with self._lock:
+            self._load_entry_points()
+            return sorted(self._targets)
+
+PROVIDER_REGISTRY = PluginRegistry(
+    'proveedor',
+    'money_machine.inference_providers',
+    {
+        'groq': 'src.engines.inference.groq_provider:GroqProvider',
+        'together': 'src.engines.inference.together_provider:TogetherProvider',
+        'anyscale': 'src.engines.inference.anyscale_provider:AnyscaleProvider',
+        'replicate': 'src.engines.inference.replicate_provider:ReplicateProvider',
+        'deepinfra': 'src.engines.inference.deepinfra_provider:DeepInfraProvider',
+        'sambanova': 'src.engines.inference.sambanova_provider:SambanovaProvider'
+    }
+)
+
+ENGINE_REGISTRY = PluginRegistry(
+    'motor',
+    'money_machine.engines',
+    {
+        'openai': 'src.engines.openai_engine:OpenAIEngine',
+        'anthropic': 'src.engines.anthropic_engine:AnthropicEngine'
+    }
+)
+
+def register_provider(type_name: str, target: Union[str, type]):
+    """Registra un tipo de proveedor de inferencia"""
+    PROVIDER_REGISTRY.register(type_name, target)
+
+def register_engine(type_name: str, target: Union[str, type]):
+    """Registra un tipo de motor de IA"""
+    ENGINE_REGISTRY.register(type_name, target)
@@ -0,0 +1,134 @@
+import asyncio
+import json
+import time
+from typing import Dict, Any, Optional, AsyncIterator, Callable, Iterable
+import httpx
+from src.core.token_counter import get_token_counter
+
+class StreamTracker:
+    """Mide time-to-first-token y latencia de una respuesta en streaming"""
+
+    def __init__(self, model: str):
+        self.model = model
+        self.start_time = time.time()
+        self.first_token_time: Optional[float] = None
+        self.parts = []
+        self.usage: Dict[str, Any] = {}
+
+    @property
+    def ttft(self) -> Optional[float]:
+        """Tiempo hasta el primer token en segundos"""
+        if self.first_token_time is None:
+            return None
+        return self.first_token_time - self.start_time
+
+    @property
+    def text(self) -> str:
+        return ''.join(self.parts)
+
+    def chunk(self, text: str) -> Dict[str, Any]:
+        """Registra un fragmento de texto y construye el evento correspondiente"""
+        if text and self.first_token_time is None:
+            self.first_token_time = time.time()
+        self.parts.append(text)
+        return {
+            'text': text,
+            'done': False,
+            'model': self.model
+        }
+
+    @property
+    def latency(self) -> float:
+        return time.time() - self.start_time
+
+    def estimate_usage(self, prompt: str) -> Dict[str, Any]:
+        """Uso reportado por el proveedor o, si no lo hay, el calculado con el tokenizador del modelo"""
+        if self.usage.get('total_tokens'):
+            return self.usage
+        return get_token_counter().count_usage(prompt, self.text, self.model)
+
+    def final(self, usage: Optional[Dict[str, Any]] = None, cost: Optional[float] = None) -> Dict[str, Any]:
+        """Construye el evento final con uso y métricas del stream"""
+        metrics = {
+            'latency': self.latency,
+            'ttft': self.ttft
+        }
+        if cost is not None:
+            metrics['cost'] = cost
+
+        return {
+            'text': '',
+            'done': True,
+            'full_text': self.text,
+            'usage': usage if usage is not None else self.usage,
+            'model': self.model,
+            'metrics': metrics
+        }
+
+def usage_to_dict(usage: Any) -> Dict[str, Any]:
+    """Convierte el objeto de uso de un SDK en diccionario"""
+    if usage is None:
+        return {}
+    if isinstance(usage, dict):
+        return usage
+    if hasattr(usage, 'model_dump'):
+        return usage.model_dump()
+    return dict(vars(usage))
+
+async def iter_chat_chunks(stream: AsyncIterator[Any], tracker: StreamTracker) -> AsyncIterator[Dict[str, Any]]:
+    """Adapta un stream de chat estilo OpenAI (OpenAI, Anyscale, Groq) a eventos de texto"""
+    async for chunk in stream:
+        # OpenAI reporta el uso en el último chunk; Groq lo hace en ``x_groq``
+        usage = getattr(chunk, 'usage', None) or getattr(getattr(chunk, 'x_groq', None), 'usage', None)
+        if usage is not None:
+            tracker.usage = usage_to_dict(usage)
+
+        if chunk.choices:
+            delta = chunk.choices[0].delta.content
+            if delta:
+                yield tracker.chunk(delta)
+
+async def iter_sse_data(response: httpx.Response) -> AsyncIterator[Dict[str, Any]]:
+    """Itera los eventos ``data:`` JSON de una respuesta Server-Sent Events"""
+    async for line in response.aiter_lines():
+        if not line.startswith('data:'):
+            continue
+        payload = line[len('data:'):].strip()
+        if not payload:
+            continue
+        if payload == '[DONE]':
+            break
+        yield json.loads(payload)
+
+_EXHAUSTED = object()
+
+async def iterate_in_thread(
+    factory: Callable[[], Iterable[Any]],
+    executor: Optional[Any] = None
+) -> AsyncIterator[Any]:
+    """Itera un generador bloqueante de un SDK sin bloquear el event loop
+
+    Con ``executor`` (un BoundedExecutor) cada paso usa el pool del proveedor;
+    sin él, el pool por defecto de asyncio.
+    """
+    run = executor.run if executor is not None else asyncio.to_thread
+    iterator = iter(await run(factory))
+    while True:
+        item = await run(next, iterator, _EXHAUSTED)
+        if item is _EXHAUSTED:
+            break
+        yield item
+
+async def collect_stream(stream: AsyncIterator[Dict[str, Any]]) -> Dict[str, Any]:
+    """Consume un stream y devuelve un resultado equivalente a ``generate_text``"""
+    final_event: Dict[str, Any] = {}
+    async for event in stream:
+        if event.get('done'):
+            final_event = event
+
+    return {
+        'text': final_event.get('full_text', ''),
+        'usage': final_event.get('usage', {}),
+        'model': final_event.get('model'),
+        'metrics': final_event.get('metrics', {})
+    }
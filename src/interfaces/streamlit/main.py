@@ -1,11 +1,11 @@
 import streamlit as st
 from src.interfaces.streamlit.main_interface import MainInterface
-from src.utils.initialization import initialize_app
+from src.utils.initialization import get_app_context
 
 def main():
     try:
-        # Inicializar la aplicación
-        app_context = initialize_app()
+        # Contexto compartido entre reruns y sesiones
+        app_context = get_app_context()
         
         if not app_context.get('initialized', False):
             st.error(f"Error al inicializar la aplicación: {app_context.get('error', 'Error desconocido')}")
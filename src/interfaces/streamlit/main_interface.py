@@ -1,9 +1,9 @@
 import streamlit as st
 from typing import Dict, Any
 from dataclasses import dataclass
-from src.core.engine_manager import AIEngineManager
 from src.utils.metrics_manager import MetricsManager
-from src.utils.initialization import initialize_app
+from src.core.cost_budget import get_cost_budget
+from src.utils.initialization import get_app_context
 
 @dataclass
 class UIConfig:
@@ -19,6 +19,7 @@ class MainInterface:
     def __init__(self, app_context: Dict[str, Any]):
         self.app_context = app_context
         self.provider_manager = app_context['provider_manager']
+        self.engine_manager = app_context['engine_manager']
         self.config = app_context['config']
         
         self.ui_config = UIConfig(
@@ -46,9 +47,12 @@ class MainInterface:
         self.apply_custom_styles()
     
     def initialize_session_state(self):
-        """Inicializa el estado de la sesión"""
-        if 'engine_manager' not in st.session_state:
-            st.session_state.engine_manager = AIEngineManager(self.load_engine_config())
+        """Inicializa el estado de la sesión
+
+        Los gestores vienen del contexto compartido del proceso; la sesión solo
+        guarda una referencia, que se actualiza si el contexto se reconstruye.
+        """
+        st.session_state.engine_manager = self.engine_manager
         
         if 'metrics_manager' not in st.session_state:
             st.session_state.metrics_manager = MetricsManager()
@@ -140,16 +144,24 @@ class MainInterface:
         )
         
         # Límites de costos
-        st.number_input(
+        budget = get_cost_budget()
+        daily_cost_limit = st.number_input(
             "Límite de Costo Diario ($)",
             min_value=1.0,
             max_value=1000.0,
-            value=50.0,
+            value=float(budget.daily_limit or 50.0),
             step=1.0
         )
         
+        status = budget.get_status()
+        st.progress(
+            min(1.0, budget.usage_ratio()),
+            text=f"Gastado hoy: ${status['spent']:.2f} (+${status['reserved']:.2f} en curso)"
+        )
+        
         if st.button("Guardar Configuración"):
-            self.save_settings(engines_enabled, fallback_strategy)
+            budget.set_daily_limit(daily_cost_limit)
+            self.save_settings(engines_enabled, fallback_strategy, daily_cost_limit)
             st.success("Configuración guardada exitosamente")
     
     def render_main_content(self, workflow_type: str):
@@ -170,13 +182,12 @@ class MainInterface:
             from src.interfaces.streamlit.pages.pyme_dashboard import render_pyme_dashboard
             render_pyme_dashboard(st.session_state.engine_manager)
     
-    def load_engine_config(self) -> Dict[str, Any]:
-        """Carga la configuración de los motores"""
-        import yaml
-        with open('config/engines.yaml', 'r') as f:
-            return yaml.safe_load(f)
-    
-    def save_settings(self, engines_enabled: Dict[str, bool], fallback_strategy: str):
+    def save_settings(
+        self,
+        engines_enabled: Dict[str, bool],
+        fallback_strategy: str,
+        daily_cost_limit: float
+    ):
         """Guarda la configuración en el archivo"""
         import yaml
         config = {
@@ -184,7 +195,8 @@ class MainInterface:
                 name.lower(): {'enabled': enabled}
                 for name, enabled in engines_enabled.items()
             },
-            'fallback_strategy': fallback_strategy
+            'fallback_strategy': fallback_strategy,
+            'daily_cost_limit': daily_cost_limit
         }
         
         with open('config/settings.yaml', 'w') as f:
@@ -197,7 +209,7 @@ class MainInterface:
         self.render_main_content(workflow_type)
 
 def main():
-    interface = MainInterface()
+    interface = MainInterface(get_app_context())
     interface.run()
 
 if __name__ == "__main__":
@@ -2,7 +2,20 @@ from typing import Dict, Any, List
 from dataclasses import dataclass, field
 from enum import Enum, auto
 import asyncio
+import time
 from src.core.logging_system import logger
+from src.core.metrics_registry import get_metrics_registry
+
+_registry = get_metrics_registry()
+ORCHESTRATOR_AGENT_RUNS = _registry.counter(
+    'orchestrator_agent_runs', 'Ejecuciones de agentes del orquestador', ('agent', 'status')
+)
+ORCHESTRATOR_AGENT_LATENCY = _registry.histogram(
+    'orchestrator_agent_latency_seconds', 'Latencia de los agentes del orquestador', ('agent',)
+)
+ORCHESTRATOR_WORKFLOWS = _registry.counter(
+    'orchestrator_workflows', 'Workflows procesados por el orquestador', ('status',)
+)
 
 class AgentStatus(Enum):
     IDLE = auto()
@@ -36,20 +49,28 @@ class ContentOrchestrator:
     async def process_workflow(self, initial_context: Dict[str, Any]):
         """Procesa el flujo de trabajo a través de múltiples agentes"""
         context = initial_context.copy()
+        status = 'success'
         
         for agent_id in self.workflow_order:
             agent = self.agents[agent_id]
+            start_time = time.time()
             try:
                 agent.status = AgentStatus.PROCESSING
                 logger.info(f"Iniciando ejecución de agente: {agent.name}")
                 context = await agent.execute(context)
                 agent.status = AgentStatus.COMPLETED
+                ORCHESTRATOR_AGENT_RUNS.inc(agent=agent.name, status='success')
                 logger.info(f"Agente completado: {agent.name}")
             except Exception as e:
                 agent.status = AgentStatus.ERROR
+                ORCHESTRATOR_AGENT_RUNS.inc(agent=agent.name, status='error')
                 logger.error(f"Error en agente {agent.name}: {e}")
+                status = 'error'
                 break
+            finally:
+                ORCHESTRATOR_AGENT_LATENCY.observe(time.time() - start_time, agent=agent.name)
         
+        ORCHESTRATOR_WORKFLOWS.inc(status=status)
         return context
     
     def set_workflow_order(self, agent_ids: List[str]):
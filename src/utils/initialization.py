@@ -1,37 +1,29 @@
 import os
-from dotenv import load_dotenv
+import threading
 from pathlib import Path
+from typing import Dict, Any, Optional, List
 import yaml
 from src.engines.inference.provider_manager import InferenceProviderManager
+from src.core.engine_manager import AIEngineManager
+from src.core.config_manager import get_config_manager
+from src.core.checkpoint_store import configure_checkpoint_store
+from src.core.metrics_registry import start_metrics_server
+from src.core.logging_system import logger
+
+_context: Optional[Dict[str, Any]] = None
+_context_lock = threading.Lock()
 
 def load_config():
-    """Carga la configuración inicial"""
-    # Cargar variables de entorno
-    load_dotenv()
-    
-    config = {}
-    
-    # Cargar configuración por defecto
-    default_config_path = Path("config/default_config.yaml")
-    if default_config_path.exists():
-        with open(default_config_path) as f:
-            config = yaml.safe_load(f)
-    
-    # Cargar configuración de proveedores de inferencia
-    inference_config_path = Path("config/inference_providers.yaml")
-    if inference_config_path.exists():
-        with open(inference_config_path) as f:
-            config['inference_providers'] = yaml.safe_load(f)
-    else:
-        # Copiar el archivo de ejemplo si no existe
-        example_path = Path("config/inference_providers.example.yaml")
-        if example_path.exists():
-            import shutil
-            shutil.copy(example_path, inference_config_path)
-            with open(inference_config_path) as f:
-                config['inference_providers'] = yaml.safe_load(f)
-    
-    return config
+    """Carga la configuración inicial (validada y con variables de entorno interpoladas)"""
+    return get_config_manager().load()
+
+def load_engine_config() -> Dict[str, Any]:
+    """Carga la configuración de los motores (vacía si no existe el archivo)"""
+    engines_config_path = Path(get_config_manager().paths['engines'])
+    if engines_config_path.exists():
+        with open(engines_config_path) as f:
+            return yaml.safe_load(f) or {}
+    return {}
 
 def ensure_directories():
     """Asegura que existan los directorios necesarios"""
@@ -39,6 +31,9 @@ def ensure_directories():
         "logs",
         "data/metrics",
         "data/cache",
+        "data/budget",
+        "data/batch",
+        "data/checkpoints",
         "config"
     ]
     
@@ -53,13 +48,22 @@ def initialize_app():
         
         # Cargar configuración
         config = load_config()
+        configure_checkpoint_store(config.get('checkpoints', {}))
         
-        # Inicializar gestor de proveedores
+        # Inicializar gestores de proveedores y motores
         provider_manager = InferenceProviderManager(config.get('inference_providers', {}))
+        # Los tokenizadores pueden descargarse: se cargan en segundo plano para
+        # que la primera petición no bloquee el event loop
+        provider_manager.token_counter.preload_in_background()
+        engine_manager = AIEngineManager(load_engine_config())
+        
+        # Endpoint OpenMetrics local (una vez por proceso)
+        start_metrics_server(config.get('metrics_server', {}))
         
         return {
             'config': config,
             'provider_manager': provider_manager,
+            'engine_manager': engine_manager,
             'initialized': True
         }
         
@@ -68,6 +72,52 @@ def initialize_app():
         return {
             'config': {},
             'provider_manager': None,
+            'engine_manager': None,
             'initialized': False,
             'error': str(e)
-        } 
\ No newline at end of file
+        } 
+
+def _apply_config(config: Dict[str, Any], changed: List[str]):
+    """Aplica una configuración recargada al contexto compartido sin reconstruirlo"""
+    with _context_lock:
+        context = _context
+        if context is None:
+            return
+        context['config'] = config
+        configure_checkpoint_store(config.get('checkpoints', {}))
+        context['provider_manager'].apply_config(config.get('inference_providers', {}))
+        if get_config_manager().paths['engines'] in changed:
+            # Los motores no guardan estado de admisión: basta con sustituir el gestor
+            context['engine_manager'] = AIEngineManager(load_engine_config())
+
+def get_app_context() -> Dict[str, Any]:
+    """Contexto de la aplicación compartido por todo el proceso
+
+    Proveedores, motores, pools y cachés se construyen una sola vez y los
+    reutilizan todos los reruns y sesiones de Streamlit. En cada llamada se
+    comprueba si cambió algún archivo de configuración; los cambios se aplican
+    en caliente sobre el mismo contexto. Un contexto fallido no se guarda para
+    reintentarlo en la siguiente llamada.
+    """
+    global _context
+    manager = get_config_manager()
+    with _context_lock:
+        if _context is None:
+            context = initialize_app()
+            if not context.get('initialized', False):
+                return context
+            _context = context
+            manager.subscribe(_apply_config)
+            return context
+
+    manager.check()
+    return _context
+
+def reset_app_context():
+    """Descarta el contexto compartido (se reconstruye en la próxima llamada)"""
+    global _context
+    with _context_lock:
+        if _context is not None:
+            _context['provider_manager'].shutdown()
+        _context = None
+    get_config_manager().unsubscribe(_apply_config)
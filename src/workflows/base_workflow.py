@@ -1,6 +1,21 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any
-from src.core.engine_manager import AIEngineManager
+from typing import Dict, Any, List
+from src.core.engine_manager import AIEngineManager, TaskEngine
+from src.core.metrics_registry import get_metrics_registry
+from src.core.context_budget import ContextBudgeter
+from src.core.workflow_engine import WorkflowEngine, WorkflowStep
+from src.core.checkpoint_store import get_checkpoint_store, make_run_id
+
+_registry = get_metrics_registry()
+WORKFLOW_STEPS = _registry.counter(
+    'workflow_steps', 'Pasos de workflow completados', ('workflow', 'step', 'status')
+)
+WORKFLOW_TOKENS = _registry.counter(
+    'workflow_tokens', 'Tokens consumidos por workflows', ('workflow', 'step')
+)
+WORKFLOW_COST = _registry.counter(
+    'workflow_cost_dollars', 'Costo de los workflows en dólares', ('workflow', 'step')
+)
 
 class BaseWorkflow(ABC):
     """Clase base para todos los workflows"""
@@ -14,24 +29,78 @@ class BaseWorkflow(ABC):
             'total_cost': 0.0,
             'errors': []
         }
+        self.context_budget = ContextBudgeter(config.get('context_budget', {}), self._summarize)
+        self.run_id = config.get('run_id') or make_run_id(self.__class__.__name__, config)
 
     @abstractmethod
     async def execute(self) -> Dict[str, Any]:
         """Ejecuta el workflow completo"""
         pass
 
+    async def run_steps(self, steps: List[WorkflowStep]) -> Dict[str, Any]:
+        """Ejecuta los pasos como grafo de dependencias (los independientes en paralelo)
+
+        ``config['engine']`` admite ``timeouts`` por paso y ``default_timeout``.
+        La salida de cada paso se guarda al terminar con el ``run_id`` de la
+        ejecución; si una ejecución anterior con el mismo ``run_id`` falló, se
+        reanuda desde los pasos que ya habían terminado. ``config['checkpoint']``
+        a False lo desactiva para este workflow.
+        """
+        engine = WorkflowEngine(self.__class__.__name__, steps, self.config.get('engine', {}))
+        self.metrics['steps'] = engine.step_metrics
+        self.metrics['run_id'] = self.run_id
+
+        store = get_checkpoint_store()
+        if not store.enabled or self.config.get('checkpoint') is False:
+            return await engine.run()
+
+        restored = store.load(self.run_id)
+        results = await engine.run(
+            restored,
+            on_step_complete=lambda step, value: store.save(self.run_id, step, value)
+        )
+        self.metrics['resumed_steps'] = [step for step in engine.order if step in restored]
+        store.delete(self.run_id)
+        return results
+
     def update_metrics(self, step_metrics: Dict[str, Any]):
         """Actualiza las métricas del workflow"""
         self.metrics['steps_completed'] += 1
         self.metrics['total_tokens'] += step_metrics.get('tokens', 0)
         self.metrics['total_cost'] += step_metrics.get('cost', 0.0)
         
+        labels = {
+            'workflow': self.__class__.__name__,
+            'step': step_metrics.get('step_name', 'unknown')
+        }
+        WORKFLOW_STEPS.inc(status='error' if 'error' in step_metrics else 'success', **labels)
+        WORKFLOW_TOKENS.inc(step_metrics.get('tokens', 0) or 0, **labels)
+        WORKFLOW_COST.inc(step_metrics.get('cost', 0.0) or 0.0, **labels)
+        
         if 'error' in step_metrics:
             self.metrics['errors'].append({
                 'step': step_metrics.get('step_name', 'unknown'),
                 'error': str(step_metrics['error'])
             })
 
-    def get_best_engine_for_task(self, task: str) -> str:
-        """Selecciona el mejor motor para una tarea específica"""
-        return self.engine_manager.select_best_engine(task) 
\ No newline at end of file
+    async def fit_context(self, text: Any, consumer: str, target: int) -> str:
+        """Salida de un paso anterior ajustada a ``target`` tokens para ``consumer``"""
+        return await self.context_budget.fit(text, consumer, target)
+
+    async def _summarize(self, prompt: str, max_tokens: int) -> str:
+        """Genera el resumen de contexto con el motor asignado a esa tarea"""
+        engine = self.get_best_engine_for_task('context_digest')
+        response = await engine.generate_text(prompt, max_tokens=max_tokens)
+        metrics = response.get('metrics', {})
+
+        self.update_metrics({
+            'step_name': 'context_digest',
+            'tokens': metrics.get('tokens', 0),
+            'cost': metrics.get('cost', 0.0)
+        })
+
+        return response['text']
+
+    def get_best_engine_for_task(self, task: str) -> TaskEngine:
+        """Motor para una tarea específica (con caché, circuit breaker y fallback del gestor)"""
+        return self.engine_manager.engine_for_task(task) 
\ No newline at end of file
@@ -0,0 +1,305 @@
+import argparse
+import asyncio
+import csv
+import json
+import os
+import time
+from dataclasses import dataclass, asdict
+from typing import Dict, Any, Optional, List, Iterable, Callable, Type, Awaitable
+from src.core.engine_manager import AIEngineManager
+from src.core.checkpoint_store import make_run_id
+from src.core.fan_out import fan_out
+from src.core.metrics_registry import get_metrics_registry
+from src.core.logging_system import logger
+from src.workflows.base_workflow import BaseWorkflow
+from src.workflows.content.content_workflow import ContentWorkflow
+from src.workflows.trading.trading_workflow import TradingWorkflow
+from src.workflows.dropshipping.dropshipping_workflow import DropshippingWorkflow
+from src.workflows.pyme.pyme_workflow import PymeWorkflow
+
+_registry = get_metrics_registry()
+BATCH_ITEMS = _registry.counter(
+    'batch_items', 'Configuraciones procesadas por lotes por resultado', ('workflow', 'status')
+)
+BATCH_PROVIDER_WAITING = _registry.gauge(
+    'batch_provider_waiting', 'Llamadas de lotes esperando cupo del proveedor', ('engine',)
+)
+
+WORKFLOWS: Dict[str, Type[BaseWorkflow]] = {
+    'content': ContentWorkflow,
+    'trading': TradingWorkflow,
+    'dropshipping': DropshippingWorkflow,
+    'pyme': PymeWorkflow
+}
+
+# Columnas de CSV que son listas (valores separados por '|')
+LIST_FIELDS = ('platforms', 'keywords')
+
+@dataclass
+class BatchItemResult:
+    """Resultado de una configuración del lote"""
+    index: int
+    config: Dict[str, Any]
+    status: str
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    latency: float = 0.0
+
+@dataclass
+class BatchProgress:
+    """Avance del lote tras terminar cada configuración"""
+    total: int
+    done: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    skipped: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def remaining(self) -> int:
+        return self.total - self.done - self.skipped
+
+async def _run_limited(name: str, semaphore: asyncio.Semaphore, call: Callable[[], Awaitable[Any]]) -> Any:
+    """Ejecuta ``call`` cuando el semáforo del proveedor tiene plaza"""
+    BATCH_PROVIDER_WAITING.inc(engine=name)
+    try:
+        await semaphore.acquire()
+    finally:
+        BATCH_PROVIDER_WAITING.dec(engine=name)
+    try:
+        return await call()
+    finally:
+        semaphore.release()
+
+class _LimitedEngine:
+    """Motor cuyas llamadas pasan por el semáforo de su proveedor"""
+
+    def __init__(self, engine, name: str, semaphore: asyncio.Semaphore):
+        self._engine = engine
+        self._name = name
+        self._semaphore = semaphore
+
+    async def generate_text(self, prompt: str, *args, **kwargs) -> Dict[str, Any]:
+        return await _run_limited(
+            self._name,
+            self._semaphore,
+            lambda: self._engine.generate_text(prompt, *args, **kwargs)
+        )
+
+    def __getattr__(self, name: str):
+        return getattr(self._engine, name)
+
+class _ProviderLimitedManager:
+    """Vista del gestor de motores que limita las llamadas concurrentes por proveedor
+
+    Los workflows piden motor con ``engine_for_task``; aquí cada llamada a un
+    motor (el elegido o uno de respaldo) espera su semáforo para que todas las
+    configuraciones del lote compartan el límite. La espera queda fuera del
+    circuit breaker del motor, así que hacer cola no cuenta como llamada lenta.
+    """
+
+    def __init__(self, engine_manager: AIEngineManager, limits: Dict[str, int], default_limit: Optional[int]):
+        self._manager = engine_manager
+        self._limits = limits
+        self._default_limit = default_limit
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    def _semaphore(self, name: str) -> Optional[asyncio.Semaphore]:
+        limit = self._limits.get(name, self._default_limit)
+        if not limit:
+            return None
+        if name not in self._semaphores:
+            self._semaphores[name] = asyncio.Semaphore(limit)
+        return self._semaphores[name]
+
+    def _limit(self, name: str, engine):
+        semaphore = self._semaphore(name)
+        return engine if semaphore is None else _LimitedEngine(engine, name, semaphore)
+
+    async def _limit_call(self, name: str, call: Callable[[], Awaitable[Any]]) -> Any:
+        semaphore = self._semaphore(name)
+        if semaphore is None:
+            return await call()
+        return await _run_limited(name, semaphore, call)
+
+    def engine_for_task(self, task: str):
+        return self._manager.engine_for_task(task, wrap_call=self._limit_call)
+
+    def select_best_engine(self, task: str, *args, **kwargs):
+        engine = self._manager.select_best_engine(task, *args, **kwargs)
+        return self._limit(self._manager.engine_name(engine), engine)
+
+    def __getattr__(self, name: str):
+        return getattr(self._manager, name)
+
+class BatchRunner:
+    """Ejecuta un workflow sobre muchas configuraciones a la vez
+
+    Configuración (sección ``batch``): ``concurrency`` (configuraciones en
+    curso a la vez), ``provider_limits`` (motor -> llamadas concurrentes) y
+    ``default_provider_limit`` para los motores sin límite propio.
+
+    Cada configuración termina con su resultado o su error sin afectar a las
+    demás. Con ``output_path`` cada resultado se añade a un JSONL en cuanto
+    termina, así que un corte no pierde lo ya procesado; con ``resume`` se
+    saltan los índices que ya terminaron bien en ese archivo.
+    """
+
+    def __init__(
+        self,
+        engine_manager: AIEngineManager,
+        workflow: str,
+        config: Optional[Dict[str, Any]] = None
+    ):
+        if workflow not in WORKFLOWS:
+            raise ValueError(f"Workflow desconocido: {workflow}")
+        config = config or {}
+        self.workflow = workflow
+        self.workflow_class = WORKFLOWS[workflow]
+        self.concurrency = config.get('concurrency', 8)
+        self.engine_manager = _ProviderLimitedManager(
+            engine_manager,
+            config.get('provider_limits', {}),
+            config.get('default_provider_limit')
+        )
+
+    async def run(
+        self,
+        configs: Iterable[Dict[str, Any]],
+        output_path: Optional[str] = None,
+        resume: bool = False,
+        on_progress: Optional[Callable[[BatchProgress], None]] = None
+    ) -> List[BatchItemResult]:
+        """Ejecuta el lote y devuelve un resultado por configuración (en orden)"""
+        configs = list(configs)
+        completed = read_completed(output_path) if resume and output_path else set()
+        progress = BatchProgress(total=len(configs), skipped=len(completed & set(range(len(configs)))))
+        started = time.monotonic()
+
+        output = None
+        if output_path:
+            os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+            output = open(output_path, 'a' if resume else 'w', encoding='utf-8')
+
+        async def run_item(index: int) -> Optional[BatchItemResult]:
+            if index in completed:
+                return None
+            item = await self._run_item(index, configs[index])
+            if output is not None:
+                output.write(json.dumps(asdict(item), ensure_ascii=False, default=str) + '\n')
+                output.flush()
+            progress.done += 1
+            if item.status == 'success':
+                progress.succeeded += 1
+            else:
+                progress.failed += 1
+            progress.elapsed = time.monotonic() - started
+            if on_progress is not None:
+                on_progress(progress)
+            return item
+
+        try:
+            results = await fan_out(
+                range(len(configs)),
+                run_item,
+                limit=self.concurrency,
+                name=f'batch_{self.workflow}'
+            )
+        finally:
+            if output is not None:
+                output.close()
+
+        return [result.value for result in results if result.value is not None]
+
+    async def _run_item(self, index: int, config: Dict[str, Any]) -> BatchItemResult:
+        start = time.monotonic()
+        # Dos filas iguales no deben compartir checkpoints: el índice entra en el
+        # run_id y lo mantiene estable al reanudar el mismo lote
+        run_id = config.get('run_id') or f"{make_run_id(self.workflow_class.__name__, config)}-{index}"
+        try:
+            workflow = self.workflow_class(self.engine_manager, {**config, 'run_id': run_id})
+            result = await workflow.execute()
+        except Exception as e:
+            logger.warning(f"Lote {self.workflow}: la configuración {index} falló: {str(e)}")
+            BATCH_ITEMS.inc(workflow=self.workflow, status='error')
+            return BatchItemResult(index, config, 'error', error=str(e), latency=time.monotonic() - start)
+
+        BATCH_ITEMS.inc(workflow=self.workflow, status='success')
+        return BatchItemResult(index, config, 'success', result=result, latency=time.monotonic() - start)
+
+def read_completed(path: str) -> set:
+    """Índices que ya terminaron bien en un JSONL de resultados"""
+    completed = set()
+    if not os.path.exists(path):
+        return completed
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # Línea truncada por un corte a mitad de escritura
+                continue
+            if record.get('status') == 'success':
+                completed.add(record['index'])
+    return completed
+
+def load_configs_csv(
+    path: str,
+    defaults: Optional[Dict[str, Any]] = None,
+    list_fields: Iterable[str] = LIST_FIELDS
+) -> List[Dict[str, Any]]:
+    """Una configuración por fila; las celdas vacías toman el valor de ``defaults``"""
+    configs = []
+    with open(path, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            config = dict(defaults or {})
+            for key, value in row.items():
+                if value is None or value.strip() == '':
+                    continue
+                value = value.strip()
+                if key in list_fields:
+                    value = [part.strip() for part in value.split('|') if part.strip()]
+                config[key] = value
+            configs.append(config)
+    return configs
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Ejecuta un workflow sobre un CSV de configuraciones")
+    parser.add_argument('workflow', choices=sorted(WORKFLOWS))
+    parser.add_argument('csv_path')
+    parser.add_argument('--output', help="JSONL de resultados (por defecto data/batch/<workflow>.jsonl)")
+    parser.add_argument('--concurrency', type=int)
+    parser.add_argument('--resume', action='store_true', help="Salta las filas que ya terminaron bien")
+    args = parser.parse_args(argv)
+
+    # Importación diferida: la inicialización carga proveedores y configuración
+    from src.utils.initialization import get_app_context
+
+    context = get_app_context()
+    if not context.get('initialized', False):
+        logger.error(f"Error al inicializar la aplicación: {context.get('error', 'Error desconocido')}")
+        return 2
+    batch_config = dict(context['config'].get('batch', {}))
+    if args.concurrency:
+        batch_config['concurrency'] = args.concurrency
+    output = args.output or os.path.join(batch_config.get('output_dir', 'data/batch'), f'{args.workflow}.jsonl')
+
+    def report(progress: BatchProgress):
+        logger.info(
+            f"Lote {args.workflow}: {progress.done}/{progress.total - progress.skipped} "
+            f"({progress.failed} errores, {progress.elapsed:.1f}s)"
+        )
+
+    runner = BatchRunner(context['engine_manager'], args.workflow, batch_config)
+    results = asyncio.run(runner.run(
+        load_configs_csv(args.csv_path, batch_config.get('defaults', {}).get(args.workflow)),
+        output_path=output,
+        resume=args.resume,
+        on_progress=report
+    ))
+    failed = sum(1 for result in results if result.status != 'success')
+    logger.info(f"Lote {args.workflow} terminado: {len(results) - failed} correctos, {failed} errores -> {output}")
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
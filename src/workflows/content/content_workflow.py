@@ -1,22 +1,87 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Callable
 from src.workflows.base_workflow import BaseWorkflow
+from src.core.fan_out import FanOutResult, fan_out, raise_if_all_failed
+from src.core.pipeline import AsyncPipeline, PipelineStage
+from src.core.workflow_engine import WorkflowStep
+from src.core.prompt_templates import get_prompt_registry
+
+_prompts = get_prompt_registry()
+
+PLAN_PROMPT = _prompts.register('content.plan', """
+    Crea un plan de contenido para el tema indicado.
+
+    El plan debe incluir:
+    1. Puntos clave a cubrir
+    2. Estructura sugerida
+    3. Referencias o datos relevantes
+
+    Tema: {topic}
+    Tono deseado: {tone}
+    Plataformas objetivo: {platforms}
+""")
+
+GENERATION_PROMPT = _prompts.register('content.generation', """
+    Genera contenido a partir del plan de contenido indicado.
+    La longitud debe poder adaptarse a múltiples plataformas.
+
+    Tema: {topic}
+    Tono: {tone}
+
+    Plan de contenido:
+    {content_plan}
+""")
+
+ADAPTATION_PROMPT = _prompts.register('content.adaptation', """
+    Adapta el contenido indicado a la plataforma de destino.
+
+    Considera:
+    - Límites de caracteres de la plataforma
+    - Formato y estilo típico
+    - Hashtags relevantes
+
+    Plataforma: {platform}
+
+    Contenido:
+    {content}
+""")
+
+VALIDATION_PROMPT = _prompts.register('content.validation', """
+    Valida el contenido indicado para la plataforma de destino.
+
+    Verifica:
+    1. Gramática y ortografía
+    2. Tono apropiado
+    3. Longitud adecuada
+    4. Cumplimiento de políticas de la plataforma
+
+    Retorna el contenido corregido si es necesario.
+
+    Plataforma: {platform}
+
+    Contenido:
+    {content}
+""")
 
 class ContentWorkflow(BaseWorkflow):
     """Workflow para generación y publicación de contenido"""
     
     async def execute(self) -> Dict[str, Any]:
         try:
-            # 1. Planificación de contenido
-            content_plan = await self._plan_content()
-            
-            # 2. Generación de contenido
-            content = await self._generate_content(content_plan)
-            
-            # 3. Adaptación por plataforma
-            platform_content = await self._adapt_for_platforms(content)
-            
-            # 4. Validación de calidad
-            validated_content = await self._validate_content(platform_content)
+            # Plan -> contenido base -> adaptación y validación por plataforma
+            steps = [
+                WorkflowStep('content_plan', self._plan_content),
+                WorkflowStep('content', self._generate_content, ('content_plan',))
+            ]
+            if self.config.get('streaming', True):
+                # Cada plataforma pasa a validación en cuanto termina su adaptación
+                steps.append(WorkflowStep('validated_content', self._adapt_and_validate, ('content',)))
+            else:
+                steps += [
+                    WorkflowStep('platform_content', self._adapt_for_platforms, ('content',)),
+                    WorkflowStep('validated_content', self._validate_content, ('platform_content',))
+                ]
+            
+            validated_content = (await self.run_steps(steps))['validated_content']
             
             return {
                 'content': validated_content,
@@ -34,108 +99,148 @@ class ContentWorkflow(BaseWorkflow):
         """Genera un plan de contenido basado en el tema"""
         engine = self.get_best_engine_for_task('content_planning')
         
-        prompt = f"""
-        Crea un plan de contenido para el tema: {self.config['topic']}
-        Tono deseado: {self.config['tone']}
-        Plataformas objetivo: {', '.join(self.config['platforms'])}
-        
-        El plan debe incluir:
-        1. Puntos clave a cubrir
-        2. Estructura sugerida
-        3. Referencias o datos relevantes
-        """
+        prompt = PLAN_PROMPT.render(
+            topic=self.config['topic'],
+            tone=self.config['tone'],
+            platforms=', '.join(self.config['platforms'])
+        )
         
         response = await engine.generate_text(prompt)
         
         self.update_metrics({
             'step_name': 'content_planning',
-            'tokens': response.get('usage', {}).get('total_tokens', 0),
-            'cost': response.get('cost', 0.0)
+            'tokens': response.get('metrics', {}).get('tokens', 0),
+            'cost': response.get('metrics', {}).get('cost', 0.0)
         })
         
-        return response['content']
+        return response['text']
 
     async def _generate_content(self, content_plan: Dict[str, Any]) -> str:
         """Genera el contenido base"""
         engine = self.get_best_engine_for_task('content_generation')
         
-        prompt = f"""
-        Basado en el siguiente plan de contenido:
-        {content_plan}
-        
-        Genera contenido con estas características:
-        - Tema: {self.config['topic']}
-        - Tono: {self.config['tone']}
-        - Longitud: Adaptada para múltiples plataformas
-        """
+        prompt = GENERATION_PROMPT.render(
+            topic=self.config['topic'],
+            tone=self.config['tone'],
+            content_plan=content_plan
+        )
         
         response = await engine.generate_text(prompt)
         
         self.update_metrics({
             'step_name': 'content_generation',
-            'tokens': response.get('usage', {}).get('total_tokens', 0),
-            'cost': response.get('cost', 0.0)
+            'tokens': response.get('metrics', {}).get('tokens', 0),
+            'cost': response.get('metrics', {}).get('cost', 0.0)
         })
         
-        return response['content']
+        return response['text']
 
     async def _adapt_for_platforms(self, content: str) -> Dict[str, str]:
-        """Adapta el contenido para cada plataforma"""
-        adapted_content = {}
+        """Adapta el contenido para cada plataforma (en paralelo)"""
+        results = await fan_out(
+            self.config['platforms'],
+            lambda platform: self._adapt_platform(platform, content),
+            limit=self.config.get('platform_concurrency', 4),
+            name='content_adaptation'
+        )
+        for result in results:
+            self._platform_latency(result.item)['content_adaptation'] = result.latency
+        return self._collect_platform_results(results, 'content_adaptation')
+
+    async def _adapt_and_validate(self, content: str) -> Dict[str, Any]:
+        """Adapta y valida cada plataforma como un pipeline por elemento
+
+        Entre adaptación y validación hay una cola acotada, así que una
+        plataforma lenta no retrasa la validación de las demás.
+        """
+        concurrency = self.config.get('platform_concurrency', 4)
+
+        async def adapt(platform: str):
+            return platform, await self._adapt_platform(platform, content)
+
+        pipeline = AsyncPipeline([
+            PipelineStage(
+                'content_adaptation',
+                adapt,
+                workers=concurrency
+            ),
+            PipelineStage(
+                'content_validation',
+                lambda entry: self._validate_platform(*entry),
+                workers=concurrency
+            )
+        ], queue_size=self.config.get('pipeline_queue_size', concurrency), name='content')
+
+        results = await pipeline.run(self.config['platforms'])
+        for result in results:
+            self._platform_latency(result.item).update(result.stage_latencies, total=result.latency)
+        return self._collect_platform_results(results, 'content_pipeline')
+
+    async def _adapt_platform(self, platform: str, content: str) -> str:
+        """Adapta el contenido a una plataforma"""
+        engine = self.get_best_engine_for_task('content_adaptation')
         
-        for platform in self.config['platforms']:
-            engine = self.get_best_engine_for_task('content_adaptation')
-            
-            prompt = f"""
-            Adapta el siguiente contenido para {platform}:
-            {content}
-            
-            Considera:
-            - Límites de caracteres de la plataforma
-            - Formato y estilo típico
-            - Hashtags relevantes
-            """
-            
-            response = await engine.generate_text(prompt)
-            
-            self.update_metrics({
-                'step_name': f'content_adaptation_{platform.lower()}',
-                'tokens': response.get('usage', {}).get('total_tokens', 0),
-                'cost': response.get('cost', 0.0)
-            })
-            
-            adapted_content[platform] = response['content']
+        prompt = ADAPTATION_PROMPT.render(platform=platform, content=content)
+        
+        response = await engine.generate_text(prompt)
         
-        return adapted_content
+        self.update_metrics({
+            'step_name': f'content_adaptation_{platform.lower()}',
+            'tokens': response.get('metrics', {}).get('tokens', 0),
+            'cost': response.get('metrics', {}).get('cost', 0.0)
+        })
+        
+        return response['text']
 
     async def _validate_content(self, platform_content: Dict[str, str]) -> Dict[str, Any]:
-        """Valida la calidad del contenido generado"""
-        validated_content = {}
+        """Valida la calidad del contenido generado (en paralelo por plataforma)"""
+        results = await fan_out(
+            list(platform_content.items()),
+            lambda entry: self._validate_platform(*entry),
+            limit=self.config.get('platform_concurrency', 4),
+            name='content_validation'
+        )
+        for result in results:
+            self._platform_latency(result.item[0])['content_validation'] = result.latency
+        return self._collect_platform_results(results, 'content_validation', key=lambda entry: entry[0])
+
+    async def _validate_platform(self, platform: str, content: str) -> str:
+        """Valida el contenido de una plataforma"""
+        engine = self.get_best_engine_for_task('content_validation')
         
-        for platform, content in platform_content.items():
-            engine = self.get_best_engine_for_task('content_validation')
-            
-            prompt = f"""
-            Valida el siguiente contenido para {platform}:
-            {content}
-            
-            Verifica:
-            1. Gramática y ortografía
-            2. Tono apropiado
-            3. Longitud adecuada
-            4. Cumplimiento de políticas de la plataforma
-            
-            Retorna el contenido corregido si es necesario.
-            """
-            
-            response = await engine.generate_text(prompt)
-            
-            self.update_metrics({
-                'step_name': f'content_validation_{platform.lower()}',
-                'tokens': response.get('usage', {}).get('total_tokens', 0),
-                'cost': response.get('cost', 0.0)
-            })
-            
-            validated_content[platform] = response['content']
+        prompt = VALIDATION_PROMPT.render(platform=platform, content=content)
         
-        return validated_content 
\ No newline at end of file
+        response = await engine.generate_text(prompt)
+        
+        self.update_metrics({
+            'step_name': f'content_validation_{platform.lower()}',
+            'tokens': response.get('metrics', {}).get('tokens', 0),
+            'cost': response.get('metrics', {}).get('cost', 0.0)
+        })
+        
+        return response['text']
+
+    def _collect_platform_results(
+        self,
+        results: List[FanOutResult],
+        step_name: str,
+        key: Callable[[Any], str] = lambda platform: platform
+    ) -> Dict[str, Any]:
+        """Resultados por plataforma en orden; los fallos se registran y se omiten"""
+        raise_if_all_failed(results)
+        collected = {}
+        for result in results:
+            platform = key(result.item)
+            if result.ok:
+                collected[platform] = result.value
+            else:
+                # En el pipeline el error indica la etapa en la que falló
+                self.update_metrics({
+                    'step_name': f"{getattr(result, 'stage', None) or step_name}_{platform.lower()}",
+                    'error': result.error
+                })
+        return collected
+
+    def _platform_latency(self, platform: str) -> Dict[str, float]:
+        """Latencias por etapa de una plataforma en ``metrics['platform_latency']``"""
+        return self.metrics.setdefault('platform_latency', {}).setdefault(platform, {})
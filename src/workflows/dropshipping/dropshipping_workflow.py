@@ -1,38 +1,182 @@
 from typing import Dict, Any, List
 from src.workflows.base_workflow import BaseWorkflow
+from src.core.workflow_engine import WorkflowStep
+from src.core.prompt_templates import get_prompt_registry
+
+_prompts = get_prompt_registry()
+
+PRODUCTS_PROMPT = _prompts.register('dropshipping.products', """
+    Analiza productos potenciales para dropshipping en la categoría indicada considerando:
+
+    1. Criterios de Selección:
+       - Potencial de mercado
+       - Margen de beneficio
+       - Facilidad de envío
+       - Tasa de devolución esperada
+
+    2. Análisis de Producto:
+       - Características principales
+       - Público objetivo
+       - Diferenciadores
+       - Tendencias de demanda
+
+    3. Logística:
+       - Requisitos de almacenamiento
+       - Complejidad de envío
+       - Costos de envío estimados
+
+    Categoría: {category}
+    Presupuesto: {budget}
+    Mercado objetivo: {target_market}
+""")
+
+SUPPLIERS_PROMPT = _prompts.register('dropshipping.suppliers', """
+    Analiza proveedores potenciales para los productos del análisis indicado considerando:
+
+    1. Criterios de Evaluación:
+       - Reputación y confiabilidad
+       - Calidad de productos
+       - Tiempos de envío
+       - Políticas de devolución
+
+    2. Análisis Comparativo:
+       - Precios y márgenes
+       - Términos y condiciones
+       - Soporte y comunicación
+       - Capacidad de procesamiento
+
+    3. Logística:
+       - Ubicación de almacenes
+       - Métodos de envío
+       - Cobertura geográfica
+
+    Mercado objetivo: {target_market}
+
+    Análisis de productos:
+    {product_analysis}
+""")
+
+MARKET_PROMPT = _prompts.register('dropshipping.market', """
+    Realiza un análisis de mercado detallado para los productos del análisis indicado:
+
+    1. Análisis de Competencia:
+       - Competidores principales
+       - Estrategias de precios
+       - Propuestas de valor
+       - Fortalezas y debilidades
+
+    2. Análisis de Mercado:
+       - Tamaño del mercado
+       - Tendencias actuales
+       - Segmentos de clientes
+       - Barreras de entrada
+
+    3. Oportunidades y Amenazas:
+       - Nichos sin explotar
+       - Tendencias emergentes
+       - Riesgos potenciales
+       - Factores estacionales
+
+    Mercado objetivo: {target_market}
+
+    Análisis de productos:
+    {product_analysis}
+""")
+
+PRICING_PROMPT = _prompts.register('dropshipping.pricing', """
+    Desarrolla una estrategia de precios a partir de los análisis indicados considerando:
+
+    1. Estructura de Precios:
+       - Costos del producto
+       - Costos de envío
+       - Margen deseado
+       - Precios competitivos
+
+    2. Estrategias de Pricing:
+       - Precios de entrada
+       - Descuentos y promociones
+       - Precios por volumen
+       - Estrategias estacionales
+
+    3. Optimización de Márgenes:
+       - Análisis de punto de equilibrio
+       - Elasticidad de precios
+       - Estrategias de upselling
+       - Bundles y paquetes
+
+    Margen mínimo deseado: {min_margin}
+
+    Análisis de Productos:
+    {product_analysis}
+
+    Análisis de Mercado:
+    {market_analysis}
+""")
+
+MARKETING_PROMPT = _prompts.register('dropshipping.marketing', """
+    Desarrolla un plan de marketing completo a partir de los análisis indicados:
+
+    1. Estrategia Digital:
+       - Canales principales
+       - Contenido y mensajes clave
+       - Calendario de publicaciones
+       - Presupuesto por canal
+
+    2. Adquisición de Clientes:
+       - Estrategias de SEO
+       - Campañas de PPC
+       - Social media marketing
+       - Email marketing
+
+    3. Retención y Fidelización:
+       - Programa de lealtad
+       - Email marketing
+       - Servicio al cliente
+       - Estrategia de reviews
+
+    4. Métricas y KPIs:
+       - Objetivos por canal
+       - Métricas de seguimiento
+       - ROI esperado
+       - Plan de optimización
+
+    Presupuesto de marketing: {marketing_budget}€
+
+    Análisis de Productos:
+    {product_analysis}
+
+    Análisis de Mercado:
+    {market_analysis}
+""")
 
 class DropshippingWorkflow(BaseWorkflow):
     """Workflow para análisis y gestión de dropshipping"""
     
     async def execute(self) -> Dict[str, Any]:
         try:
-            # 1. Análisis de productos
-            product_analysis = await self._analyze_products()
-            
-            # 2. Análisis de proveedores
-            supplier_analysis = await self._analyze_suppliers(product_analysis)
-            
-            # 3. Análisis de mercado y competencia
-            market_analysis = await self._analyze_market(product_analysis)
-            
-            # 4. Estrategia de precios
-            pricing_strategy = await self._develop_pricing_strategy(
-                product_analysis,
-                market_analysis
-            )
-            
-            # 5. Plan de marketing
-            marketing_plan = await self._create_marketing_plan(
-                product_analysis,
-                market_analysis
-            )
-            
+            # Productos -> (proveedores || mercado) -> (precios || marketing)
+            results = await self.run_steps([
+                WorkflowStep('product_analysis', self._analyze_products),
+                WorkflowStep('supplier_analysis', self._analyze_suppliers, ('product_analysis',)),
+                WorkflowStep('market_analysis', self._analyze_market, ('product_analysis',)),
+                WorkflowStep(
+                    'pricing_strategy',
+                    self._develop_pricing_strategy,
+                    ('product_analysis', 'market_analysis')
+                ),
+                WorkflowStep(
+                    'marketing_plan',
+                    self._create_marketing_plan,
+                    ('product_analysis', 'market_analysis')
+                )
+            ])
+
             return {
-                'product_analysis': product_analysis,
-                'supplier_analysis': supplier_analysis,
-                'market_analysis': market_analysis,
-                'pricing_strategy': pricing_strategy,
-                'marketing_plan': marketing_plan,
+                'product_analysis': results['product_analysis'],
+                'supplier_analysis': results['supplier_analysis'],
+                'market_analysis': results['market_analysis'],
+                'pricing_strategy': results['pricing_strategy'],
+                'marketing_plan': results['marketing_plan'],
                 'metrics': self.metrics
             }
             
@@ -47,120 +191,59 @@ class DropshippingWorkflow(BaseWorkflow):
         """Analiza y selecciona productos potenciales"""
         engine = self.get_best_engine_for_task('product_analysis')
         
-        prompt = f"""
-        Analiza productos potenciales para dropshipping en la categoría {self.config['category']} considerando:
-        
-        1. Criterios de Selección:
-           - Potencial de mercado
-           - Margen de beneficio
-           - Facilidad de envío
-           - Tasa de devolución esperada
-        
-        2. Análisis de Producto:
-           - Características principales
-           - Público objetivo
-           - Diferenciadores
-           - Tendencias de demanda
-        
-        3. Logística:
-           - Requisitos de almacenamiento
-           - Complejidad de envío
-           - Costos de envío estimados
-        
-        Presupuesto: {self.config['budget']}
-        Mercado objetivo: {self.config['target_market']}
-        """
+        prompt = PRODUCTS_PROMPT.render(
+            category=self.config['category'],
+            budget=self.config['budget'],
+            target_market=self.config['target_market']
+        )
         
         response = await engine.generate_text(prompt)
         
         self.update_metrics({
             'step_name': 'product_analysis',
-            'tokens': response.get('usage', {}).get('total_tokens', 0),
-            'cost': response.get('cost', 0.0)
+            'tokens': response.get('metrics', {}).get('tokens', 0),
+            'cost': response.get('metrics', {}).get('cost', 0.0)
         })
         
-        return response['content']
+        return response['text']
 
     async def _analyze_suppliers(self, product_analysis: Dict[str, Any]) -> Dict[str, Any]:
         """Analiza y evalúa proveedores potenciales"""
         engine = self.get_best_engine_for_task('supplier_analysis')
         
-        prompt = f"""
-        Basado en el análisis de productos:
-        {product_analysis}
-        
-        Analiza proveedores potenciales considerando:
-        
-        1. Criterios de Evaluación:
-           - Reputación y confiabilidad
-           - Calidad de productos
-           - Tiempos de envío
-           - Políticas de devolución
-        
-        2. Análisis Comparativo:
-           - Precios y márgenes
-           - Términos y condiciones
-           - Soporte y comunicación
-           - Capacidad de procesamiento
-        
-        3. Logística:
-           - Ubicación de almacenes
-           - Métodos de envío
-           - Cobertura geográfica
-        
-        Mercado objetivo: {self.config['target_market']}
-        """
+        prompt = SUPPLIERS_PROMPT.render(
+            target_market=self.config['target_market'],
+            product_analysis=await self.fit_context(product_analysis, 'dropshipping.suppliers', 600)
+        )
         
         response = await engine.generate_text(prompt)
         
         self.update_metrics({
             'step_name': 'supplier_analysis',
-            'tokens': response.get('usage', {}).get('total_tokens', 0),
-            'cost': response.get('cost', 0.0)
+            'tokens': response.get('metrics', {}).get('tokens', 0),
+            'cost': response.get('metrics', {}).get('cost', 0.0)
         })
         
-        return response['content']
+        return response['text']
 
     async def _analyze_market(self, product_analysis: Dict[str, Any]) -> Dict[str, Any]:
         """Analiza el mercado y la competencia"""
         engine = self.get_best_engine_for_task('market_analysis')
         
-        prompt = f"""
-        Basado en el análisis de productos:
-        {product_analysis}
-        
-        Realiza un análisis de mercado detallado:
-        
-        1. Análisis de Competencia:
-           - Competidores principales
-           - Estrategias de precios
-           - Propuestas de valor
-           - Fortalezas y debilidades
-        
-        2. Análisis de Mercado:
-           - Tamaño del mercado
-           - Tendencias actuales
-           - Segmentos de clientes
-           - Barreras de entrada
-        
-        3. Oportunidades y Amenazas:
-           - Nichos sin explotar
-           - Tendencias emergentes
-           - Riesgos potenciales
-           - Factores estacionales
-        
-        Mercado objetivo: {self.config['target_market']}
-        """
+        prompt = MARKET_PROMPT.render(
+            target_market=self.config['target_market'],
+            product_analysis=product_analysis
+        )
         
         response = await engine.generate_text(prompt)
         
         self.update_metrics({
             'step_name': 'market_analysis',
-            'tokens': response.get('usage', {}).get('total_tokens', 0),
-            'cost': response.get('cost', 0.0)
+            'tokens': response.get('metrics', {}).get('tokens', 0),
+            'cost': response.get('metrics', {}).get('cost', 0.0)
         })
         
-        return response['content']
+        return response['text']
 
     async def _develop_pricing_strategy(
         self,
@@ -170,43 +253,21 @@ class DropshippingWorkflow(BaseWorkflow):
         """Desarrolla una estrategia de precios"""
         engine = self.get_best_engine_for_task('pricing_strategy')
         
-        prompt = f"""
-        Basado en:
-        Análisis de Productos: {product_analysis}
-        Análisis de Mercado: {market_analysis}
-        
-        Desarrolla una estrategia de precios considerando:
-        
-        1. Estructura de Precios:
-           - Costos del producto
-           - Costos de envío
-           - Margen deseado
-           - Precios competitivos
-        
-        2. Estrategias de Pricing:
-           - Precios de entrada
-           - Descuentos y promociones
-           - Precios por volumen
-           - Estrategias estacionales
-        
-        3. Optimización de Márgenes:
-           - Análisis de punto de equilibrio
-           - Elasticidad de precios
-           - Estrategias de upselling
-           - Bundles y paquetes
-        
-        Margen mínimo deseado: {self.config.get('min_margin', '30%')}
-        """
+        prompt = PRICING_PROMPT.render(
+            min_margin=self.config.get('min_margin', '30%'),
+            product_analysis=await self.fit_context(product_analysis, 'dropshipping.pricing', 500),
+            market_analysis=await self.fit_context(market_analysis, 'dropshipping.pricing', 700)
+        )
         
         response = await engine.generate_text(prompt)
         
         self.update_metrics({
             'step_name': 'pricing_strategy',
-            'tokens': response.get('usage', {}).get('total_tokens', 0),
-            'cost': response.get('cost', 0.0)
+            'tokens': response.get('metrics', {}).get('tokens', 0),
+            'cost': response.get('metrics', {}).get('cost', 0.0)
         })
         
-        return response['content']
+        return response['text']
 
     async def _create_marketing_plan(
         self,
@@ -216,46 +277,18 @@ class DropshippingWorkflow(BaseWorkflow):
         """Desarrolla un plan de marketing"""
         engine = self.get_best_engine_for_task('marketing_planning')
         
-        prompt = f"""
-        Basado en:
-        Análisis de Productos: {product_analysis}
-        Análisis de Mercado: {market_analysis}
-        
-        Desarrolla un plan de marketing completo:
-        
-        1. Estrategia Digital:
-           - Canales principales
-           - Contenido y mensajes clave
-           - Calendario de publicaciones
-           - Presupuesto por canal
-        
-        2. Adquisición de Clientes:
-           - Estrategias de SEO
-           - Campañas de PPC
-           - Social media marketing
-           - Email marketing
-        
-        3. Retención y Fidelización:
-           - Programa de lealtad
-           - Email marketing
-           - Servicio al cliente
-           - Estrategia de reviews
-        
-        4. Métricas y KPIs:
-           - Objetivos por canal
-           - Métricas de seguimiento
-           - ROI esperado
-           - Plan de optimización
-        
-        Presupuesto de marketing: {self.config.get('marketing_budget', '1000')}€
-        """
+        prompt = MARKETING_PROMPT.render(
+            marketing_budget=self.config.get('marketing_budget', '1000'),
+            product_analysis=await self.fit_context(product_analysis, 'dropshipping.marketing', 500),
+            market_analysis=await self.fit_context(market_analysis, 'dropshipping.marketing', 700)
+        )
         
         response = await engine.generate_text(prompt)
         
         self.update_metrics({
             'step_name': 'marketing_planning',
-            'tokens': response.get('usage', {}).get('total_tokens', 0),
-            'cost': response.get('cost', 0.0)
+            'tokens': response.get('metrics', {}).get('tokens', 0),
+            'cost': response.get('metrics', {}).get('cost', 0.0)
         })
         
-        return response['content'] 
\ No newline at end of file
+        return response['text'] 
\ No newline at end of file
@@ -0,0 +1,68 @@
+import asyncio
+import unittest
+from src.agents.base.base_agent import BaseAgent
+from src.core.context_budget import clear_digest_cache
+from src.core.cost_budget import get_cost_budget
+from src.core.engine_manager import AIEngineManager, AllEnginesFailedError
+from src.engines.base_engine import BaseAIEngine
+from src.engines.registry import register_engine
+
+class DigestEngine(BaseAIEngine):
+    """Motor de prueba con el formato de respuesta de los motores reales"""
+
+    def __init__(self, config):
+        super().__init__(config)
+        self.calls = 0
+
+    async def _generate_text(self, prompt, system_prompt=None, **kwargs):
+        self.calls += 1
+        if self.config.get('fail'):
+            raise RuntimeError("motor caído")
+        return {'text': 'resumen corto', 'metrics': {'tokens': 4, 'cost': 0.01}}
+
+    async def _generate_text_stream(self, prompt, system_prompt=None, **kwargs):
+        yield {'text': prompt, 'done': True}
+
+register_engine('digest', DigestEngine)
+
+class DigestAgent(BaseAgent):
+    async def execute(self, context):
+        return {'digest': await self._fit_context(context['text'], 'digest', 20)}
+
+class TestBaseAgent(unittest.TestCase):
+    def setUp(self) -> None:
+        clear_digest_cache()
+        # El presupuesto compartido no debe escribir su estado en disco
+        self.budget = get_cost_budget()
+        self.state_file, self.budget.state_file = self.budget.state_file, None
+
+    def tearDown(self) -> None:
+        self.budget.state_file = self.state_file
+        clear_digest_cache()
+
+    def _agent(self, **engine_config):
+        manager = AIEngineManager({
+            'cache': {'enabled': False},
+            'engines': {'digest': {'type': 'digest', **engine_config}}
+        })
+        return DigestAgent(manager, {'retry': {'base_delay': 0, 'max_delay': 0}}), manager.engines['digest']
+
+    def test_digest_goes_through_real_manager(self):
+        agent, engine = self._agent()
+        result = asyncio.run(agent.execute({'text': 'palabra ' * 200}))
+
+        self.assertEqual(result['digest'], 'resumen corto')
+        self.assertEqual(agent.context_budget.stats['fallbacks'], 0)
+        self.assertEqual(engine.calls, 1)
+        summary = agent.get_metrics_summary()
+        self.assertEqual(summary['total_tokens'], 4)
+        self.assertAlmostEqual(summary['total_cost'], 0.01)
+
+    def test_failed_engines_are_retried_then_raised(self):
+        agent, engine = self._agent(fail=True)
+        with self.assertRaises(AllEnginesFailedError):
+            asyncio.run(agent._execute_with_retry('resumen', 'hola', max_retries=2))
+        self.assertEqual(engine.calls, 2)
+
+if __name__ == '__main__':
+    unittest.main()
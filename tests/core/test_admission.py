@@ -0,0 +1,101 @@
+import asyncio
+import unittest
+from src.core.admission import (
+    AdmissionController,
+    AdmissionRejectedError,
+    AIMDLimiter,
+    TokenBucket
+)
+
+class OverloadError(Exception):
+    status_code = 429
+
+class TestTokenBucket(unittest.TestCase):
+    def test_reserve_waits_for_refill(self):
+        bucket = TokenBucket(per_minute=60)
+        self.assertEqual(bucket.reserve(60), 0.0)
+        self.assertAlmostEqual(bucket.reserve(1), 1.0, places=2)
+
+    def test_reserve_rejects_beyond_max_wait(self):
+        bucket = TokenBucket(per_minute=60)
+        bucket.reserve(60)
+        self.assertIsNone(bucket.reserve(10, max_wait=1.0))
+
+class TestAIMDLimiter(unittest.TestCase):
+    def test_additive_increase_multiplicative_decrease(self):
+        limiter = AIMDLimiter({"initial": 4, "decrease_factor": 0.5, "decrease_cooldown": 0})
+        limiter.in_flight = 2
+        limiter.release(success=False)
+        self.assertEqual(limiter.limit, 2)
+        limiter.release(success=True)
+        self.assertEqual(limiter.limit, 2.5)
+
+class TestAdmissionController(unittest.TestCase):
+    def test_limits_concurrency(self):
+        controller = AdmissionController("test", {"concurrency": {"initial": 2}})
+        active = []
+        peak = []
+
+        async def work():
+            active.append(1)
+            peak.append(len(active))
+            await asyncio.sleep(0.01)
+            active.pop()
+            return "ok"
+
+        async def run():
+            return await asyncio.gather(*[controller.run(work) for _ in range(6)])
+
+        self.assertEqual(asyncio.run(run()), ["ok"] * 6)
+        self.assertEqual(max(peak), 2)
+
+    def test_rejects_when_queue_is_full(self):
+        controller = AdmissionController("test", {"concurrency": {"initial": 1}, "max_queue": 1})
+
+        async def work():
+            await asyncio.sleep(0.05)
+
+        async def run():
+            return await asyncio.gather(*[controller.run(work) for _ in range(3)], return_exceptions=True)
+
+        results = asyncio.run(run())
+        self.assertEqual(sum(isinstance(r, AdmissionRejectedError) for r in results), 1)
+
+    def test_overload_shrinks_limit(self):
+        controller = AdmissionController("test", {"concurrency": {"initial": 8}})
+
+        async def fail():
+            raise OverloadError("rate limited")
+
+        with self.assertRaises(OverloadError):
+            asyncio.run(controller.run(fail))
+        self.assertEqual(controller.limiter.limit, 4)
+        self.assertEqual(controller.limiter.in_flight, 0)
+
+    def test_tpm_rejection_refunds_rpm(self):
+        controller = AdmissionController("test", {"rpm": 60, "tpm": 100, "max_wait": 0.1})
+        controller.tpm.reserve(100)
+
+        async def work():
+            return "ok"
+
+        with self.assertRaises(AdmissionRejectedError):
+            asyncio.run(controller.run(work, tokens=50))
+        self.assertGreater(controller.rpm.available, 59.9)
+        self.assertEqual(controller.limiter.in_flight, 0)
+
+    def test_configure_keeps_in_flight_and_bucket_balance(self):
+        controller = AdmissionController("test", {"rpm": 60, "concurrency": {"initial": 4}})
+        controller.rpm.reserve(50)
+        controller.limiter.in_flight = 3
+        controller.configure({"rpm": 30, "tpm": 1000, "concurrency": {"max": 2}})
+        self.assertEqual(controller.limiter.in_flight, 3)
+        self.assertEqual(controller.limiter.limit, 2)
+        self.assertEqual(controller.rpm.capacity, 30)
+        self.assertLess(controller.rpm.available, 11)
+        self.assertEqual(controller.tpm.capacity, 1000)
+        controller.configure({})
+        self.assertIsNone(controller.rpm)
+
+if __name__ == '__main__':
+    unittest.main()
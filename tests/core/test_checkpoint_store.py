@@ -0,0 +1,57 @@
+import os
+import tempfile
+import time
+import unittest
+from src.core.checkpoint_store import CheckpointStore, make_run_id
+
+class TestCheckpointStore(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = CheckpointStore({'directory': self.tmp.name})
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_save_load_and_delete(self):
+        self.store.save('run-1', 'business_plan', 'plan')
+        self.store.save('run-1', 'financial_analysis', {'van': 10})
+        self.store.save('run-2', 'business_plan', 'otro')
+
+        self.assertEqual(self.store.load('run-1'), {'business_plan': 'plan', 'financial_analysis': {'van': 10}})
+        self.assertEqual(self.store.list_runs(), ['run-1', 'run-2'])
+
+        self.store.delete('run-1')
+        self.assertEqual(self.store.load('run-1'), {})
+        self.assertEqual(self.store.list_runs(), ['run-2'])
+
+    def test_expired_and_corrupt_entries_are_ignored(self):
+        self.store.save('run', 'a', 'ok')
+        self.store.save('run', 'b', 'viejo')
+        with open(os.path.join(self.tmp.name, 'run', 'c.json'), 'w') as f:
+            f.write('{"step": "c", "val')
+
+        self.store.ttl = 60
+        path = os.path.join(self.tmp.name, 'run', 'b.json')
+        with open(path) as f:
+            content = f.read()
+        with open(path, 'w') as f:
+            f.write(content.replace(str(content.split('"saved_at": ')[1].split(',')[0]), str(time.time() - 120)))
+
+        self.assertEqual(self.store.load('run'), {'a': 'ok'})
+
+    def test_unsafe_names_stay_inside_directory(self):
+        self.store.save('../fuera', 'paso/1', 'x')
+        self.assertEqual(self.store.load('../fuera'), {'paso/1': 'x'})
+        self.assertFalse(os.path.exists(os.path.join(os.path.dirname(self.tmp.name), 'fuera')))
+
+    def test_run_id_is_stable_per_config(self):
+        config = {'sector': 'café', 'location': 'Madrid'}
+        self.assertEqual(
+            make_run_id('PymeWorkflow', config),
+            make_run_id('PymeWorkflow', dict(reversed(list(config.items()))))
+        )
+        self.assertEqual(make_run_id('PymeWorkflow', config), make_run_id('PymeWorkflow', {**config, 'run_id': 'x'}))
+        self.assertNotEqual(make_run_id('PymeWorkflow', config), make_run_id('PymeWorkflow', {**config, 'sector': 'té'}))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+import asyncio
+import unittest
+from src.core.circuit_breaker import CircuitBreaker, CircuitOpenError, CircuitState
+
+class TestCircuitBreaker(unittest.TestCase):
+    def setUp(self) -> None:
+        self.config = {
+            "window": 4,
+            "min_calls": 4,
+            "failure_rate_threshold": 0.5,
+            "open_timeout": 0.05,
+            "probe_successes": 2
+        }
+
+    async def _fail(self):
+        raise ValueError("fallo del proveedor")
+
+    async def _ok(self):
+        return "ok"
+
+    async def _trip(self, breaker):
+        for _ in range(4):
+            with self.assertRaises(ValueError):
+                await breaker.call(self._fail)
+
+    def test_opens_after_failure_rate_and_rejects(self):
+        breaker = CircuitBreaker("test", self.config)
+
+        async def run():
+            await self._trip(breaker)
+            with self.assertRaises(CircuitOpenError):
+                await breaker.call(self._ok)
+
+        asyncio.run(run())
+        self.assertEqual(breaker.state, CircuitState.OPEN)
+        self.assertEqual(breaker.stats["rejected"], 1)
+
+    def test_half_open_trial_call_closes_circuit(self):
+        breaker = CircuitBreaker("test", self.config)
+
+        async def run():
+            await self._trip(breaker)
+            await asyncio.sleep(0.06)
+            return await breaker.call(self._ok)
+
+        self.assertEqual(asyncio.run(run()), "ok")
+        self.assertEqual(breaker.state, CircuitState.CLOSED)
+
+    def test_background_probes_close_circuit(self):
+        breaker = CircuitBreaker("test", self.config, probe=self._ok)
+
+        async def run():
+            await self._trip(breaker)
+            await asyncio.sleep(0.06)
+            # El primer acceso lanza las sondas pero no admite tráfico real
+            self.assertFalse(breaker.is_available())
+            await asyncio.sleep(0.05)
+            return breaker.is_available()
+
+        self.assertTrue(asyncio.run(run()))
+        self.assertEqual(breaker.stats["probes"], 2)
+
+    def test_failed_probe_reopens_circuit(self):
+        breaker = CircuitBreaker("test", self.config, probe=self._fail)
+
+        async def run():
+            await self._trip(breaker)
+            await asyncio.sleep(0.06)
+            breaker.is_available()
+            await asyncio.sleep(0.01)
+
+        asyncio.run(run())
+        self.assertEqual(breaker.state, CircuitState.OPEN)
+        self.assertEqual(breaker.stats["opened"], 2)
+
+    def test_ignored_errors_do_not_trip(self):
+        breaker = CircuitBreaker("test", self.config, ignore=(KeyError,))
+
+        async def fail_locally():
+            raise KeyError("rechazo local")
+
+        async def run():
+            for _ in range(6):
+                with self.assertRaises(KeyError):
+                    await breaker.call(fail_locally)
+
+        asyncio.run(run())
+        self.assertEqual(breaker.state, CircuitState.CLOSED)
+
+    def test_ignored_probe_error_keeps_circuit_half_open(self):
+        async def rejected():
+            raise KeyError("sin presupuesto")
+
+        breaker = CircuitBreaker("test", self.config, probe=rejected, ignore=(KeyError,))
+
+        async def run():
+            await self._trip(breaker)
+            await asyncio.sleep(0.06)
+            breaker.is_available()
+            await asyncio.sleep(0.01)
+
+        asyncio.run(run())
+        self.assertEqual(breaker.state, CircuitState.HALF_OPEN)
+        self.assertEqual(breaker.stats["opened"], 1)
+
+if __name__ == '__main__':
+    unittest.main()
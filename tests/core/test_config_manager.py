@@ -0,0 +1,118 @@
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+from src.core.config_manager import ConfigManager, ConfigError, interpolate_env
+
+INFERENCE = """
+admission:
+  max_queue: 10
+providers:
+  groq:
+    type: groq
+    api_key: "${TEST_GROQ_KEY}"
+    base_url: "${TEST_GROQ_URL:-https://api.groq.com}"
+    admission:
+      rpm: 30
+"""
+
+class TestInterpolateEnv(unittest.TestCase):
+    def test_nested_values_and_defaults(self):
+        missing = set()
+        with patch.dict(os.environ, {'A': 'uno'}, clear=False):
+            result = interpolate_env({'x': ['${A}-${B:-dos}', 3], 'y': '${C}'}, missing)
+        self.assertEqual(result, {'x': ['uno-dos', 3], 'y': ''})
+        self.assertEqual(missing, {'C'})
+
+class TestConfigManager(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.paths = {
+            key: os.path.join(self.tmp.name, name)
+            for key, name in {
+                'default': 'default.yaml',
+                'inference': 'inference.yaml',
+                'inference_example': 'inference.example.yaml',
+                'settings': 'settings.yaml',
+                'engines': 'engines.yaml',
+                'env': '.env'
+            }.items()
+        }
+        self._write('default', 'app: {name: test}\n')
+        self._write('inference', INFERENCE)
+        self.env = patch.dict(os.environ, {'TEST_GROQ_KEY': 'secreta'})
+        self.env.start()
+        self.manager = ConfigManager(self.paths)
+
+    def tearDown(self) -> None:
+        self.env.stop()
+        self.manager.stop_watching()
+        self.tmp.cleanup()
+
+    def _write(self, key, content):
+        with open(self.paths[key], 'w') as f:
+            f.write(content)
+        stamp = time.time() + len(content)
+        os.utime(self.paths[key], (stamp, stamp))
+
+    def test_load_interpolates_and_validates(self):
+        config = self.manager.load()
+        groq = config['inference_providers']['providers']['groq']
+        self.assertEqual(groq['api_key'], 'secreta')
+        self.assertEqual(groq['base_url'], 'https://api.groq.com')
+        self.assertNotIn('enabled', groq)
+        typed = self.manager.settings.inference_providers.providers['groq']
+        self.assertEqual(typed.admission.rpm, 30.0)
+        self.assertTrue(typed.enabled)
+
+    def test_settings_override_daily_limit(self):
+        self._write('settings', 'daily_cost_limit: 7.5\n')
+        config = self.manager.load()
+        self.assertEqual(config['inference_providers']['budget']['daily_limit'], 7.5)
+
+    def test_invalid_config_raises(self):
+        self._write('inference', 'providers:\n  groq:\n    type: groq\n    admission: {rpm: -1}\n')
+        with self.assertRaises(ConfigError):
+            self.manager.load()
+
+    def test_check_notifies_only_on_content_change(self):
+        self.manager.load()
+        calls = []
+        self.manager.subscribe(lambda config, changed: calls.append(changed))
+
+        os.utime(self.paths['inference'], (time.time() + 500, time.time() + 500))
+        self.assertEqual(self.manager.check(), [])
+
+        self._write('inference', INFERENCE.replace('rpm: 30', 'rpm: 60'))
+        self.assertEqual(self.manager.check(), [self.paths['inference']])
+        self.assertEqual(calls, [[self.paths['inference']]])
+        self.assertEqual(self.manager.settings.inference_providers.providers['groq'].admission.rpm, 60.0)
+
+    def test_invalid_reload_keeps_previous_config(self):
+        self.manager.load()
+        self._write('inference', 'providers: [not, a, mapping]\n')
+        self.assertEqual(self.manager.check(), [])
+        self.assertEqual(self.manager.config['inference_providers']['providers']['groq']['api_key'], 'secreta')
+
+    def test_env_file_does_not_override_environment(self):
+        self._write('env', 'TEST_GROQ_KEY=del_env\nTEST_EXTRA=uno\n')
+        self._write('inference', INFERENCE.replace('rpm: 30', 'rpm: 30\n    default_model: ${TEST_EXTRA}'))
+        config = self.manager.load()
+        groq = config['inference_providers']['providers']['groq']
+        self.assertEqual(groq['api_key'], 'secreta')
+        self.assertEqual(groq['default_model'], 'uno')
+
+        # Al recargar solo se refrescan las variables que vinieron del .env
+        self._write('env', 'TEST_GROQ_KEY=otra\nTEST_EXTRA=dos\n')
+        self.manager.check()
+        groq = self.manager.config['inference_providers']['providers']['groq']
+        self.assertEqual(groq['api_key'], 'secreta')
+        self.assertEqual(groq['default_model'], 'dos')
+
+        self._write('env', 'TEST_GROQ_KEY=otra\n')
+        self.manager.load()
+        self.assertNotIn('TEST_EXTRA', os.environ)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import asyncio
+import unittest
+from src.core.context_budget import ContextBudgeter, clear_digest_cache, truncate_to_tokens
+from src.core.token_counter import count_tokens
+
+LONG_TEXT = "\n".join(f"Línea {i} con bastante contenido del análisis previo." for i in range(200))
+
+class TestContextBudgeter(unittest.TestCase):
+    def setUp(self) -> None:
+        clear_digest_cache()
+        self.calls = []
+
+    async def _summarize(self, prompt, max_tokens):
+        self.calls.append(max_tokens)
+        await asyncio.sleep(0.01)
+        return "Resumen breve."
+
+    def test_short_text_passes_through(self):
+        budgeter = ContextBudgeter({}, self._summarize)
+        self.assertEqual(asyncio.run(budgeter.fit("corto", "consumer", 100)), "corto")
+        self.assertEqual(self.calls, [])
+
+    def test_long_text_is_digested_once_and_cached(self):
+        budgeter = ContextBudgeter({}, self._summarize)
+
+        async def run():
+            return await asyncio.gather(*[budgeter.fit(LONG_TEXT, "consumer", 100) for _ in range(3)])
+
+        self.assertEqual(asyncio.run(run()), ["Resumen breve."] * 3)
+        self.assertEqual(asyncio.run(budgeter.fit(LONG_TEXT, "otro", 100)), "Resumen breve.")
+        self.assertEqual(self.calls, [100])
+
+    def test_config_target_overrides_and_zero_means_full_text(self):
+        budgeter = ContextBudgeter({"targets": {"full": 0, "small": 50}}, self._summarize)
+        self.assertEqual(asyncio.run(budgeter.fit(LONG_TEXT, "full", 100)), LONG_TEXT)
+        asyncio.run(budgeter.fit(LONG_TEXT, "small", 100))
+        self.assertEqual(self.calls, [50])
+
+    def test_failed_summary_falls_back_to_truncation_without_caching(self):
+        async def failing(prompt, max_tokens):
+            self.calls.append(max_tokens)
+            raise RuntimeError("sin motor")
+
+        budgeter = ContextBudgeter({}, failing)
+        result = asyncio.run(budgeter.fit(LONG_TEXT, "consumer", 100))
+        self.assertTrue(result.endswith("[...]"))
+        self.assertLessEqual(count_tokens(result), 110)
+        asyncio.run(budgeter.fit(LONG_TEXT, "consumer", 100))
+        self.assertEqual(len(self.calls), 2)
+
+    def test_truncate_keeps_whole_lines(self):
+        result = truncate_to_tokens(LONG_TEXT, 40)
+        for line in result.splitlines()[:-1]:
+            self.assertIn(line, LONG_TEXT.splitlines())
+
+if __name__ == '__main__':
+    unittest.main()
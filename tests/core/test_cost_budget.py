@@ -0,0 +1,55 @@
+import asyncio
+import unittest
+from src.core.cost_budget import BudgetExceededError, CostBudget
+
+class TestCostBudget(unittest.TestCase):
+    def setUp(self) -> None:
+        self.budget = CostBudget({
+            "daily_limit": 1.0,
+            "downgrade_threshold": 0.5,
+            "downgrades": {"big-*": "small-model"},
+            "state_file": None
+        })
+
+    def test_reservations_count_against_limit(self):
+        self.budget.reserve(0.6)
+        with self.assertRaises(BudgetExceededError):
+            self.budget.reserve(0.6)
+        self.assertEqual(self.budget.stats["rejected"], 1)
+
+    def test_reconcile_replaces_estimate_with_actual_cost(self):
+        reservation = self.budget.reserve(0.8)
+        self.budget.reconcile(reservation, 0.1)
+
+        status = self.budget.get_status()
+        self.assertAlmostEqual(status["spent"], 0.1)
+        self.assertAlmostEqual(status["reserved"], 0.0)
+
+    def test_cancel_releases_reservation(self):
+        reservation = self.budget.reserve(0.9)
+        self.budget.cancel(reservation)
+        self.budget.reserve(0.9)
+
+    def test_downgrade_near_limit(self):
+        self.assertEqual(self.budget.choose_model("big-model"), "big-model")
+        self.budget.reconcile(self.budget.reserve(0.6), 0.6)
+        self.assertEqual(self.budget.choose_model("big-model"), "small-model")
+        self.assertEqual(self.budget.choose_model("other-model"), "other-model")
+
+    def test_concurrent_calls_cannot_exceed_limit(self):
+        async def call():
+            await asyncio.sleep(0.01)
+            return {"cost": 0.3}
+
+        async def run():
+            return await asyncio.gather(*[
+                self.budget.run(call, estimated_cost=0.3, cost_of=lambda r: r["cost"])
+                for _ in range(5)
+            ], return_exceptions=True)
+
+        results = asyncio.run(run())
+        self.assertEqual(sum(isinstance(r, BudgetExceededError) for r in results), 2)
+        self.assertAlmostEqual(self.budget.get_status()["spent"], 0.9)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,137 @@
+import asyncio
+import unittest
+from src.core.circuit_breaker import CircuitState
+from src.core.cost_budget import get_cost_budget
+from src.core.engine_manager import AIEngineManager, AllEnginesFailedError
+from src.engines.base_engine import BaseAIEngine
+from src.engines.registry import register_engine
+
+class FakeEngine(BaseAIEngine):
+    def __init__(self, config):
+        super().__init__(config)
+        self.calls = 0
+
+    async def _generate_text(self, prompt, system_prompt=None, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        if self.config.get('fail'):
+            raise RuntimeError(f"{self.config['name']} caído")
+        return {'text': f"{self.config['name']}: {prompt}", 'metrics': {'tokens': 1, 'cost': 0.0}}
+
+    async def _generate_text_stream(self, prompt, system_prompt=None, **kwargs):
+        yield {'text': prompt, 'done': True}
+
+register_engine('fake', FakeEngine)
+register_engine('broken', 'src.engines.does_not_exist:Broken')
+
+class TestEngineManagerLoading(unittest.TestCase):
+    def test_unknown_or_unimportable_engines_are_skipped(self):
+        manager = AIEngineManager({
+            'cache': {'enabled': False},
+            'engines': {
+                'ok': {'type': 'fake', 'name': 'ok'},
+                'unknown': {'type': 'nope'},
+                'broken': {'type': 'broken'}
+            }
+        })
+        self.assertEqual(list(manager.engines), ['ok'])
+        self.assertEqual(list(manager.breakers), ['ok'])
+
+class TestEngineForTask(unittest.TestCase):
+    def setUp(self) -> None:
+        # Las llamadas pasan por el presupuesto compartido: que no escriba su estado en disco
+        self.budget = get_cost_budget()
+        self.state_file, self.budget.state_file = self.budget.state_file, None
+
+    def tearDown(self) -> None:
+        self.budget.state_file = self.state_file
+
+    def _manager(self, **engines):
+        return AIEngineManager({
+            'cache': {'disk_enabled': False},
+            'circuit_breaker': {'window': 4, 'min_calls': 2},
+            'engines': {
+                name: {'type': 'fake', 'name': name, **config}
+                for name, config in engines.items()
+            }
+        })
+
+    def test_calls_are_cached_and_coalesced(self):
+        manager = self._manager(a={})
+        engine = manager.engine_for_task('resumen')
+
+        async def run():
+            first = await asyncio.gather(*[engine.generate_text('hola') for _ in range(3)])
+            return first, await engine.generate_text('hola')
+
+        first, cached = asyncio.run(run())
+        self.assertEqual([r['text'] for r in first], ['a: hola'] * 3)
+        self.assertEqual(cached['text'], 'a: hola')
+        self.assertEqual(manager.engines['a'].calls, 1)
+
+    def test_cache_is_scoped_by_task_and_routed_engine(self):
+        manager = self._manager(a={}, b={})
+        manager.select_best_engine = lambda task: manager.engines['a' if task == 'resumen' else 'b']
+
+        async def run():
+            return [
+                (await manager.engine_for_task(task).generate_text('hola'))['text']
+                for task in ('resumen', 'titular', 'resumen')
+            ]
+
+        self.assertEqual(asyncio.run(run()), ['a: hola', 'b: hola', 'a: hola'])
+        self.assertEqual((manager.engines['a'].calls, manager.engines['b'].calls), (1, 1))
+
+    def test_falls_back_and_opens_the_failing_circuit(self):
+        manager = self._manager(a={'fail': True}, b={})
+        # Se fuerza que el motor que falla sea el elegido
+        manager.select_best_engine = lambda task: manager.engines['a']
+        engine = manager.engine_for_task('resumen')
+
+        async def run():
+            return [await engine.generate_text(f"hola {i}") for i in range(2)]
+
+        self.assertEqual([r['text'] for r in asyncio.run(run())], ['b: hola 0', 'b: hola 1'])
+        self.assertEqual(manager.breakers['a'].state, CircuitState.OPEN)
+
+    def test_raises_when_all_engines_fail(self):
+        manager = self._manager(a={'fail': True})
+        with self.assertRaises(AllEnginesFailedError):
+            asyncio.run(manager.engine_for_task('resumen').generate_text('hola'))
+        result = asyncio.run(manager.execute_with_fallback('resumen', 'otra'))
+        self.assertFalse(result['success'])
+        self.assertIn('a caído', result['error'])
+
+    def test_all_circuits_open_returns_failure(self):
+        manager = self._manager(a={})
+        manager.breakers['a']._trip()
+        result = asyncio.run(manager.execute_with_fallback('resumen', 'hola'))
+        self.assertFalse(result['success'])
+        self.assertIn('circuitos', result['error'])
+        with self.assertRaises(AllEnginesFailedError):
+            asyncio.run(manager.engine_for_task('resumen').generate_text('hola'))
+
+    def test_wrap_call_waits_outside_the_breaker(self):
+        manager = self._manager(a={})
+        breaker = manager.breakers['a']
+        breaker.slow_call_threshold = 0.05
+        breaker.slow_call_rate_threshold = 0.5
+        wrapped = []
+
+        async def wrap(name, call):
+            # Esperar turno (p. ej. el límite de un lote) no es una llamada lenta
+            wrapped.append(name)
+            await asyncio.sleep(0.06)
+            return await call()
+
+        engine = manager.engine_for_task('resumen', wrap_call=wrap)
+
+        async def run():
+            return [await engine.generate_text(f"hola {i}", use_cache=False) for i in range(3)]
+
+        asyncio.run(run())
+        self.assertEqual(wrapped, ['a'] * 3)
+        self.assertEqual(breaker.state, CircuitState.CLOSED)
+
+if __name__ == '__main__':
+    unittest.main()
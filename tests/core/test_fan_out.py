@@ -0,0 +1,56 @@
+import asyncio
+import time
+import unittest
+from src.core.fan_out import fan_out, raise_if_all_failed
+
+class TestFanOut(unittest.TestCase):
+    def setUp(self) -> None:
+        self.active = 0
+        self.max_active = 0
+
+    async def _work(self, item):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            # Los primeros terminan los últimos para comprobar el orden
+            await asyncio.sleep(0.05 / (item + 1))
+            if item == 2:
+                raise ValueError("fallo en 2")
+            return item * 10
+        finally:
+            self.active -= 1
+
+    def test_results_keep_input_order_and_isolate_errors(self):
+        results = asyncio.run(fan_out(range(5), self._work, limit=None))
+
+        self.assertEqual([r.item for r in results], [0, 1, 2, 3, 4])
+        self.assertEqual([r.value for r in results if r.ok], [0, 10, 30, 40])
+        self.assertIsInstance(results[2].error, ValueError)
+        self.assertEqual(self.max_active, 5)
+
+    def test_limit_bounds_concurrency(self):
+        asyncio.run(fan_out(range(6), self._work, limit=2))
+        self.assertEqual(self.max_active, 2)
+
+    def test_runs_concurrently(self):
+        async def slow(item):
+            await asyncio.sleep(0.05)
+            return item
+
+        start = time.monotonic()
+        asyncio.run(fan_out(range(5), slow, limit=5))
+        self.assertLess(time.monotonic() - start, 0.15)
+
+    def test_raise_if_all_failed(self):
+        async def fail(item):
+            raise ValueError(item)
+
+        results = asyncio.run(fan_out(['a', 'b'], fail))
+        with self.assertRaises(ValueError):
+            raise_if_all_failed(results)
+
+        raise_if_all_failed([])
+        raise_if_all_failed(asyncio.run(fan_out(range(3), self._work)))
+
+if __name__ == '__main__':
+    unittest.main()
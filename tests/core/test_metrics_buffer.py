@@ -0,0 +1,50 @@
+import time
+import unittest
+from src.core.base_components import TaskMetrics
+from src.core.metrics_buffer import MetricsRingBuffer
+from src.engines.inference.base_inference import InferenceMetrics
+
+class TestMetricsRingBuffer(unittest.TestCase):
+    def test_memory_is_bounded_and_totals_are_lifetime(self):
+        buffer = MetricsRingBuffer(TaskMetrics, capacity=4)
+        for i in range(10):
+            buffer.append(TaskMetrics(tokens_used=10, cost=1.0, latency=float(i)))
+
+        summary = buffer.summary()
+        self.assertEqual(len(buffer), 4)
+        self.assertEqual(summary["total_requests"], 10)
+        self.assertEqual(summary["total_tokens"], 100)
+        self.assertAlmostEqual(summary["total_cost"], 10.0)
+        # La media de latencia es la de la ventana retenida (6, 7, 8, 9)
+        self.assertAlmostEqual(summary["avg_latency"], 7.5)
+
+    def test_records_are_chronological(self):
+        buffer = MetricsRingBuffer(TaskMetrics, capacity=3)
+        for i in range(5):
+            buffer.append(TaskMetrics(latency=float(i), success=i % 2 == 0, error_message=str(i)))
+
+        records = buffer.records()
+        self.assertEqual([r.latency for r in records], [2.0, 3.0, 4.0])
+        self.assertEqual([r.error_message for r in records], ["2", "3", "4"])
+        self.assertEqual([r.latency for r in buffer.records(last=1)], [4.0])
+        self.assertAlmostEqual(buffer.summary()["success_rate"], 2 / 3)
+
+    def test_group_summary_by_model(self):
+        buffer = MetricsRingBuffer(InferenceMetrics, capacity=10)
+        buffer.append(InferenceMetrics(latency=1.0, tokens_used=10, cost=0.1, model_name="a"))
+        buffer.append(InferenceMetrics(latency=3.0, tokens_used=30, cost=0.3, model_name="a"))
+        buffer.append(InferenceMetrics(latency=2.0, tokens_used=5, cost=0.5, model_name="b"))
+
+        groups = buffer.group_summary("model_name")
+        self.assertEqual(groups["a"]["requests_count"], 2)
+        self.assertAlmostEqual(groups["a"]["avg_latency"], 2.0)
+        self.assertEqual(groups["b"]["total_tokens"], 5)
+
+    def test_timestamp_defaults_to_creation_time(self):
+        first = TaskMetrics()
+        time.sleep(0.01)
+        second = TaskMetrics()
+        self.assertGreater(second.timestamp, first.timestamp)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+import urllib.request
+from src.core.metrics_registry import CONTENT_TYPE, MetricsRegistry, MetricsServer
+
+class TestMetricsRegistry(unittest.TestCase):
+    def setUp(self) -> None:
+        self.registry = MetricsRegistry()
+
+    def test_counter_and_gauge_exposition(self):
+        counter = self.registry.counter("requests", "Peticiones", ("provider",))
+        counter.inc(provider="groq")
+        counter.inc(2, provider="groq")
+        self.registry.gauge("queue_depth", "Cola").set_function(lambda: 3)
+
+        text = self.registry.render()
+        self.assertIn("# TYPE requests counter", text)
+        self.assertIn('requests_total{provider="groq"} 3', text)
+        self.assertIn("queue_depth 3", text)
+        self.assertTrue(text.endswith("# EOF\n"))
+
+    def test_histogram_buckets_are_cumulative(self):
+        histogram = self.registry.histogram("latency_seconds", "Latencia", ("model",), buckets=(1.0, 5.0))
+        for value in (0.5, 2.0, 10.0):
+            histogram.observe(value, model="m")
+
+        text = self.registry.render()
+        self.assertIn('latency_seconds_bucket{model="m",le="1"} 1', text)
+        self.assertIn('latency_seconds_bucket{model="m",le="5"} 2', text)
+        self.assertIn('latency_seconds_bucket{model="m",le="+Inf"} 3', text)
+        self.assertIn('latency_seconds_count{model="m"} 3', text)
+        self.assertIn('latency_seconds_sum{model="m"} 12.5', text)
+
+    def test_labels_must_match_declaration(self):
+        counter = self.registry.counter("requests", "Peticiones", ("provider",))
+        with self.assertRaises(ValueError):
+            counter.inc(model="x")
+        with self.assertRaises(ValueError):
+            self.registry.gauge("requests", "Otro tipo")
+
+    def test_http_endpoint(self):
+        self.registry.counter("requests", "Peticiones").inc()
+        server = MetricsServer(self.registry, port=0).start()
+        try:
+            host, port = server.address
+            with urllib.request.urlopen(f"http://{host}:{port}/metrics") as response:
+                self.assertEqual(response.headers["Content-Type"], CONTENT_TYPE)
+                self.assertIn("requests_total 1", response.read().decode())
+        finally:
+            server.stop()
+
+if __name__ == '__main__':
+    unittest.main()
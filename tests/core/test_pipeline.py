@@ -0,0 +1,63 @@
+import asyncio
+import unittest
+from src.core.pipeline import AsyncPipeline, PipelineStage
+
+class TestAsyncPipeline(unittest.TestCase):
+    def setUp(self) -> None:
+        self.finished = []
+
+    async def _adapt(self, item):
+        # 'slow' tarda mucho más que el resto en la primera etapa
+        await asyncio.sleep(0.3 if item == 'slow' else 0.02)
+        if item == 'broken':
+            raise ValueError("fallo en la adaptación")
+        return f"{item}:adapted"
+
+    async def _validate(self, value):
+        await asyncio.sleep(0.02)
+        return f"{value}:validated"
+
+    def _pipeline(self, **kwargs):
+        return AsyncPipeline([
+            PipelineStage('adapt', self._adapt, workers=4),
+            PipelineStage('validate', self._validate, workers=4)
+        ], **kwargs)
+
+    def test_items_flow_without_stage_barrier(self):
+        results = asyncio.run(self._pipeline().run(
+            ['slow', 'a', 'b'],
+            on_result=lambda result: self.finished.append(result.item)
+        ))
+
+        self.assertEqual([r.value for r in results], [
+            'slow:adapted:validated', 'a:adapted:validated', 'b:adapted:validated'
+        ])
+        # Los rápidos terminan la validación antes de que 'slow' acabe de adaptarse
+        self.assertEqual(self.finished[-1], 'slow')
+        self.assertLess(results[1].latency, 0.2)
+        self.assertGreaterEqual(results[0].latency, 0.3)
+        self.assertEqual(set(results[1].stage_latencies), {'adapt', 'validate'})
+
+    def test_errors_are_isolated_per_item(self):
+        results = asyncio.run(self._pipeline().run(['a', 'broken', 'b']))
+
+        self.assertTrue(results[0].ok and results[2].ok)
+        self.assertIsInstance(results[1].error, ValueError)
+        self.assertEqual(results[1].stage, 'adapt')
+        self.assertNotIn('validate', results[1].stage_latencies)
+
+    def test_bounded_queue_with_single_workers(self):
+        pipeline = AsyncPipeline([
+            PipelineStage('adapt', self._adapt),
+            PipelineStage('validate', self._validate)
+        ], queue_size=1)
+        items = [str(i) for i in range(6)]
+        results = asyncio.run(pipeline.run(items))
+        self.assertEqual([r.item for r in results], items)
+        self.assertTrue(all(r.ok for r in results))
+
+    def test_empty_input(self):
+        self.assertEqual(asyncio.run(self._pipeline().run([])), [])
+
+if __name__ == '__main__':
+    unittest.main()
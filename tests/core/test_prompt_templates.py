@@ -0,0 +1,62 @@
+import unittest
+from src.core.prompt_templates import PromptRegistry, PromptTemplate, normalize_template
+
+class TestPromptTemplate(unittest.TestCase):
+    def test_normalize_strips_indentation_and_blank_runs(self):
+        text = """
+            Analiza el mercado:   
+                - tendencias
+
+
+
+            Mercado: {market}
+        """
+        self.assertEqual(normalize_template(text), "Analiza el mercado:\n    - tendencias\n\nMercado: {market}")
+
+    def test_first_line_without_indentation(self):
+        text = """Primera línea
+            segunda línea {x}"""
+        self.assertEqual(PromptTemplate('t', text).render(x=1), "Primera línea\nsegunda línea 1")
+
+    def test_render_matches_str_format(self):
+        text = "Instrucciones fijas.\n\nA: {a!r}\nB: {b:>5}\nA otra vez: {a}"
+        template = PromptTemplate('t', text)
+        self.assertEqual(template.render(a='x', b=7), text.format(a='x', b=7))
+        self.assertEqual(template.fields, ('a', 'b'))
+
+    def test_missing_field_raises_key_error(self):
+        with self.assertRaises(KeyError):
+            PromptTemplate('t', "Hola {name}").render()
+
+    def test_static_prefix_and_tokens(self):
+        template = PromptTemplate('t', "Instrucciones largas y fijas.\n\nDato: {value}\nFin.")
+        self.assertEqual(template.static_prefix, "Instrucciones largas y fijas.\n\nDato: ")
+        self.assertEqual(template.static_text, "Instrucciones largas y fijas.\n\nDato: \nFin.")
+        self.assertGreater(template.static_tokens(), template.prefix_tokens() - 1)
+
+    def test_positional_fields_are_rejected(self):
+        with self.assertRaises(ValueError):
+            PromptTemplate('t', "Hola {}")
+
+class TestPromptRegistry(unittest.TestCase):
+    def setUp(self) -> None:
+        self.registry = PromptRegistry()
+
+    def test_compile_is_cached_by_text(self):
+        first = self.registry.compile("Hola {name}")
+        self.assertIs(self.registry.compile("Hola {name}"), first)
+
+    def test_register_and_stats(self):
+        self.registry.register('saludo', "Saluda con cortesía.\n\nNombre: {name}")
+        self.assertEqual(self.registry.render('saludo', name='Ana'), "Saluda con cortesía.\n\nNombre: Ana")
+        stats = self.registry.get_stats()['saludo']
+        self.assertEqual(stats['fields'], ['name'])
+        self.assertEqual(stats['renders'], 1)
+        self.assertEqual(stats['prefix_ratio'], 1.0)
+
+    def test_unknown_template_raises(self):
+        with self.assertRaises(KeyError):
+            self.registry.get('nope')
+
+if __name__ == '__main__':
+    unittest.main()
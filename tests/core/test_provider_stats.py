@@ -0,0 +1,34 @@
+import random
+import unittest
+from src.core.provider_stats import P2Quantile, RollingStats
+
+class TestProviderStats(unittest.TestCase):
+    def test_p2_quantile_close_to_exact(self):
+        rng = random.Random(42)
+        values = [rng.expovariate(1.0) for _ in range(5000)]
+        estimator = P2Quantile(0.95)
+        for value in values:
+            estimator.add(value)
+
+        exact = sorted(values)[int(0.95 * (len(values) - 1))]
+        self.assertAlmostEqual(estimator.value(), exact, delta=exact * 0.05)
+
+    def test_success_rate_is_windowed(self):
+        stats = RollingStats(window=10)
+        for _ in range(10):
+            stats.record(latency=1.0, success=False)
+        for _ in range(10):
+            stats.record(latency=1.0, success=True)
+
+        self.assertEqual(stats.success_rate, 1.0)
+
+    def test_cost_per_1k_tokens(self):
+        stats = RollingStats()
+        stats.record(latency=0.5, tokens=2000, cost=0.4)
+
+        snapshot = stats.snapshot()
+        self.assertAlmostEqual(snapshot['cost_per_1k_tokens'], 0.2)
+        self.assertEqual(snapshot['ewma_latency'], 0.5)
+
+if __name__ == '__main__':
+    unittest.main()
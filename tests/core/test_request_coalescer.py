@@ -0,0 +1,53 @@
+import asyncio
+import unittest
+from src.core.request_coalescer import RequestCoalescer
+
+class TestRequestCoalescer(unittest.TestCase):
+    def setUp(self) -> None:
+        self.coalescer = RequestCoalescer()
+        self.calls = 0
+
+    async def _work(self, value, fail=False):
+        self.calls += 1
+        await asyncio.sleep(0.05)
+        if fail:
+            raise ValueError("fallo del proveedor")
+        return value
+
+    def test_identical_calls_share_execution(self):
+        async def run():
+            return await asyncio.gather(*[
+                self.coalescer.run("k", lambda: self._work("ok"))
+                for _ in range(5)
+            ])
+
+        self.assertEqual(asyncio.run(run()), ["ok"] * 5)
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(self.coalescer.stats["coalesced"], 4)
+
+    def test_error_propagates_to_all_waiters(self):
+        async def run():
+            return await asyncio.gather(*[
+                self.coalescer.run("k", lambda: self._work("ok", fail=True))
+                for _ in range(3)
+            ], return_exceptions=True)
+
+        results = asyncio.run(run())
+        self.assertTrue(all(isinstance(r, ValueError) for r in results))
+        self.assertEqual(self.calls, 1)
+
+    def test_cancelled_waiter_does_not_cancel_others(self):
+        async def run():
+            first = asyncio.create_task(self.coalescer.run("k", lambda: self._work("ok")))
+            second = asyncio.create_task(self.coalescer.run("k", lambda: self._work("ok")))
+            await asyncio.sleep(0.01)
+            first.cancel()
+            return await second, first
+
+        result, first = asyncio.run(run())
+        self.assertEqual(result, "ok")
+        self.assertTrue(first.cancelled())
+        self.assertEqual(self.coalescer.in_flight(), 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import tempfile
+import time
+import unittest
+from src.core.response_cache import ResponseCache, MemoryLRUCache, make_cache_key
+
+class TestResponseCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.config = {
+            "directory": self.tmp_dir.name,
+            "memory_max_entries": 2,
+            "ttl_seconds": 60
+        }
+        self.cache = ResponseCache(self.config)
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def test_key_ignores_trailing_whitespace(self):
+        key_a = make_cache_key("Hola\r\nmundo  \n", "gpt-4", {"temperature": 0.7})
+        key_b = make_cache_key("Hola\nmundo", "gpt-4", {"temperature": 0.7})
+        self.assertEqual(key_a, key_b)
+
+    def test_key_depends_on_params(self):
+        key_a = make_cache_key("Hola", "gpt-4", {"temperature": 0.7})
+        key_b = make_cache_key("Hola", "gpt-4", {"temperature": 0.2})
+        self.assertNotEqual(key_a, key_b)
+
+    def test_memory_hit_and_miss(self):
+        self.assertIsNone(self.cache.get("k1"))
+        self.cache.set("k1", {"text": "respuesta"})
+        self.assertEqual(self.cache.get("k1"), {"text": "respuesta"})
+
+        stats = self.cache.get_stats()
+        self.assertEqual(stats["memory_hits"], 1)
+        self.assertEqual(stats["misses"], 1)
+
+    def test_disk_tier_survives_new_instance(self):
+        self.cache.set("k1", {"text": "persistida"})
+        other = ResponseCache(self.config)
+
+        self.assertEqual(other.get("k1"), {"text": "persistida"})
+        self.assertEqual(other.get_stats()["disk_hits"], 1)
+
+    def test_lru_eviction(self):
+        lru = MemoryLRUCache(max_entries=2)
+        lru.set("a", 1)
+        lru.set("b", 2)
+        lru.get("a")
+        lru.set("c", 3)
+
+        self.assertIsNone(lru.get("b"))
+        self.assertEqual(lru.get("a"), 1)
+        self.assertEqual(lru.evictions, 1)
+
+    def test_ttl_expiration(self):
+        lru = MemoryLRUCache(max_entries=10, ttl=60)
+        lru.set("a", 1, created_at=time.time() - 120)
+        self.assertIsNone(lru.get("a"))
+
+if __name__ == '__main__':
+    unittest.main()
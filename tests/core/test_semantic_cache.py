@@ -0,0 +1,50 @@
+import unittest
+from src.core.semantic_cache import SemanticCache
+
+class TestSemanticCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.cache = SemanticCache({"enabled": True, "threshold": 0.9, "max_entries": 2})
+
+    def test_near_duplicate_hit(self):
+        self.cache.add([1.0, 0.0, 0.0], {"text": "a"}, scope="gpt-4")
+        match = self.cache.lookup([0.99, 0.05, 0.0], scope="gpt-4")
+
+        self.assertIsNotNone(match)
+        self.assertEqual(match[0], {"text": "a"})
+
+    def test_threshold_and_scope(self):
+        self.cache.add([1.0, 0.0, 0.0], {"text": "a"}, scope="gpt-4")
+
+        self.assertIsNone(self.cache.lookup([0.0, 1.0, 0.0], scope="gpt-4"))
+        self.assertIsNone(self.cache.lookup([1.0, 0.0, 0.0], scope="claude-2"))
+
+    def test_batched_lookup_and_replacement(self):
+        self.cache.add([1.0, 0.0], {"text": "a"})
+        self.cache.add([0.0, 1.0], {"text": "b"})
+        self.cache.add([-1.0, 0.0], {"text": "c"})
+
+        results = self.cache.lookup_many([[1.0, 0.0], [0.0, 1.0], [-1.0, 0.0]])
+        self.assertIsNone(results[0])
+        self.assertEqual(results[1][0], {"text": "b"})
+        self.assertEqual(results[2][0], {"text": "c"})
+
+    def test_scopes_follow_growth_and_replacement(self):
+        cache = SemanticCache({"enabled": True, "threshold": 0.9, "max_entries": 100})
+        # Más entradas que la capacidad inicial para forzar el crecimiento
+        for i in range(70):
+            cache.add([1.0, 0.0], {"text": i}, scope="b")
+        cache.add([0.0, 1.0], {"text": "nuevo"}, scope="a")
+
+        self.assertEqual(cache.lookup([0.0, 1.0], scope="a")[0], {"text": "nuevo"})
+        self.assertIsNone(cache.lookup([0.0, 1.0], scope="b"))
+        self.assertIsNone(cache.lookup([0.0, 1.0], scope="otro"))
+        self.assertEqual(cache.lookup([0.0, 1.0])[0], {"text": "nuevo"})
+        # El hueco reemplazado toma el scope de la nueva entrada
+        self.cache.add([1.0, 0.0], {"text": "a"}, scope="gpt-4")
+        self.cache.add([0.0, 1.0], {"text": "b"}, scope="gpt-4")
+        self.cache.add([1.0, 0.0], {"text": "c"}, scope="claude-2")
+        self.assertIsNone(self.cache.lookup([1.0, 0.0], scope="gpt-4"))
+        self.assertEqual(self.cache.lookup([1.0, 0.0], scope="claude-2")[0], {"text": "c"})
+
+if __name__ == '__main__':
+    unittest.main()
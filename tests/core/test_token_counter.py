@@ -0,0 +1,84 @@
+import asyncio
+import threading
+import unittest
+from src.core.token_counter import ContextWindowExceededError, TokenCounter
+
+class FakeTokenizer:
+    def encode(self, text):
+        return list(text)
+
+class TestTokenCounter(unittest.TestCase):
+    def setUp(self) -> None:
+        self.counter = TokenCounter({
+            "tokenizers": {"fake-*": "fake:chars"},
+            "context_windows": {"small-*": 100}
+        })
+
+    def test_approximation_counts_punctuation(self):
+        self.assertGreater(self.counter.count('{"a":1,"b":2}'), len('{"a":1,"b":2}'.split()))
+        self.assertEqual(self.counter.count(""), 0)
+
+    def test_tokenizer_is_loaded_once_and_cached(self):
+        loads = []
+        self.counter._load = lambda spec: loads.append(spec) or FakeTokenizer()
+
+        self.assertEqual(self.counter.count("hola", "fake-model"), 4)
+        self.assertEqual(self.counter.count("adiós", "fake-other"), 5)
+        self.assertEqual(loads, ["fake:chars"])
+        self.assertEqual(self.counter.stats["exact"], 2)
+
+    def test_failed_load_falls_back_to_approximation(self):
+        def fail(spec):
+            raise OSError("sin red")
+        self.counter._load = fail
+
+        self.assertEqual(self.counter.count("hola mundo", "fake-model"), self.counter.approximate("hola mundo"))
+        self.assertIsNone(self.counter.get_tokenizer("fake-model"))
+
+    def test_inside_event_loop_loads_in_background(self):
+        loads = []
+        release = threading.Event()
+
+        def slow_load(spec):
+            loads.append(spec)
+            release.wait(1)
+            return FakeTokenizer()
+
+        self.counter._load = slow_load
+
+        async def run():
+            # Mientras se carga se aproxima sin bloquear el loop
+            first = self.counter.count("hola mundo", "fake-model")
+            self.assertIsNone(self.counter.get_tokenizer("fake-model"))
+            release.set()
+            for _ in range(50):
+                await asyncio.sleep(0.01)
+                if self.counter.get_tokenizer("fake-model") is not None:
+                    break
+            return first, self.counter.count("hola mundo", "fake-model")
+
+        first, second = asyncio.run(run())
+        self.assertEqual(first, self.counter.approximate("hola mundo"))
+        self.assertEqual(second, len("hola mundo"))
+        self.assertEqual(loads, ["fake:chars"])
+
+    def test_preload_loads_configured_tokenizers(self):
+        loads = []
+        self.counter._load = lambda spec: loads.append(spec)
+        asyncio.run(self.counter.apreload())
+        self.assertIn("fake:chars", loads)
+        # Los que fallan (None) quedan en caché y no se reintentan
+        self.counter.preload()
+        self.assertEqual(loads.count("fake:chars"), 1)
+
+    def test_fit_max_tokens_respects_context_window(self):
+        prompt = "palabra " * 20
+        prompt_tokens = self.counter.count(prompt, "small-model")
+
+        self.assertEqual(self.counter.fit_max_tokens(prompt, "small-model", 1000), 100 - prompt_tokens)
+        self.assertEqual(self.counter.fit_max_tokens(prompt, "other-model", 1000), 1000)
+        with self.assertRaises(ContextWindowExceededError):
+            self.counter.fit_max_tokens("palabra " * 200, "small-model", 10)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,145 @@
+import asyncio
+import time
+import unittest
+from src.core.workflow_engine import WorkflowEngine, WorkflowStep, StepTimeoutError
+
+class TestWorkflowEngine(unittest.TestCase):
+    def setUp(self) -> None:
+        self.calls = []
+
+    def _step(self, name, delay=0.05, fail=False):
+        async def run(*inputs):
+            self.calls.append((name, inputs))
+            await asyncio.sleep(delay)
+            if fail:
+                raise ValueError(f"fallo en {name}")
+            return f"{name}({','.join(inputs)})"
+        return run
+
+    def test_independent_steps_run_concurrently(self):
+        engine = WorkflowEngine('test', [
+            WorkflowStep('products', self._step('products')),
+            WorkflowStep('suppliers', self._step('suppliers'), ('products',)),
+            WorkflowStep('market', self._step('market'), ('products',)),
+            WorkflowStep('pricing', self._step('pricing'), ('products', 'market')),
+            WorkflowStep('marketing', self._step('marketing'), ('products', 'market'))
+        ])
+
+        start = time.monotonic()
+        results = asyncio.run(engine.run())
+        elapsed = time.monotonic() - start
+
+        # Tres niveles de 0.05s en lugar de cinco pasos secuenciales
+        self.assertLess(elapsed, 0.2)
+        self.assertEqual(results['pricing'], 'pricing(products(),market(products()))')
+        self.assertEqual(set(engine.step_metrics), set(results))
+        self.assertTrue(all(m['status'] == 'success' for m in engine.step_metrics.values()))
+
+    def test_inputs_are_passed_in_declared_order(self):
+        engine = WorkflowEngine('test', [
+            WorkflowStep('a', self._step('a')),
+            WorkflowStep('b', self._step('b')),
+            WorkflowStep('c', self._step('c'), ('b', 'a'))
+        ])
+        results = asyncio.run(engine.run())
+        self.assertEqual(results['c'], 'c(b(),a())')
+
+    def test_rejects_unknown_inputs_and_cycles(self):
+        with self.assertRaises(ValueError):
+            WorkflowEngine('test', [WorkflowStep('a', self._step('a'), ('missing',))])
+        with self.assertRaises(ValueError):
+            WorkflowEngine('test', [
+                WorkflowStep('a', self._step('a'), ('b',)),
+                WorkflowStep('b', self._step('b'), ('a',))
+            ])
+        with self.assertRaises(ValueError):
+            WorkflowEngine('test', [WorkflowStep('a', self._step('a')), WorkflowStep('a', self._step('a'))])
+
+    def test_timeout_cancels_running_steps(self):
+        engine = WorkflowEngine('test', [
+            WorkflowStep('fast', self._step('fast', delay=1.0)),
+            WorkflowStep('slow', self._step('slow', delay=1.0), timeout=0.05),
+            WorkflowStep('after', self._step('after'), ('slow',))
+        ])
+
+        with self.assertRaises(StepTimeoutError):
+            asyncio.run(engine.run())
+        self.assertEqual(engine.step_metrics['slow']['status'], 'timeout')
+        self.assertEqual(engine.step_metrics['fast']['status'], 'cancelled')
+        self.assertNotIn('after', engine.step_metrics)
+
+    def test_config_timeouts_override_step(self):
+        engine = WorkflowEngine(
+            'test',
+            [WorkflowStep('slow', self._step('slow', delay=0.2), timeout=0.01)],
+            {'timeouts': {'slow': 1.0}}
+        )
+        self.assertEqual(asyncio.run(engine.run())['slow'], 'slow()')
+
+    def test_error_propagates(self):
+        engine = WorkflowEngine('test', [
+            WorkflowStep('a', self._step('a', fail=True)),
+            WorkflowStep('b', self._step('b'), ('a',))
+        ])
+        with self.assertRaises(ValueError):
+            asyncio.run(engine.run())
+        self.assertEqual(engine.step_metrics['a']['status'], 'error')
+
+    def test_running_steps_finish_when_completions_are_persisted(self):
+        saved = {}
+        engine = WorkflowEngine('test', [
+            WorkflowStep('a', self._step('a')),
+            WorkflowStep('fails', self._step('fails', delay=0.01, fail=True), ('a',)),
+            WorkflowStep('slow', self._step('slow', delay=0.1), ('a',)),
+            WorkflowStep('after', self._step('after'), ('slow',))
+        ])
+
+        with self.assertRaises(ValueError):
+            asyncio.run(engine.run(on_step_complete=saved.__setitem__))
+        # 'slow' ya estaba en curso: termina y se guarda; 'after' no llega a empezar
+        self.assertEqual(set(saved), {'a', 'slow'})
+        self.assertNotIn('after', engine.step_metrics)
+
+    def test_siblings_finishing_with_the_failure_are_persisted(self):
+        saved = {}
+
+        async def scenario():
+            gate = asyncio.Event()
+
+            async def opener():
+                await asyncio.sleep(0.01)
+                gate.set()
+                return 'gate'
+
+            async def ok():
+                await gate.wait()
+                return 'ok'
+
+            async def fails():
+                await gate.wait()
+                raise ValueError("fallo")
+
+            engine = WorkflowEngine('test', [
+                WorkflowStep('gate', opener),
+                WorkflowStep('fails', fails),
+                WorkflowStep('ok', ok)
+            ])
+            await engine.run(on_step_complete=saved.__setitem__)
+
+        with self.assertRaises(ValueError):
+            asyncio.run(scenario())
+        # 'ok' terminó en la misma vuelta que 'fails': no se pierde al reanudar
+        self.assertEqual(saved, {'gate': 'gate', 'ok': 'ok'})
+
+    def test_known_results_are_not_rerun(self):
+        engine = WorkflowEngine('test', [
+            WorkflowStep('a', self._step('a')),
+            WorkflowStep('b', self._step('b'), ('a',))
+        ])
+        results = asyncio.run(engine.run({'a': 'cached', 'unknown': 'x'}))
+        self.assertEqual(results, {'a': 'cached', 'b': 'b(cached)'})
+        self.assertEqual([name for name, _ in self.calls], ['b'])
+        self.assertEqual(engine.step_metrics['a']['status'], 'restored')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import asyncio
+import threading
+import time
+import unittest
+from src.engines.executor import BoundedExecutor, ExecutorQueueFullError
+
+class TestBoundedExecutor(unittest.TestCase):
+    def setUp(self) -> None:
+        self.executor = BoundedExecutor("test", {"max_workers": 2, "max_queue": 1})
+
+    def tearDown(self) -> None:
+        self.executor.shutdown()
+
+    def test_blocking_calls_do_not_stall_the_loop(self):
+        ticks = []
+
+        async def ticker():
+            for _ in range(5):
+                ticks.append(time.time())
+                await asyncio.sleep(0.01)
+
+        async def run():
+            return await asyncio.gather(
+                self.executor.run(time.sleep, 0.1),
+                ticker()
+            )
+
+        asyncio.run(run())
+        self.assertEqual(len(ticks), 5)
+        self.assertLess(ticks[-1] - ticks[0], 0.09)
+
+    def test_rejects_beyond_workers_plus_queue(self):
+        release = threading.Event()
+
+        async def run():
+            return await asyncio.gather(*[
+                self.executor.run(release.wait, 1.0) for _ in range(4)
+            ], return_exceptions=True)
+
+        async def observe():
+            task = asyncio.ensure_future(run())
+            await asyncio.sleep(0.05)
+            depth = self.executor.queue_depth
+            release.set()
+            return depth, await task
+
+        depth, results = asyncio.run(observe())
+        self.assertEqual(depth, 1)
+        self.assertEqual(sum(isinstance(r, ExecutorQueueFullError) for r in results), 1)
+        self.assertEqual(self.executor.stats["rejected"], 1)
+
+    def test_shutdown_keeps_pending_calls_and_reports_drained(self):
+        release = threading.Event()
+        drained = threading.Event()
+        pool = self.executor._pool
+        futures = [pool.submit(release.wait, 1.0) for _ in range(3)]
+
+        self.executor.shutdown(cancel_pending=False, on_drained=drained.set)
+        self.assertFalse(drained.is_set())
+        release.set()
+        self.assertTrue(drained.wait(1.0))
+        self.assertTrue(all(f.result() for f in futures))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import unittest
+from src.engines.inference.model_catalog import ModelCatalog
+
+class TestModelCatalog(unittest.TestCase):
+    def setUp(self) -> None:
+        self.catalog = ModelCatalog({
+            "min_samples": 5,
+            "models": {
+                "llama": {
+                    "latency_target": 5.0,
+                    "providers": {
+                        "cheap": {"model": "llama-cheap", "input_price": 0.1, "output_price": 0.1},
+                        "mid": {"model": "llama-mid", "input_price": 0.5, "output_price": 0.5},
+                        "pricey": {"model": "llama-pricey", "input_price": 1.0, "output_price": 1.0}
+                    }
+                }
+            }
+        })
+        self.stats = {}
+
+    def _stats(self, provider, model):
+        return self.stats.get(provider, {"requests_count": 0})
+
+    def _route(self, **kwargs):
+        return [c.offering.provider for c in self.catalog.route("llama", self._stats, 100, 100, **kwargs)]
+
+    def test_cheapest_wins_without_latency_data(self):
+        self.assertEqual(self._route(), ["cheap", "mid", "pricey"])
+
+    def test_slow_offering_is_demoted(self):
+        self.stats["cheap"] = {"requests_count": 10, "p95_latency": 12.0}
+        self.stats["mid"] = {"requests_count": 10, "p95_latency": 3.0}
+        self.assertEqual(self._route(), ["mid", "pricey", "cheap"])
+        # Con un objetivo más laxo vuelve a ganar el más barato
+        self.assertEqual(self._route(latency_target=20.0), ["cheap", "mid", "pricey"])
+
+    def test_unavailable_providers_are_skipped(self):
+        self.assertEqual(self._route(available=lambda name: name != "cheap"), ["mid", "pricey"])
+
+    def test_find_and_membership(self):
+        self.assertIn("llama", self.catalog)
+        self.assertNotIn("llama-cheap", self.catalog)
+        self.assertEqual(self.catalog.find("mid", "llama-mid").input_price, 0.5)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import asyncio
+import unittest
+from src.core.circuit_breaker import CircuitOpenError, CircuitState
+from src.core.cost_budget import BudgetExceededError, configure_cost_budget, get_cost_budget
+from src.engines.inference.base_inference import BaseInferenceProvider
+from src.engines.inference.provider_manager import InferenceProviderManager
+from src.engines.registry import register_provider
+
+class PricedProvider(BaseInferenceProvider):
+    async def _generate_text(self, prompt, model=None, max_tokens=1000, temperature=0.7, **kwargs):
+        return {'text': prompt, 'tokens_used': 1, 'cost': 0.0}
+
+register_provider('priced', PricedProvider)
+
+class TestProviderBreakerWithBudget(unittest.TestCase):
+    def setUp(self) -> None:
+        self.manager = InferenceProviderManager({
+            'cache': {'enabled': False},
+            'budget': {'daily_limit': 0.001},
+            'circuit_breaker': {'window': 4, 'min_calls': 4},
+            'providers': {'a': {'type': 'priced', 'api_key': 'k', 'cost_per_token': 1.0}}
+        })
+
+    def tearDown(self) -> None:
+        configure_cost_budget({})
+
+    def test_budget_rejections_do_not_open_circuit(self):
+        provider = self.manager.providers['a']
+        breaker = self.manager.breakers['a']
+
+        async def run():
+            for _ in range(8):
+                with self.assertRaises(BudgetExceededError):
+                    await breaker.call(lambda: provider.generate_text('hola'))
+
+        asyncio.run(run())
+        self.assertEqual(breaker.state, CircuitState.CLOSED)
+
+    def test_probe_skips_budget(self):
+        result = asyncio.run(self.manager.providers['a'].probe())
+        self.assertEqual(result['text'], 'ping')
+
+class SlowProvider(BaseInferenceProvider):
+    async def _generate_text(self, prompt, model=None, max_tokens=1000, temperature=0.7, **kwargs):
+        await asyncio.sleep(0.03)
+        return {'text': prompt, 'tokens_used': 1, 'cost': 0.0}
+
+register_provider('slow', SlowProvider)
+
+class TestProviderBreakerTiming(unittest.TestCase):
+    def setUp(self) -> None:
+        self.budget = get_cost_budget()
+        self.state_file, self.budget.state_file = self.budget.state_file, None
+        self.manager = InferenceProviderManager({
+            'cache': {'enabled': False},
+            'circuit_breaker': {
+                'window': 4,
+                'min_calls': 2,
+                'slow_call_threshold': 0.05,
+                'slow_call_rate_threshold': 0.5
+            },
+            'providers': {
+                'a': {'type': 'slow', 'api_key': 'k', 'admission': {'concurrency': {'initial': 1, 'max': 1}}}
+            }
+        })
+
+    def tearDown(self) -> None:
+        self.budget.state_file = self.state_file
+
+    def test_admission_queue_wait_is_not_a_slow_call(self):
+        provider = self.manager.providers['a']
+
+        async def run():
+            return await asyncio.gather(*[
+                self.manager._call_provider(provider, f"hola {i}", None) for i in range(4)
+            ])
+
+        results = asyncio.run(run())
+        self.assertEqual(len(results), 4)
+        # Las últimas esperaron en cola más que el umbral, pero la llamada fue rápida
+        self.assertEqual(self.manager.breakers['a'].state, CircuitState.CLOSED)
+
+    def test_open_circuit_rejects_before_admission(self):
+        breaker = self.manager.breakers['a']
+        breaker._trip()
+        with self.assertRaises(CircuitOpenError):
+            asyncio.run(self.manager._call_provider(self.manager.providers['a'], 'hola', None))
+        self.assertEqual(self.manager.providers['a'].admission.stats['admitted'], 0)
+
+if __name__ == '__main__':
+    unittest.main()
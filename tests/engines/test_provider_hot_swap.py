@@ -0,0 +1,105 @@
+import asyncio
+import threading
+import unittest
+from src.core.cost_budget import get_cost_budget
+from src.engines.executor import BoundedExecutor
+from src.engines.inference.base_inference import BaseInferenceProvider
+from src.engines.inference.provider_manager import InferenceProviderManager
+from src.engines.registry import register_provider
+
+class FakeProvider(BaseInferenceProvider):
+    def __init__(self, config):
+        super().__init__(config)
+        self.executor = BoundedExecutor(self.name, config.get('executor', {}))
+        self.client_closed = threading.Event()
+
+    def _close_client(self):
+        self.client_closed.set()
+
+    async def _generate_text(self, prompt, model=None, max_tokens=1000, temperature=0.7, **kwargs):
+        return {'text': prompt, 'tokens_used': 1, 'cost': 0.0}
+
+register_provider('fake', FakeProvider)
+
+def _config(**providers):
+    return {'cache': {'enabled': False}, 'admission': {'max_queue': 5}, 'providers': providers}
+
+class TestProviderHotSwap(unittest.TestCase):
+    def setUp(self) -> None:
+        self.manager = InferenceProviderManager(_config(
+            a={'type': 'fake', 'api_key': 'k', 'models': ['m1'], 'admission': {'rpm': 30}},
+            b={'type': 'fake', 'api_key': 'k'}
+        ))
+
+    def test_limits_and_models_update_in_place(self):
+        provider = self.manager.providers['a']
+        limiter = provider.admission.limiter
+        self.manager.apply_config(_config(
+            a={'type': 'fake', 'api_key': 'k', 'models': ['m1', 'm2'], 'admission': {'rpm': 120}},
+            b={'type': 'fake', 'api_key': 'k'}
+        ))
+        self.assertIs(self.manager.providers['a'], provider)
+        self.assertIs(provider.admission.limiter, limiter)
+        self.assertEqual(provider.admission.rpm.capacity, 120)
+        self.assertEqual(provider.config['models'], ['m1', 'm2'])
+        self.assertEqual(provider.admission.max_queue, 5)
+
+    def test_credentials_change_creates_new_instance(self):
+        provider = self.manager.providers['a']
+        self.manager.apply_config(_config(
+            a={'type': 'fake', 'api_key': 'nueva'},
+            b={'type': 'fake', 'api_key': 'k'}
+        ))
+        self.assertIsNot(self.manager.providers['a'], provider)
+        self.assertEqual(self.manager.providers['a'].api_key, 'nueva')
+        # La instancia sustituida libera su pool y su cliente
+        self.assertTrue(provider.client_closed.wait(1.0))
+        with self.assertRaises(RuntimeError):
+            provider.executor._pool.submit(int)
+        self.assertFalse(self.manager.providers['a'].client_closed.is_set())
+
+    def test_disabled_provider_is_removed(self):
+        old_providers = self.manager.providers
+        disabled = old_providers['b']
+        self.manager.apply_config(_config(
+            a={'type': 'fake', 'api_key': 'k', 'admission': {'rpm': 30}},
+            b={'type': 'fake', 'api_key': 'k', 'enabled': False}
+        ))
+        self.assertEqual(set(self.manager.providers), {'a'})
+        self.assertEqual(set(self.manager.breakers), {'a'})
+        # Quien ya iteraba el diccionario anterior no se ve afectado
+        self.assertEqual(set(old_providers), {'a', 'b'})
+        self.assertTrue(disabled.client_closed.wait(1.0))
+
+class TestStreamAdmission(unittest.TestCase):
+    def setUp(self) -> None:
+        self.budget = get_cost_budget()
+        self.state_file, self.budget.state_file = self.budget.state_file, None
+
+    def tearDown(self) -> None:
+        self.budget.state_file = self.state_file
+
+    def _in_flight_while_streaming(self, admission):
+        provider = FakeProvider({'api_key': 'k', 'admission': admission})
+        seen = []
+
+        async def run():
+            async for _ in provider.generate_text_stream('hola'):
+                seen.append(provider.admission.limiter.in_flight)
+
+        asyncio.run(run())
+        provider.close()
+        return seen, provider.admission.limiter.in_flight
+
+    def test_stream_skips_admission_when_disabled(self):
+        seen, after = self._in_flight_while_streaming({'enabled': False})
+        self.assertEqual(set(seen), {0})
+        self.assertEqual(after, 0)
+
+    def test_stream_holds_a_slot_when_enabled(self):
+        seen, after = self._in_flight_while_streaming({})
+        self.assertEqual(set(seen), {1})
+        self.assertEqual(after, 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import sys
+import unittest
+from unittest.mock import patch
+from src.engines.registry import PluginRegistry, PROVIDER_REGISTRY
+
+class _EntryPoint:
+    def __init__(self, name, value):
+        self.name = name
+        self.value = value
+
+class TestPluginRegistry(unittest.TestCase):
+    def setUp(self) -> None:
+        self.registry = PluginRegistry('prueba', 'money_machine.test_plugins', {
+            'ordered': 'collections:OrderedDict',
+            'missing': 'src.engines.inference.does_not_exist:Missing'
+        })
+
+    def test_module_imported_on_first_get(self):
+        sys.modules.pop('colorsys', None)
+        self.registry.register('colors', 'colorsys:rgb_to_hsv')
+        self.assertNotIn('colorsys', sys.modules)
+        self.assertFalse(self.registry.is_loaded('colors'))
+        self.registry.get('colors')
+        self.assertIn('colorsys', sys.modules)
+        self.assertTrue(self.registry.is_loaded('colors'))
+
+    def test_builtin_resolves_and_is_cached(self):
+        from collections import OrderedDict
+        self.assertIs(self.registry.get('ordered'), OrderedDict)
+        self.assertIs(self.registry.get('ordered'), OrderedDict)
+
+    def test_unknown_type_raises_key_error(self):
+        with self.assertRaises(KeyError):
+            self.registry.get('nope')
+
+    def test_missing_module_only_fails_when_requested(self):
+        self.registry.get('ordered')
+        with self.assertRaises(ImportError):
+            self.registry.get('missing')
+
+    def test_register_class_overrides_builtin(self):
+        class Custom:
+            pass
+        self.registry.register('ordered', Custom)
+        self.assertIs(self.registry.get('ordered'), Custom)
+
+    def test_entry_points_are_discovered(self):
+        class Selectable(list):
+            def select(self, group):
+                return [ep for ep in self if group == 'money_machine.test_plugins']
+        points = Selectable([_EntryPoint('plugin', 'collections:deque'), _EntryPoint('ordered', 'collections:Counter')])
+        with patch('src.engines.registry.metadata.entry_points', return_value=points):
+            from collections import deque, OrderedDict
+            self.assertIs(self.registry.get('plugin'), deque)
+            self.assertIs(self.registry.get('ordered'), OrderedDict)
+            self.assertIn('plugin', self.registry.available_types())
+
+    def test_provider_registry_has_builtins(self):
+        self.assertIn('groq', PROVIDER_REGISTRY.available_types())
+        self.assertIn('sambanova', PROVIDER_REGISTRY.available_types())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import patch, MagicMock
+from src.core.config_manager import configure_config_manager
+from src.utils import initialization
+
+class TestAppContext(unittest.TestCase):
+    def setUp(self) -> None:
+        self.cwd = os.getcwd()
+        self.tmp = tempfile.TemporaryDirectory()
+        os.chdir(self.tmp.name)
+        os.makedirs('config')
+        self._write('config/default_config.yaml', 'app: {name: test}\n')
+        initialization.reset_app_context()
+        self.manager = configure_config_manager()
+        self.builds = []
+        patcher = patch.object(initialization, 'initialize_app', side_effect=self._build)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self) -> None:
+        initialization.reset_app_context()
+        configure_config_manager()
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def _write(self, path, content):
+        with open(path, 'w') as f:
+            f.write(content)
+        # Garantiza un mtime distinto aunque el sistema de archivos tenga poca resolución
+        stamp = time.time() + len(content)
+        os.utime(path, (stamp, stamp))
+
+    def _build(self):
+        self.manager.load()
+        context = {'provider_manager': MagicMock(), 'engine_manager': MagicMock(), 'initialized': True}
+        self.builds.append(context)
+        return context
+
+    def test_context_is_shared_between_calls(self):
+        first = initialization.get_app_context()
+        second = initialization.get_app_context()
+        self.assertIs(first, second)
+        self.assertEqual(len(self.builds), 1)
+
+    def test_config_change_is_applied_in_place(self):
+        context = initialization.get_app_context()
+        provider_manager = context['provider_manager']
+        self._write('config/settings.yaml', 'daily_cost_limit: 5\n')
+        self.assertIs(initialization.get_app_context(), context)
+        self.assertEqual(len(self.builds), 1)
+        applied = provider_manager.apply_config.call_args[0][0]
+        self.assertEqual(applied['budget']['daily_limit'], 5)
+        provider_manager.shutdown.assert_not_called()
+
+    def test_engines_change_replaces_engine_manager(self):
+        context = initialization.get_app_context()
+        engine_manager = context['engine_manager']
+        self._write('config/engines.yaml', 'engines: {}\n')
+        initialization.get_app_context()
+        self.assertIsNot(context['engine_manager'], engine_manager)
+
+    def test_failed_initialization_is_not_cached(self):
+        initialization.initialize_app.side_effect = [
+            {'initialized': False, 'error': 'boom'},
+            self._build()
+        ]
+        self.assertFalse(initialization.get_app_context()['initialized'])
+        self.assertTrue(initialization.get_app_context()['initialized'])
+
+if __name__ == '__main__':
+    unittest.main()
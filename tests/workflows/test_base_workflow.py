@@ -0,0 +1,39 @@
+import asyncio
+import unittest
+from src.workflows.base_workflow import BaseWorkflow
+
+class EngineFormatEngine:
+    """Devuelve las respuestas con el formato de los motores (``text`` y ``metrics``)"""
+
+    def __init__(self):
+        self.calls = []
+
+    async def generate_text(self, prompt, **kwargs):
+        self.calls.append((prompt, kwargs))
+        return {'text': 'resumen', 'metrics': {'tokens': 12, 'cost': 0.25}}
+
+class FakeEngineManager:
+    def __init__(self, engine):
+        self.engine = engine
+
+    def engine_for_task(self, task):
+        return self.engine
+
+class DummyWorkflow(BaseWorkflow):
+    async def execute(self):
+        return {}
+
+class TestBaseWorkflow(unittest.TestCase):
+    def test_summarize_reads_engine_response_format(self):
+        engine = EngineFormatEngine()
+        workflow = DummyWorkflow(FakeEngineManager(engine), {})
+
+        summary = asyncio.run(workflow._summarize('resume esto', 50))
+
+        self.assertEqual(summary, 'resumen')
+        self.assertEqual(engine.calls[0][1], {'max_tokens': 50})
+        self.assertEqual(workflow.metrics['total_tokens'], 12)
+        self.assertEqual(workflow.metrics['total_cost'], 0.25)
+
+if __name__ == '__main__':
+    unittest.main()
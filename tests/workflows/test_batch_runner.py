@@ -0,0 +1,132 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from src.core.checkpoint_store import configure_checkpoint_store, get_checkpoint_store
+from src.workflows.batch_runner import BatchRunner, load_configs_csv, main, read_completed
+
+class FakeEngine:
+    def __init__(self):
+        self.active = 0
+        self.max_active = 0
+
+    async def generate_text(self, prompt, **kwargs):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(0.01)
+            if 'Mercado: FAIL' in prompt:
+                raise RuntimeError("proveedor caído")
+            return {'text': 'ok', 'metrics': {'tokens': 1, 'cost': 0.0}}
+        finally:
+            self.active -= 1
+
+class FakeEngineManager:
+    def __init__(self):
+        self.engines = {'fake': FakeEngine()}
+
+    def engine_for_task(self, task, wrap_call=None):
+        return FakeTaskEngine(self.engines['fake'], wrap_call)
+
+class FakeTaskEngine:
+    """Como el motor de tarea real: ``wrap_call`` envuelve cada llamada al motor"""
+
+    def __init__(self, engine, wrap_call):
+        self.engine = engine
+        self.wrap_call = wrap_call
+
+    async def generate_text(self, prompt, **kwargs):
+        call = lambda: self.engine.generate_text(prompt, **kwargs)
+        return await (self.wrap_call('fake', call) if self.wrap_call else call())
+
+class TestBatchRunner(unittest.TestCase):
+    def setUp(self) -> None:
+        self.manager = FakeEngineManager()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.output = os.path.join(self.tmp.name, 'out', 'trading.jsonl')
+        self.previous_checkpoints = get_checkpoint_store().directory
+        configure_checkpoint_store({'directory': os.path.join(self.tmp.name, 'checkpoints')})
+
+    def tearDown(self) -> None:
+        configure_checkpoint_store({'directory': str(self.previous_checkpoints)})
+        self.tmp.cleanup()
+
+    def _runner(self, **config):
+        return BatchRunner(self.manager, 'trading', {'concurrency': 5, **config})
+
+    def test_captures_results_and_errors_per_item(self):
+        configs = [{'market': 'BTC'}, {'market': 'FAIL'}, {'market': 'ETH'}]
+        progress = []
+        results = asyncio.run(self._runner().run(
+            configs,
+            output_path=self.output,
+            on_progress=lambda p: progress.append((p.done, p.failed))
+        ))
+
+        self.assertEqual([r.status for r in results], ['success', 'error', 'success'])
+        self.assertIn('proveedor caído', results[1].error)
+        self.assertEqual(progress[-1], (3, 1))
+
+        with open(self.output, encoding='utf-8') as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual(sorted(r['index'] for r in records), [0, 1, 2])
+
+    def test_provider_limit_is_shared_across_items(self):
+        asyncio.run(self._runner(provider_limits={'fake': 2}).run(
+            [{'market': str(i)} for i in range(6)]
+        ))
+        self.assertEqual(self.manager.engines['fake'].max_active, 2)
+
+    def test_resume_skips_completed_items(self):
+        configs = [{'market': 'BTC'}, {'market': 'FAIL'}]
+        asyncio.run(self._runner().run(configs, output_path=self.output))
+        self.assertEqual(read_completed(self.output), {0})
+
+        configs[1] = {'market': 'ETH'}
+        results = asyncio.run(self._runner().run(configs, output_path=self.output, resume=True))
+        self.assertEqual([r.index for r in results], [1])
+        self.assertEqual(read_completed(self.output), {0, 1})
+
+    def test_load_configs_csv(self):
+        path = os.path.join(self.tmp.name, 'topics.csv')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write("topic,platforms,tone\nIA,twitter|linkedin,\nAhorro,medium,cercano\n")
+
+        configs = load_configs_csv(path, {'tone': 'profesional'})
+        self.assertEqual(configs[0], {'topic': 'IA', 'platforms': ['twitter', 'linkedin'], 'tone': 'profesional'})
+        self.assertEqual(configs[1]['tone'], 'cercano')
+
+    def test_unknown_workflow(self):
+        with self.assertRaises(ValueError):
+            BatchRunner(self.manager, 'desconocido')
+
+    def test_main_exits_when_initialization_fails(self):
+        path = os.path.join(self.tmp.name, 'rows.csv')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write("market\nBTC\n")
+        failed = {'config': {}, 'engine_manager': None, 'initialized': False, 'error': 'sin claves'}
+        with patch('src.utils.initialization.get_app_context', return_value=failed):
+            self.assertEqual(main(['trading', path, '--output', self.output]), 2)
+        self.assertFalse(os.path.exists(self.output))
+
+    def test_identical_rows_get_separate_checkpoints(self):
+        run_ids = []
+        runner = self._runner()
+        original = runner.workflow_class
+
+        class Recording(original):
+            def __init__(self, engine_manager, config):
+                super().__init__(engine_manager, config)
+                run_ids.append(self.run_id)
+
+        runner.workflow_class = Recording
+        results = asyncio.run(runner.run([{'market': 'BTC'}, {'market': 'BTC'}]))
+
+        self.assertEqual([r.status for r in results], ['success', 'success'])
+        self.assertEqual(len(set(run_ids)), 2)
+        self.assertNotIn('run_id', results[0].config)
+
+if __name__ == '__main__':
+    unittest.main()
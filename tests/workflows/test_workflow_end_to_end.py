@@ -0,0 +1,62 @@
+import asyncio
+import tempfile
+import unittest
+from src.core.checkpoint_store import configure_checkpoint_store, get_checkpoint_store
+from src.core.cost_budget import get_cost_budget
+from src.core.engine_manager import AIEngineManager
+from src.engines.base_engine import BaseAIEngine
+from src.engines.registry import register_engine
+from src.workflows.pyme.pyme_workflow import PymeWorkflow
+
+class StubEngine(BaseAIEngine):
+    """Responde con el mismo formato que los motores reales"""
+
+    async def _generate_text(self, prompt, system_prompt=None, **kwargs):
+        return {
+            'text': f"respuesta a: {prompt.strip().splitlines()[0]}",
+            'usage': {'prompt_tokens': 7, 'completion_tokens': 3, 'total_tokens': 10},
+            'model': 'stub',
+            'finish_reason': 'stop',
+            'metrics': {'tokens': 10, 'cost': 0.5, 'latency': 0.0}
+        }
+
+    async def _generate_text_stream(self, prompt, system_prompt=None, **kwargs):
+        yield {'text': prompt, 'done': True}
+
+register_engine('stub', StubEngine)
+
+class TestWorkflowEndToEnd(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.previous = get_checkpoint_store().directory
+        configure_checkpoint_store({'directory': self.tmp.name})
+        # El presupuesto compartido no debe escribir su estado en disco
+        self.budget = get_cost_budget()
+        self.state_file, self.budget.state_file = self.budget.state_file, None
+
+    def tearDown(self) -> None:
+        self.budget.state_file = self.state_file
+        configure_checkpoint_store({'directory': str(self.previous)})
+        self.tmp.cleanup()
+
+    def test_pyme_workflow_runs_with_real_engine_responses(self):
+        manager = AIEngineManager({
+            'cache': {'enabled': False},
+            'engines': {'stub': {'type': 'stub'}}
+        })
+        workflow = PymeWorkflow(manager, {
+            'sector': 'cafetería',
+            'location': 'Sevilla',
+            'initial_investment': 50000
+        })
+
+        result = asyncio.run(workflow.execute())
+
+        self.assertTrue(result['business_plan'].startswith('respuesta a:'))
+        self.assertEqual(result['metrics']['steps_completed'], 5)
+        self.assertEqual(result['metrics']['total_tokens'], 50)
+        self.assertAlmostEqual(result['metrics']['total_cost'], 2.5)
+        self.assertTrue(all(m['status'] == 'success' for m in result['metrics']['steps'].values()))
+
+if __name__ == '__main__':
+    unittest.main()
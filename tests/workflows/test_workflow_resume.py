@@ -0,0 +1,66 @@
+import asyncio
+import tempfile
+import unittest
+from src.core.checkpoint_store import configure_checkpoint_store, get_checkpoint_store
+from src.workflows.pyme.pyme_workflow import PymeWorkflow
+
+class FakeEngine:
+    def __init__(self, fail_on=None):
+        self.calls = []
+        self.fail_on = fail_on
+
+    async def generate_text(self, prompt, **kwargs):
+        task = prompt.split('\n', 1)[0]
+        self.calls.append(task)
+        if self.fail_on and self.fail_on in task:
+            raise RuntimeError("error transitorio del proveedor")
+        return {'text': f"salida {len(self.calls)}", 'metrics': {'tokens': 1, 'cost': 0.0}}
+
+class FakeEngineManager:
+    def __init__(self, engine):
+        self.engine = engine
+
+    def engine_for_task(self, task):
+        return self.engine
+
+CONFIG = {'sector': 'cafetería', 'location': 'Sevilla', 'initial_investment': 50000}
+
+class TestWorkflowResume(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.previous = get_checkpoint_store().directory
+        configure_checkpoint_store({'directory': self.tmp.name})
+
+    def tearDown(self) -> None:
+        configure_checkpoint_store({'directory': str(self.previous)})
+        self.tmp.cleanup()
+
+    def test_failed_run_resumes_from_completed_steps(self):
+        failing = FakeEngine(fail_on='plan de implementación')
+        with self.assertRaises(RuntimeError):
+            asyncio.run(PymeWorkflow(FakeEngineManager(failing), dict(CONFIG)).execute())
+        self.assertEqual(len(failing.calls), 5)
+
+        engine = FakeEngine()
+        workflow = PymeWorkflow(FakeEngineManager(engine), dict(CONFIG))
+        result = asyncio.run(workflow.execute())
+
+        # Solo se repite el paso que falló
+        self.assertEqual(len(engine.calls), 1)
+        self.assertIn('plan de implementación', engine.calls[0])
+        self.assertEqual(
+            sorted(result['metrics']['resumed_steps']),
+            ['business_plan', 'financial_analysis', 'marketing_plan', 'opportunity_analysis']
+        )
+        self.assertEqual(result['metrics']['steps']['business_plan']['status'], 'restored')
+        # Una ejecución completa no deja checkpoints
+        self.assertEqual(get_checkpoint_store().list_runs(), [])
+
+    def test_checkpoint_can_be_disabled_per_workflow(self):
+        failing = FakeEngine(fail_on='plan de implementación')
+        with self.assertRaises(RuntimeError):
+            asyncio.run(PymeWorkflow(FakeEngineManager(failing), {**CONFIG, 'checkpoint': False}).execute())
+        self.assertEqual(get_checkpoint_store().list_runs(), [])
+
+if __name__ == '__main__':
+    unittest.main()